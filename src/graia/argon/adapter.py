@@ -1,15 +1,28 @@
 import abc
 import asyncio
 import functools
+import itertools
 import json
+import time
 from asyncio.events import AbstractEventLoop
 from asyncio.exceptions import CancelledError
 from asyncio.locks import Event
 from asyncio.tasks import Task
-from typing import Callable, Dict, Optional, Set, TypeVar, Union
-
-import aiohttp.web_exceptions
-from aiohttp import ClientSession, FormData
+from collections import deque
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    Optional,
+    Set,
+    Type,
+    TypeVar,
+    Union,
+)
+
+from aiohttp import ClientResponse, ClientSession, ClientTimeout, FormData, TCPConnector
 from aiohttp.client_ws import ClientWebSocketResponse
 from aiohttp.http_websocket import WSMsgType
 from graia.broadcast import Broadcast
@@ -18,12 +31,20 @@ from loguru import logger
 from typing_extensions import ParamSpec
 from yarl import URL
 
-from graia.argon.event import MiraiEvent
+from graia.argon.compat import NATIVE_V2, BaseModel
+from graia.argon.event import MiraiEvent, builder, find_event
 from graia.argon.event.network import RemoteException
 from graia.argon.exception import InvalidArgument, InvalidSession, NotSupportedAction
+from graia.argon.metrics import metrics
 from graia.argon.model import CallMethod, MiraiSession
+from graia.argon.policy import RetryPolicy
+from graia.argon.trace import tracer
 from graia.argon.util import validate_response
 
+if TYPE_CHECKING:
+    from graia.argon.dedup import EventDeduplicator
+    from graia.argon.scheduler import DispatchScheduler
+
 P = ParamSpec("P")
 R = TypeVar("R")
 
@@ -39,53 +60,114 @@ def require_verified(func: Callable[P, R]) -> Callable[P, R]:
 
 
 def error_wrapper(network_action_callable: Callable[P, R]) -> Callable[P, R]:
+    async def measured(
+        self: "Adapter", action: str, method: CallMethod, data: Optional[dict]
+    ):
+        if not metrics.enabled:
+            return await network_action_callable(self, action, method, data)
+        start = time.perf_counter()
+        try:
+            result = await network_action_callable(self, action, method, data)
+        except Exception as e:
+            metrics.inc(
+                "argon_call_api_errors_total", action=action, error=e.__class__.__name__
+            )
+            raise
+        metrics.observe(
+            "argon_call_api_seconds", time.perf_counter() - start, action=action
+        )
+        return result
+
     @functools.wraps(network_action_callable)
     async def wrapped_network_action_callable(
-        self: "Adapter", *args: P.args, **kwargs: P.kwargs
+        self: "Adapter", action: str, method: CallMethod, data: Optional[dict] = None
     ):
-        running_count = 0
+        if not tracer.enabled:
+            return await retry(self, action, method, data)
+        with tracer.span("call_api", action=action):
+            return await retry(self, action, method, data)
 
-        while running_count < 5:
-            running_count += 1
+    async def retry(
+        self: "Adapter", action: str, method: CallMethod, data: Optional[dict]
+    ):
+        policy = self.retry_policy
+        deadline = time.monotonic() + policy.deadline
+        attempt = 0
+
+        while True:
+            attempt += 1
             try:
-                return await network_action_callable(self, *args, **kwargs)
-            except InvalidSession as invalid_session_exc:
-                logger.error(
-                    "Invalid session detected, asking daemon to restart adapter..."
-                )
-                logger.exception(invalid_session_exc)
-                await self.stop()
-            except aiohttp.web_exceptions.HTTPNotFound:
-                raise NotSupportedAction(
-                    f"{network_action_callable.__name__}: this action not supported"
-                )
-            except aiohttp.web_exceptions.HTTPInternalServerError as e:
-                self.broadcast.postEvent(RemoteException())
-                logger.error(
-                    "An exception has thrown by remote, please check the console!"
+                if policy.timeout is None:
+                    return await measured(self, action, method, data)
+                return await asyncio.wait_for(
+                    measured(self, action, method, data),
+                    min(policy.timeout, max(deadline - time.monotonic(), 0)),
                 )
-                raise
-            except (
-                aiohttp.web_exceptions.HTTPMethodNotAllowed,
-                aiohttp.web_exceptions.HTTPRequestURITooLong,
-                aiohttp.web_exceptions.HTTPTooManyRequests,
-            ):
-
-                logger.error(
-                    f"It seems that we post in a wrong way "
-                    f"for the action '{network_action_callable.__name__}', please open a issue."
-                )
-                raise
-            except aiohttp.web_exceptions.HTTPRequestTimeout:
-                logger.error(
-                    f"timeout on {network_action_callable.__name__}, retry after 5 seconds...".format()
+            except Exception as e:
+                error = e
+
+            if not policy.should_retry(action, method, error):
+                raise error
+            delay = policy.delay(attempt - 1)
+            if attempt >= policy.max_attempts or time.monotonic() + delay > deadline:
+                logger.error(f"{action}: giving up after {attempt} attempts")
+                raise error
+            logger.warning(
+                f"{action}: {error.__class__.__name__} {error}, "
+                f"retry {attempt}/{policy.max_attempts - 1} in {delay:.2f}s"
+            )
+            if metrics.enabled:
+                metrics.inc(
+                    "argon_call_api_retries_total",
+                    action=action,
+                    reason=error.__class__.__name__,
                 )
-                await asyncio.sleep(5)
-                continue
+            if isinstance(error, InvalidSession) and data:
+                await self.invalidate_session(data.get("sessionKey"))
+            await asyncio.sleep(delay)
+            if data and "sessionKey" in data:
+                # 等待 daemon 重新建立连接, 并换用新的 sessionKey
+                try:
+                    await asyncio.wait_for(
+                        self.verified.wait(), max(deadline - time.monotonic(), 0)
+                    )
+                except asyncio.TimeoutError:
+                    raise error from None
+                data = {**data, "sessionKey": self.mirai_session.session_key}
 
     return wrapped_network_action_callable
 
 
+class HttpConfig(BaseModel):
+    """
+    适配器的 HTTP 会话配置, 时间单位为秒.
+    会话在适配器重启时保留, 由 `Adapter.close` 关闭.
+
+    Attributes:
+        limit (int): 连接池大小, 即同时打开的连接数上限.
+        keepalive_timeout (float): 空闲连接保持打开的时间.
+        connect_timeout (Optional[float]): 建立连接的时限.
+        request_timeout (Optional[float]): 单个 HTTP 请求的总时限, 不作用于 websocket 连接.
+    """
+
+    limit: int = 64
+    keepalive_timeout: float = 60.0
+    connect_timeout: Optional[float] = 5.0
+    request_timeout: Optional[float] = 30.0
+
+    @property
+    def timeout(self) -> ClientTimeout:
+        return ClientTimeout(total=self.request_timeout, connect=self.connect_timeout)
+
+    def create_session(self) -> ClientSession:
+        return ClientSession(
+            connector=TCPConnector(
+                limit=self.limit, keepalive_timeout=self.keepalive_timeout
+            ),
+            timeout=ClientTimeout(total=None, connect=self.connect_timeout),
+        )
+
+
 class Adapter(abc.ABC):
     """
     适配器抽象基类。
@@ -93,6 +175,15 @@ class Adapter(abc.ABC):
     Args:
         broadcast(Broadcast): Broadcast 实例
         session: Session 实例，存储了连接信息
+
+    Attributes:
+        verified(Event): 当前连接是否已经完成验证。
+        retry_policy(RetryPolicy): `call_api` 的重试策略。
+        http_config(HttpConfig): HTTP 会话与连接池的配置, 在 `start` 前修改才会生效。
+        deduplicator(Optional[EventDeduplicator]): 事件去重器, 默认不去重。
+        scheduler(Optional[DispatchScheduler]): 事件调度器, 默认直接交给 Broadcast。
+        fast_events(bool): 是否对常见消息事件使用 `graia.argon.event.builder` 的快速构造,
+            模型运行在 pydantic v2 上时 `parse_obj` 已经更快, 因此默认只在 pydantic v1 上开启。
     """
 
     def __init__(self, broadcast: Broadcast, mirai_session: MiraiSession) -> None:
@@ -102,6 +193,12 @@ class Adapter(abc.ABC):
         self.session: Optional[ClientSession] = None
         self.running: bool = False
         self.fetch_task: Optional[Task] = None
+        self.verified: Event = Event()
+        self.retry_policy: RetryPolicy = RetryPolicy()
+        self.http_config: HttpConfig = HttpConfig()
+        self.deduplicator: Optional["EventDeduplicator"] = None
+        self.scheduler: Optional["DispatchScheduler"] = None
+        self.fast_events: bool = not NATIVE_V2
 
     @abc.abstractmethod
     async def fetch_cycle(self) -> None:
@@ -144,16 +241,75 @@ class Adapter(abc.ABC):
         event_type: Optional[str] = data.get("type")
         if not event_type or not isinstance(event_type, str):
             raise InvalidArgument("Unable to find 'type' field for automatic parsing")
-        event_class: Optional[MiraiEvent] = self.broadcast.findEvent(event_type)
+        event_class: Optional[MiraiEvent] = find_event(event_type)
         if not event_class:
-            raise ValueError(f"Unable to find event: {event_class}")
+            raise ValueError(f"Unable to find event: {event_type}")
         data = {k: v for k, v in data.items() if k != "type"}
-        obj = event_class.parse_obj(data)
+        start = time.perf_counter() if metrics.enabled else 0.0
+        if tracer.enabled:
+            with tracer.span("build_event", event=event_type):
+                obj = self.parse_event(event_class, data)
+            tracer.bind_event(obj)
+        else:
+            obj = self.parse_event(event_class, data)
+        if metrics.enabled:
+            metrics.observe(
+                "argon_build_event_seconds",
+                time.perf_counter() - start,
+                event=event_type,
+            )
         return await run_always_await(obj)
 
+    def parse_event(self, event_class: Type[MiraiEvent], data: dict) -> MiraiEvent:
+        "先尝试快速构造, 数据格式不一致或未开启时以 `parse_obj` 完整校验."
+        obj = builder.build_event(event_class, data) if self.fast_events else None
+        return obj if obj is not None else event_class.parse_obj(data)
+
+    def raise_for_status(self, action: str, response: ClientResponse) -> None:
+        """
+        把 HTTP 错误状态转换为对应的异常.
+
+        Raises:
+            NotSupportedAction: 404, 远端不支持该操作.
+            InvalidArgument: 405 或 414, 请求的方式不正确.
+            ClientResponseError: 其余错误状态, 由 `error_wrapper` 决定是否重试.
+        """
+        if response.status < 400:
+            return
+        if response.status == 404:
+            raise NotSupportedAction(f"{action}: this action not supported")
+        if response.status in (405, 414):
+            logger.error(
+                f"It seems that we post in a wrong way "
+                f"for the action '{action}', please open a issue."
+            )
+            raise InvalidArgument(f"{action}: HTTP {response.status}")
+        if response.status == 500:
+            self.broadcast.postEvent(RemoteException())
+            logger.error("An exception has thrown by remote, please check the console!")
+        response.raise_for_status()
+
+    def post_event(self, event: MiraiEvent) -> None:
+        """
+        广播事件, 设置了 `deduplicator` 时跳过重复的事件, 设置了 `scheduler` 时交由其调度.
+        """
+        if self.deduplicator is not None and self.deduplicator.is_duplicate(
+            event, self.mirai_session.account
+        ):
+            logger.debug(f"duplicate {event.__class__.__name__} dropped")
+            if metrics.enabled:
+                metrics.inc(
+                    "argon_events_deduplicated_total", event=event.__class__.__name__
+                )
+            return
+        if self.scheduler is not None:
+            self.scheduler.post(event)
+        else:
+            self.broadcast.postEvent(event)
+
     async def start(self):
-        if not self.session:
-            self.session = ClientSession(loop=self.broadcast.loop)
+        if not self.session or self.session.closed:
+            self.session = self.http_config.create_session()
         if not self.fetch_task or self.fetch_task.done():
             self.running = True
             self.fetch_task = self.loop.create_task(self.fetch_cycle())
@@ -162,17 +318,67 @@ class Adapter(abc.ABC):
     def session_activated(self) -> bool:
         return bool(self.mirai_session.session_key)
 
+    async def invalidate_session(self, session_key: Optional[str] = None) -> None:
+        """
+        放弃失效的 session 并断开连接, 由 daemon 重新连接并获取新的 session.
+
+        Args:
+            session_key (Optional[str]): 被判定为失效的 sessionKey, 与当前的不同时 (已经更新过) 不做任何事.
+        """
+        if session_key and session_key != self.mirai_session.session_key:
+            return
+        if not self.verified.is_set():
+            return
+        logger.warning("Invalid session detected, asking daemon to reconnect...")
+        self.mirai_session.session_key = None
+        self.verified.clear()
+        await self.disconnect()
+
+    async def disconnect(self) -> None:
+        """
+        断开当前连接, `fetch_cycle` 会随之结束.
+        """
+        self.running = False
+
+    def verify_session(self, data: dict) -> None:
+        """
+        处理连接建立后收到的第一帧数据, 记录 sessionKey 并设置 `verified`.
+
+        Args:
+            data (dict): 数据帧的 `data` 字段.
+
+        Raises:
+            InvalidSession: 重连时沿用的 sessionKey 已经失效, 此时会清除它以便下次重新获取.
+        """
+        try:
+            validate_response(data)
+        except InvalidSession:
+            logger.info("session expired, a new one will be requested")
+            self.mirai_session.session_key = None
+            raise
+        self.mirai_session.session_key = data["session"]
+        self.verified.set()
+
+    async def close(self) -> None:
+        """
+        关闭 HTTP 会话及其连接池, 应在适配器不再使用时调用.
+        """
+        if self.session and not self.session.closed:
+            await self.session.close()
+        self.session = None
+
     async def stop(self):
         """
         停止适配器，并等待 `fetch_cycle` 方法完成。
+        sessionKey 与 HTTP 会话会被保留, 以便重连时沿用.
         """
         self.running = False
+        self.verified.clear()
         if self.fetch_task and not self.fetch_task.done():
             try:
                 await self.fetch_task
             except CancelledError:
                 pass
-        self.mirai_session.session_key = None
 
 
 class HttpAdapter(Adapter):
@@ -192,26 +398,30 @@ class HttpAdapter(Adapter):
         self, action: str, method: CallMethod, data: Optional[dict] = {}
     ) -> Union[dict, list]:
         data = data or dict()
+        timeout = self.http_config.timeout
         if method == CallMethod.GET or method == CallMethod.RESTGET:
             async with self.session.get(
-                URL(self.mirai_session.url_gen(action)).with_query(data)
+                URL(self.mirai_session.url_gen(action)).with_query(data),
+                timeout=timeout,
             ) as response:
-                response.raise_for_status()
+                self.raise_for_status(action, response)
                 resp_json: dict = await response.json()
         elif method == CallMethod.POST or method == CallMethod.RESTPOST:
             async with self.session.post(
-                self.mirai_session.url_gen(action), data=json.dumps(data)
+                self.mirai_session.url_gen(action),
+                data=json.dumps(data),
+                timeout=timeout,
             ) as response:
-                response.raise_for_status()
+                self.raise_for_status(action, response)
                 resp_json: dict = await response.json()
         else:  # MULTIPART
             form = FormData()
-            for k, v in data:
-                form.add_fields(k, v)
+            for k, v in data.items():
+                form.add_field(k, v)
             async with self.session.post(
-                self.mirai_session.url_gen(action), data=form
+                self.mirai_session.url_gen(action), data=form, timeout=timeout
             ) as response:
-                response.raise_for_status()
+                self.raise_for_status(action, response)
                 resp_json: dict = await response.json()
         validate_response(resp_json)
         if "data" in resp_json:
@@ -223,14 +433,24 @@ class WebsocketAdapter(Adapter):
     """
     仅使用正向 Websocket 的适配器。
     因 Mirai API HTTP 的实现，部分功能不可用。
+
+    Args:
+        bcc(Broadcast): Broadcast 实例
+        session: Session 实例，存储了连接信息
+        ping(bool): 是否启用 ping 功能。
+        ping_interval(float): ping 的间隔, 单位秒。
+        max_missed_pongs(int): 连续多少次没有收到 pong 时断开连接。
+        close_timeout(float): 心跳超时后等待关闭握手的最长时间, 单位秒。
+            失效的连接至多约 `ping_interval * (max_missed_pongs + 1) + close_timeout` 秒 (默认 7 秒) 后被断开。
     """
 
     class SyncIdManager:
         allocated: Set[int] = {0}
+        counter: Iterator[int] = itertools.count(1)
 
         @classmethod
         def allocate(cls) -> int:
-            new_id = max(cls.allocated) + 1
+            new_id = next(cls.counter)
             cls.allocated.add(new_id)
             return new_id
 
@@ -243,34 +463,93 @@ class WebsocketAdapter(Adapter):
         def __init__(self, *, loop: AbstractEventLoop = None) -> None:
             super().__init__(loop=loop)
             self.response: Optional[dict] = None
+            self.error: Optional[Exception] = None
 
     def __init__(
-        self, bcc: Broadcast, mirai_session: MiraiSession, ping: bool = True
+        self,
+        bcc: Broadcast,
+        mirai_session: MiraiSession,
+        ping: bool = True,
+        ping_interval: float = 2.0,
+        max_missed_pongs: int = 2,
+        close_timeout: float = 1.0,
     ) -> None:
         super().__init__(bcc, mirai_session)
         self.ping = ping
+        self.ping_interval = ping_interval
+        self.max_missed_pongs = max_missed_pongs
+        self.close_timeout = close_timeout
         self.ping_task: Optional[Task] = None
+        self.ping_sent: Optional[int] = None
+        self.rtt: Deque[float] = deque(maxlen=64)
         self.ws_conn: Optional[ClientWebSocketResponse] = None
         self.query_dict = {"verifyKey": mirai_session.verify_key}
         self.sync_event: Dict[int, WebsocketAdapter.CallResponse] = {}
         if not mirai_session.single_mode:
             self.query_dict["qq"] = mirai_session.account
 
-    async def ws_ping(self, interval: float = 30.0) -> None:
+    async def ws_ping(self) -> None:
+        """
+        每隔 `ping_interval` 秒发送一次 ping, 连续 `max_missed_pongs` 次没有收到 pong 时
+        认为连接已经失效, 主动断开以便 daemon 重连.
+        """
+        missed = 0
+        self.ping_sent = None
         while self.running:
             try:
+                if self.ping_sent is not None:
+                    missed += 1
+                    if missed >= self.max_missed_pongs:
+                        logger.warning(
+                            f"websocket: {missed} pongs missed, closing connection"
+                        )
+                        if metrics.enabled:
+                            metrics.inc("argon_ws_heartbeat_timeouts_total")
+                        await self.disconnect(timeout=self.close_timeout)
+                        return
+                else:
+                    missed = 0
                 try:
-                    await self.ws_conn.ping()
+                    self.ping_sent = time.perf_counter_ns()
+                    await self.ws_conn.ping(str(self.ping_sent).encode())
                     logger.debug("websocket: ping")
                 except:
                     logger.exception("websocket: ping failed")
-                else:
-                    logger.debug(f"websocket: ping success, delay {interval}s")
-                    await asyncio.sleep(interval)
+                await asyncio.sleep(self.ping_interval)
             except asyncio.CancelledError:
                 logger.debug("websocket: pinger exit")
                 return
 
+    def on_pong(self, payload: bytes) -> None:
+        "根据 pong 携带的 ping 发送时间计算往返时延."
+        try:
+            sent = int(payload)
+        except ValueError:
+            return
+        rtt = (time.perf_counter_ns() - sent) / 1e9
+        self.ping_sent = None
+        self.rtt.append(rtt)
+        logger.debug(f"websocket: received pong, rtt {rtt * 1000:.2f}ms")
+        if metrics.enabled:
+            metrics.observe("argon_ws_rtt_seconds", rtt)
+
+    @property
+    def rtt_stats(self) -> Dict[str, float]:
+        """
+        最近若干次 ping 的往返时延统计, 单位秒.
+
+        Returns:
+            Dict[str, float]: 包含 `last`, `min`, `mean`, `max` 的字典, 尚无数据时为空.
+        """
+        if not self.rtt:
+            return {}
+        return {
+            "last": self.rtt[-1],
+            "min": min(self.rtt),
+            "mean": sum(self.rtt) / len(self.rtt),
+            "max": max(self.rtt),
+        }
+
     @require_verified
     @error_wrapper
     async def call_api(
@@ -296,12 +575,20 @@ class WebsocketAdapter(Adapter):
                 f"Unsupported operation for WebsocketAdapter: {method}"
             )
 
-        await self.ws_conn.send_json(content)
-        logger.debug(f"websocket：sent with sync id: {sync_id}")
-        await event.wait()
-        self.SyncIdManager.done(sync_id)
+        try:
+            await self.ws_conn.send_json(content)
+            logger.debug(f"websocket：sent with sync id: {sync_id}")
+            if metrics.enabled:
+                metrics.set("argon_pending_calls", len(self.sync_event))
+            await event.wait()
+        finally:
+            self.SyncIdManager.done(sync_id)
+            del self.sync_event[sync_id]
+            if metrics.enabled:
+                metrics.set("argon_pending_calls", len(self.sync_event))
+        if event.error:
+            raise event.error
         value: dict = event.response
-        del self.sync_event[sync_id]
         del event
         validate_response(value)
         if "data" in value:
@@ -312,23 +599,26 @@ class WebsocketAdapter(Adapter):
     async def raw_data_parser(self, raw_data: dict) -> None:
         sync_id: int = raw_data["syncId"]
         received_data: dict = raw_data["data"]
-        validate_response(received_data)
-        if not self.mirai_session.session_key:
-            if session_key := received_data.get("session", None):
-                self.mirai_session.session_key = session_key
+        if not self.verified.is_set():
+            self.verify_session(received_data)
             return
         if sync_id not in self.SyncIdManager.allocated:
+            validate_response(received_data)
             event = await self.build_event(received_data)
-            self.broadcast.postEvent(event)
+            self.post_event(event)
         else:
             if sync_id in self.sync_event:
+                # 调用的错误码由 `call_api` 检查, 不应中断接收
                 response = self.sync_event[sync_id]
                 response.response = received_data
                 response.set()
 
     async def fetch_cycle(self) -> None:
+        query = dict(self.query_dict)
+        if self.mirai_session.session_key:  # 沿用上一次连接的 session
+            query["sessionKey"] = self.mirai_session.session_key
         async with self.session.ws_connect(
-            str(URL(self.mirai_session.url_gen("all")).with_query(self.query_dict)),
+            str(URL(self.mirai_session.url_gen("all")).with_query(query)),
             autoping=False,
         ) as connection:
             logger.info("websocket: connected")
@@ -341,6 +631,12 @@ class WebsocketAdapter(Adapter):
                 while self.running:
                     ws_message = await connection.receive()
                     if ws_message.type is WSMsgType.TEXT:
+                        if tracer.enabled:
+                            with tracer.span("mirai.frame", root=True):
+                                with tracer.span("frame.decode"):
+                                    original_data: dict = json.loads(ws_message.data)
+                                await self.raw_data_parser(original_data)
+                            continue
                         original_data: dict = json.loads(ws_message.data)
                         await self.raw_data_parser(original_data)
 
@@ -348,7 +644,7 @@ class WebsocketAdapter(Adapter):
                         logger.info("websocket: connection has been closed.")
                         return
                     elif ws_message.type is WSMsgType.PONG:
-                        logger.debug("websocket: received pong")
+                        self.on_pong(ws_message.data)
                     else:
                         logger.debug(
                             "websocket: unknown message type - {}".format(
@@ -360,8 +656,27 @@ class WebsocketAdapter(Adapter):
                     self.ping_task.cancel()
                     self.ping_task = None
                     logger.debug("websocket: ping task complete")
+                for response in getattr(self, "sync_event", {}).values():
+                    response.error = ConnectionResetError("websocket connection lost")
+                    response.set()
         logger.info("websocket: disconnected")
 
+    async def disconnect(self, timeout: Optional[float] = None) -> None:
+        """
+        关闭当前的 websocket 连接, `fetch_cycle` 会随之结束.
+
+        Args:
+            timeout (Optional[float]): 等待关闭握手的最长时间, 单位秒. 超时后直接中止连接,
+                用于已经失效 (半开) 的连接, 否则关闭会等待 aiohttp 默认的 10 秒.
+        """
+        if self.ws_conn and not self.ws_conn.closed:
+            try:
+                await asyncio.wait_for(self.ws_conn.close(), timeout)
+            except asyncio.TimeoutError:  # 取消关闭时 aiohttp 会中止底层连接
+                logger.warning(
+                    "websocket: close handshake timed out, connection aborted"
+                )
+
 
 class CombinedAdapter(Adapter):
     """
@@ -372,14 +687,29 @@ class CombinedAdapter(Adapter):
         bcc(Broadcast): Broadcast 实例
         session: Session 实例，存储了连接信息
         ping(bool): 是否启用 ping 功能。
+        ping_interval(float): ping 的间隔, 单位秒。
+        max_missed_pongs(int): 连续多少次没有收到 pong 时断开连接。
+        close_timeout(float): 心跳超时后等待关闭握手的最长时间, 单位秒。
+            失效的连接至多约 `ping_interval * (max_missed_pongs + 1) + close_timeout` 秒 (默认 7 秒) 后被断开。
     """
 
     def __init__(
-        self, bcc: Broadcast, mirai_session: MiraiSession, ping: bool = True
+        self,
+        bcc: Broadcast,
+        mirai_session: MiraiSession,
+        ping: bool = True,
+        ping_interval: float = 2.0,
+        max_missed_pongs: int = 2,
+        close_timeout: float = 1.0,
     ) -> None:
         super().__init__(bcc, mirai_session)
         self.ping = ping
+        self.ping_interval = ping_interval
+        self.max_missed_pongs = max_missed_pongs
+        self.close_timeout = close_timeout
         self.ping_task: Optional[Task] = None
+        self.ping_sent: Optional[int] = None
+        self.rtt: Deque[float] = deque(maxlen=64)
         self.ws_conn: Optional[ClientWebSocketResponse] = None
         self.query_dict = {"verifyKey": mirai_session.verify_key}
         if not mirai_session.single_mode:
@@ -387,17 +717,22 @@ class CombinedAdapter(Adapter):
 
     ws_ping = WebsocketAdapter.ws_ping
 
+    on_pong = WebsocketAdapter.on_pong
+
+    rtt_stats = WebsocketAdapter.rtt_stats
+
+    disconnect = WebsocketAdapter.disconnect
+
     call_api = HttpAdapter.call_api
 
     async def raw_data_parser(self, raw_data: dict) -> None:
         received_data = raw_data["data"]
-        validate_response(received_data)
-        if not self.mirai_session.session_key:
-            if session_key := received_data.get("session", None):
-                self.mirai_session.session_key = session_key
+        if not self.verified.is_set():
+            self.verify_session(received_data)
             return
+        validate_response(received_data)
         event = await self.build_event(received_data)
-        self.broadcast.postEvent(event)
+        self.post_event(event)
 
     fetch_cycle = WebsocketAdapter.fetch_cycle
 
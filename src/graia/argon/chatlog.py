@@ -0,0 +1,169 @@
+"""
+聊天记录日志.
+
+监听器只做过滤与采样, 然后把事件放入有界队列;
+格式化与写入日志在后台线程中按批进行, 不占用事件循环.
+队列已满时新的事件会被丢弃并计数, 日志不会拖慢事件的分发.
+"""
+import queue
+import random
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, Type
+
+from loguru import logger
+
+from graia.argon.event.message import (
+    FriendMessage,
+    GroupMessage,
+    MessageEvent,
+    OtherClientMessage,
+    StrangerMessage,
+    TempMessage,
+)
+from graia.argon.metrics import metrics
+
+if TYPE_CHECKING:
+    from graia.argon.model import ChatLogConfig
+
+
+def member_fields(event: MessageEvent) -> Dict[str, Any]:
+    return dict(
+        group_id=event.sender.group.id,
+        group_name=event.sender.group.name,
+        member_id=event.sender.id,
+        member_name=event.sender.name,
+        member_permission=event.sender.permission.name,
+        bot_permission=event.sender.group.accountPerm.name,
+    )
+
+
+def friend_fields(event: MessageEvent) -> Dict[str, Any]:
+    return dict(friend_name=event.sender.nickname, friend_id=event.sender.id)
+
+
+def stranger_fields(event: MessageEvent) -> Dict[str, Any]:
+    return dict(stranger_name=event.sender.nickname, stranger_id=event.sender.id)
+
+
+def client_fields(event: MessageEvent) -> Dict[str, Any]:
+    return dict(platform_name=event.sender.platform, platform_id=event.sender.id)
+
+
+formatters: Dict[
+    Type[MessageEvent], Tuple[str, Callable[[MessageEvent], Dict[str, Any]]]
+] = {
+    GroupMessage: ("group_message_log_format", member_fields),
+    FriendMessage: ("friend_message_log_format", friend_fields),
+    TempMessage: ("temp_message_log_format", member_fields),
+    StrangerMessage: ("stranger_message_log_format", stranger_fields),
+    OtherClientMessage: ("other_client_message_log_format", client_fields),
+}
+"事件类型到 (格式字符串在 `ChatLogConfig` 中的字段名, 格式参数的生成函数) 的映射."
+
+
+class ChatLogPipeline:
+    """
+    在后台线程中记录聊天日志.
+
+    Args:
+        config (ChatLogConfig): 日志配置.
+        bot_id (Optional[int]): 机器人的 QQ 号, 用于格式字符串中的 `bot_id`.
+
+    Attributes:
+        enqueued (int): 进入队列的事件数.
+        written (int): 成功写入日志的事件数.
+        dropped (int): 因队列已满被丢弃的事件数.
+        sampled_out (int): 因采样被跳过的事件数.
+        filtered (int): 因群过滤被跳过的事件数.
+    """
+
+    def __init__(self, config: "ChatLogConfig", bot_id: Optional[int] = None) -> None:
+        self.config = config
+        self.bot_id = bot_id
+        self.queue: "queue.Queue[Optional[MessageEvent]]" = queue.Queue(
+            config.max_queue_size
+        )
+        self.thread: Optional[threading.Thread] = None
+        self.stopping = threading.Event()
+        self.enqueued: int = 0
+        self.written: int = 0
+        self.dropped: int = 0
+        self.sampled_out: int = 0
+        self.filtered: int = 0
+
+    def start(self) -> None:
+        if self.thread and self.thread.is_alive():
+            return
+        self.stopping.clear()
+        self.thread = threading.Thread(
+            target=self.worker, name="argon-chat-log", daemon=True
+        )
+        self.thread.start()
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """
+        写完队列中剩余的事件后停止后台线程, 至多等待 `timeout` 秒.
+        在事件循环中应通过 `run_in_executor` 调用.
+        """
+        if not self.thread:
+            return
+        self.stopping.set()
+        try:
+            self.queue.put_nowait(None)
+        except queue.Full:  # 队列非空, 后台线程写完后会检查 `stopping`
+            pass
+        self.thread.join(timeout)
+        self.thread = None
+
+    def put(self, event: MessageEvent) -> None:
+        """过滤, 采样并放入队列, 在事件循环中调用."""
+        config = self.config
+        if config.groups is not None or config.ignore_groups:
+            group = getattr(event.sender, "group", None)
+            if group is not None and (
+                group.id in config.ignore_groups
+                or (config.groups is not None and group.id not in config.groups)
+            ):
+                self.filtered += 1
+                return
+        if config.sample_rate < 1.0 and random.random() >= config.sample_rate:
+            self.sampled_out += 1
+            return
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+            if metrics.enabled:
+                metrics.inc("argon_chat_log_dropped_total")
+            return
+        self.enqueued += 1
+
+    def worker(self) -> None:
+        batch_size = self.config.batch_size
+        while True:
+            batch: List[Optional[MessageEvent]] = [self.queue.get()]
+            try:
+                while len(batch) < batch_size:
+                    batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                pass
+            for event in batch:
+                if event is None:
+                    return
+                try:
+                    self.write(event)
+                except Exception as e:
+                    logger.error(f"chat log: failed to format {event!r}: {e!r}")
+                else:
+                    self.written += 1
+            if self.stopping.is_set() and self.queue.empty():
+                return
+
+    def write(self, event: MessageEvent) -> None:
+        field, make_fields = formatters[event.__class__]
+        fields = make_fields(event)
+        fields["bot_id"] = self.bot_id
+        fields["message_string"] = repr(event.messageChain.asDisplay())
+        logger.log(
+            self.config.log_level, getattr(self.config, field).format_map(fields)
+        )
@@ -0,0 +1,388 @@
+"""
+一个连接, 多个工作进程.
+
+`ShardFront` 运行在持有适配器的前端进程中, 把收到的事件数据按会话 (群, 好友)
+分配给 N 个工作进程, 同一会话的事件总是由同一个工作进程按顺序处理;
+工作进程中的 `ShardWorkerAdapter` 解析并广播事件, 其 `call_api` 经由前端的适配器完成.
+前端只解码 JSON, 不构造事件对象.
+
+前端与工作进程通过 Unix 套接字通信, 数据帧为 4 字节长度前缀加 pickle.
+
+    # 前端
+    app = ArgonMiraiApplication(bcc, CombinedAdapter(bcc, session))
+    front = ShardFront(app.adapter, "/tmp/argon.sock", workers=4)
+    await front.start()
+    front.spawn(worker_main)
+    await app.lifecycle()
+
+    # 工作进程, worker_main 需要定义在模块顶层
+    def worker_main(index: int, path: str) -> None:
+        loop = asyncio.new_event_loop()
+        bcc = Broadcast(loop=loop)
+        app = ArgonMiraiApplication(bcc, ShardWorkerAdapter(bcc, path, index))
+        ...  # 注册监听器
+        loop.run_until_complete(app.lifecycle())
+"""
+import asyncio
+import itertools
+import multiprocessing
+import os
+import pickle
+import struct
+from asyncio import Future, StreamReader, StreamWriter
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Hashable, Iterator, List, Optional, Union
+
+from graia.broadcast import Broadcast
+from loguru import logger
+
+from graia.argon.adapter import Adapter
+from graia.argon.metrics import metrics
+from graia.argon.model import CallMethod, MiraiSession
+from graia.argon.scheduler import DispatchScheduler
+from graia.argon.util import validate_response
+
+header = struct.Struct(">I")
+
+
+async def read_frame(reader: StreamReader) -> Any:
+    size = header.unpack(await reader.readexactly(header.size))[0]
+    return pickle.loads(await reader.readexactly(size))
+
+
+def write_frame(writer: StreamWriter, message: Any) -> None:
+    data = pickle.dumps(message, pickle.HIGHEST_PROTOCOL)
+    writer.write(header.pack(len(data)) + data)
+
+
+def shard_key(data: dict) -> Optional[Hashable]:
+    """
+    事件数据 (未解析的 dict) 所属的会话, 规则与 `graia.argon.scheduler.shard_key` 相同.
+    """
+    sender = data.get("sender")
+    if isinstance(sender, dict) and "id" in sender:
+        group = sender.get("group")
+        if isinstance(group, dict):
+            return ("group", group.get("id"))
+        if "platform" in sender:
+            return ("client", sender["id"])
+        return ("friend", sender["id"])
+    group = data.get("group")
+    if isinstance(group, dict):
+        return ("group", group.get("id"))
+    member = data.get("member")
+    if isinstance(member, dict) and isinstance(member.get("group"), dict):
+        return ("group", member["group"].get("id"))
+    friend = data.get("friend")
+    if isinstance(friend, dict):
+        return ("friend", friend.get("id"))
+    return None
+
+
+def run_worker(target: Callable[[int, str], Any], index: int, path: str) -> None:
+    target(index, path)
+
+
+class ShardFront:
+    """
+    前端: 把适配器收到的事件分配给工作进程, 并代工作进程调用 `call_api`.
+
+    Args:
+        adapter (Adapter): 前端的适配器, 需使用 websocket 接收事件 (`WebsocketAdapter` 或 `CombinedAdapter`).
+        path (str): Unix 套接字路径.
+        workers (int): 工作进程数量.
+        max_pending (int): 工作进程未连接或处理不过来时, 每个工作进程最多暂存的事件数, 超出时丢弃最早的事件.
+        max_buffer (int): 每个连接的发送缓冲区上限, 单位字节. 超出后事件改为暂存, 待缓冲区排空后再发送.
+
+    Attributes:
+        connections (Dict[int, StreamWriter]): 已连接的工作进程.
+        pending (Dict[int, Deque[dict]]): 各工作进程暂存的事件.
+        processes (List[multiprocessing.Process]): 由 `spawn` 启动的工作进程.
+        dropped (int): 因暂存已满被丢弃的事件数.
+    """
+
+    def __init__(
+        self,
+        adapter: Adapter,
+        path: str,
+        workers: int,
+        max_pending: int = 1024,
+        max_buffer: int = 1024 * 1024,
+    ) -> None:
+        self.adapter = adapter
+        self.path = path
+        self.workers = workers
+        self.max_buffer = max_buffer
+        self.connections: Dict[int, StreamWriter] = {}
+        self.pending: Dict[int, Deque[dict]] = {
+            i: deque(maxlen=max_pending) for i in range(workers)
+        }
+        self.draining: Dict[int, asyncio.Task] = {}
+        self.processes: List[multiprocessing.Process] = []
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.round_robin: Iterator[int] = itertools.cycle(range(workers))
+        self.dropped: int = 0
+        self.raw_data_parser = adapter.raw_data_parser
+
+    async def start(self) -> None:
+        """监听套接字, 并接管适配器收到的事件."""
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self.server = await asyncio.start_unix_server(self.handle, self.path)
+        self.adapter.raw_data_parser = self.sharding_raw_data_parser
+
+    async def stop(self) -> None:
+        """停止监听, 断开并结束由 `spawn` 启动的工作进程."""
+        self.adapter.raw_data_parser = self.raw_data_parser
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+        for task in self.draining.values():
+            task.cancel()
+        self.draining.clear()
+        for writer in self.connections.values():
+            writer.close()
+        self.connections.clear()
+        for process in self.processes:
+            process.terminate()
+            process.join()
+        self.processes.clear()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def spawn(
+        self, target: Callable[[int, str], Any], start_method: Optional[str] = None
+    ) -> List[multiprocessing.Process]:
+        """
+        启动工作进程, 每个进程中调用 `target(index, path)`.
+
+        Args:
+            target (Callable[[int, str], Any]): 模块顶层的函数, 应在其中运行 `ShardWorkerAdapter` 与应用.
+            start_method (Optional[str]): 子进程的启动方式, 默认使用平台的默认值.
+        """
+        context = multiprocessing.get_context(start_method)
+        for index in range(self.workers):
+            process = context.Process(
+                target=run_worker,
+                args=(target, index, self.path),
+                name=f"argon-worker-{index}",
+                daemon=True,
+            )
+            process.start()
+            self.processes.append(process)
+        return self.processes
+
+    async def sharding_raw_data_parser(self, raw_data: dict) -> None:
+        adapter = self.adapter
+        data = raw_data.get("data")
+        sync_manager = getattr(adapter, "SyncIdManager", None)
+        if (
+            not adapter.verified.is_set()
+            or not isinstance(data, dict)
+            or "type" not in data
+            or (sync_manager and raw_data.get("syncId") in sync_manager.allocated)
+        ):
+            # 验证帧, 错误码与调用的响应仍由适配器处理
+            await self.raw_data_parser(raw_data)
+            return
+        self.forward(data)
+
+    def forward(self, data: dict) -> None:
+        key = shard_key(data)
+        index = hash(key) % self.workers if key is not None else next(self.round_robin)
+        writer = self.connections.get(index)
+        pending = self.pending[index]
+        if (
+            writer is None
+            or writer.is_closing()
+            or pending  # 已有暂存的事件时不能插队
+            or writer.transport.get_write_buffer_size() > self.max_buffer
+        ):
+            if len(pending) == pending.maxlen:
+                self.dropped += 1
+                if metrics.enabled:
+                    metrics.inc("argon_shard_events_dropped_total", worker=str(index))
+            pending.append(data)
+            if writer is not None and not writer.is_closing():
+                self.start_draining(index, writer)
+            return
+        self.send_event(index, writer, data)
+
+    def send_event(self, index: int, writer: StreamWriter, data: dict) -> None:
+        write_frame(writer, {"op": "event", "data": data})
+        if metrics.enabled:
+            metrics.inc("argon_shard_events_total", worker=str(index))
+
+    def start_draining(self, index: int, writer: StreamWriter) -> None:
+        if index not in self.draining:
+            self.draining[index] = self.adapter.loop.create_task(
+                self.drain(index, writer)
+            )
+
+    async def drain(self, index: int, writer: StreamWriter) -> None:
+        """等待发送缓冲区排空, 再按顺序发送暂存的事件, 直到暂存清空或缓冲区再次超出上限."""
+        pending = self.pending[index]
+        try:
+            while pending and not writer.is_closing():
+                await writer.drain()
+                while (
+                    pending
+                    and not writer.is_closing()
+                    and writer.transport.get_write_buffer_size() <= self.max_buffer
+                ):
+                    self.send_event(index, writer, pending.popleft())
+        except ConnectionError:
+            pass
+        finally:
+            if self.draining.get(index) is asyncio.current_task():
+                del self.draining[index]
+
+    def session_info(self) -> dict:
+        session = self.adapter.mirai_session
+        return {
+            "op": "session",
+            "host": session.host,
+            "account": session.account,
+            "session_key": session.session_key,
+            "version": session.version,
+        }
+
+    async def handle(self, reader: StreamReader, writer: StreamWriter) -> None:
+        index: Optional[int] = None
+        try:
+            hello = await read_frame(reader)
+            index = hello.get("index")
+            if hello.get("op") != "hello" or index not in self.pending:
+                logger.warning(f"shard: rejected worker {hello!r}")
+                return
+            await self.adapter.verified.wait()
+            old = self.connections.get(index)
+            if old is not None:
+                old.close()
+            task = self.draining.pop(index, None)
+            if task is not None:
+                task.cancel()
+            # 缓冲区超过上限时暂停写入, `drain` 等到它排空为止
+            writer.transport.set_write_buffer_limits(self.max_buffer)
+            write_frame(writer, self.session_info())
+            self.connections[index] = writer
+            if self.pending[index]:
+                self.start_draining(index, writer)
+            logger.info(f"shard: worker {index} connected")
+            while True:
+                message = await read_frame(reader)
+                if message.get("op") == "call":
+                    self.adapter.loop.create_task(self.handle_call(writer, message))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            if index is not None and self.connections.get(index) is writer:
+                del self.connections[index]
+                logger.info(f"shard: worker {index} disconnected")
+            writer.close()
+
+    async def handle_call(self, writer: StreamWriter, message: dict) -> None:
+        data = message.get("data")
+        if isinstance(data, dict) and "sessionKey" in data:
+            data["sessionKey"] = self.adapter.mirai_session.session_key
+        try:
+            result = await self.adapter.call_api(
+                message["action"], message["method"], data
+            )
+        except Exception as e:
+            try:
+                error = pickle.loads(pickle.dumps(e))
+            except Exception:
+                error = RuntimeError(f"{e.__class__.__name__}: {e}")
+            reply = {"op": "error", "id": message["id"], "error": error}
+        else:
+            reply = {"op": "result", "id": message["id"], "result": result}
+        if not writer.is_closing():
+            write_frame(writer, reply)
+
+
+class ShardWorkerAdapter(Adapter):
+    """
+    工作进程中的适配器, 从 `ShardFront` 接收事件, 经由它调用 `call_api`.
+    默认使用 `DispatchScheduler`, 使同一会话的事件在工作进程中也按顺序处理.
+
+    Args:
+        broadcast (Broadcast): Broadcast 实例.
+        path (str): 前端的 Unix 套接字路径.
+        index (int): 工作进程的序号, 从 0 开始.
+    """
+
+    def __init__(self, broadcast: Broadcast, path: str, index: int) -> None:
+        super().__init__(broadcast, MiraiSession("http://localhost"))
+        self.scheduler = DispatchScheduler(broadcast)
+        self.path = path
+        self.index = index
+        self.writer: Optional[StreamWriter] = None
+        self.calls: Dict[int, Future] = {}
+        self.call_id: Iterator[int] = itertools.count()
+
+    async def fetch_cycle(self) -> None:
+        reader, writer = await asyncio.open_unix_connection(self.path)
+        self.writer = writer
+        try:
+            write_frame(writer, {"op": "hello", "index": self.index})
+            while self.running:
+                message = await read_frame(reader)
+                op = message.get("op")
+                if op == "event":
+                    validate_response(message["data"])
+                    self.post_event(await self.build_event(message["data"]))
+                elif op in ("result", "error"):
+                    future = self.calls.pop(message["id"], None)
+                    if future is not None and not future.done():
+                        if op == "result":
+                            future.set_result(message["result"])
+                        else:
+                            future.set_exception(message["error"])
+                elif op == "session":
+                    session = self.mirai_session
+                    session.host = message["host"]
+                    session.account = message["account"]
+                    session.session_key = message["session_key"]
+                    session.version = message["version"]
+                    self.verified.set()
+        except asyncio.IncompleteReadError:
+            logger.info("shard: front closed the connection")
+        finally:
+            self.writer = None
+            writer.close()
+            for future in self.calls.values():
+                if not future.done():
+                    future.set_exception(ConnectionResetError("front disconnected"))
+            self.calls.clear()
+
+    async def disconnect(self) -> None:
+        self.running = False
+        if self.writer:
+            self.writer.close()
+
+    async def stop(self):
+        await self.disconnect()
+        await super().stop()
+
+    async def call_api(
+        self, action: str, method: CallMethod, data: Optional[dict] = None
+    ) -> Union[dict, list]:
+        await self.verified.wait()
+        if self.writer is None:
+            raise ConnectionResetError("not connected to front")
+        call_id = next(self.call_id)
+        future = self.loop.create_future()
+        self.calls[call_id] = future
+        write_frame(
+            self.writer,
+            {
+                "op": "call",
+                "id": call_id,
+                "action": action,
+                "method": method,
+                "data": data,
+            },
+        )
+        return await future
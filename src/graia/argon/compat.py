@@ -0,0 +1,335 @@
+"""
+pydantic 兼容层.
+
+Argon 的模型使用 pydantic v1 的接口 (`parse_obj`, `dict`, `json`, `validator`, `__root__` 消息链).
+安装 pydantic 2.7 及以上版本时, 模型直接运行在 pydantic v2 上, 这里的 `BaseModel` 与 `RootModel`
+以 v1 的方法名转发到 v2 的对应方法 (不产生弃用警告), `validator` 会把 `__root__` 换成 `root`.
+更早的 pydantic v2, 或设置了环境变量 `ARGON_PYDANTIC_V1` 时, 改用其附带的 `pydantic.v1`;
+安装的是 pydantic v1 时直接使用它. Argon 的模块都应从这里导入 pydantic 的名称.
+
+跳过校验直接构造模型的代码 (`Element.build`, 二进制编码, 事件的快速构造) 通过
+`model_fields`, `construct`, `model_values` 与 `fields_set` 访问模型的内部状态, 与所用的 pydantic 无关.
+"""
+import json
+import os
+import warnings
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Set, Type, TypeVar
+
+from pydantic.version import VERSION as PYDANTIC_VERSION
+
+PYDANTIC_V2 = not PYDANTIC_VERSION.startswith("1.")
+"是否安装的是 pydantic v2."
+
+NATIVE_V2 = (
+    PYDANTIC_V2
+    and tuple(map(int, PYDANTIC_VERSION.split(".")[:2])) >= (2, 7)
+    and not os.environ.get("ARGON_PYDANTIC_V1")
+)
+"模型是否直接运行在 pydantic v2 上, 为 False 时运行在 pydantic v1 (或 `pydantic.v1`) 上."
+
+ROOT = "root" if NATIVE_V2 else "__root__"
+"`RootModel` 保存内容的字段名."
+
+Model_T = TypeVar("Model_T")
+
+if NATIVE_V2:
+    from pydantic import AfterValidator
+    from pydantic import AnyHttpUrl as _AnyHttpUrl
+    from pydantic import BaseModel as _BaseModel
+    from pydantic import ConfigDict, Field
+    from pydantic import RootModel as _RootModel
+    from pydantic import TypeAdapter
+    from pydantic import validator as _validator
+    from typing_extensions import Annotated
+
+    url_adapter = TypeAdapter(_AnyHttpUrl)
+
+    def check_url(value: str) -> str:
+        url_adapter.validate_python(value)
+        return value
+
+    AnyHttpUrl = Annotated[str, AfterValidator(check_url)]
+    "与 v1 相同, 校验后仍为原本的字符串 (v2 的 `AnyHttpUrl` 不是 str, 且会补上末尾的 `/`)."
+
+    @contextmanager
+    def ignore_deprecation() -> Iterator[None]:
+        """
+        忽略 v2 对 v1 接口的弃用警告. `json_encoders` 与 `validator` 在 v2 中仍然有效,
+        只是在创建模型或校验器时发出警告.
+        """
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", DeprecationWarning)
+            yield
+
+    def validator(*fields: str, **kwargs: Any):
+        "v1 风格的字段校验器, `__root__` 对应 `RootModel` 的 `root` 字段."
+        fields = tuple(ROOT if name == "__root__" else name for name in fields)
+        kwargs.pop("allow_reuse", None)
+        with ignore_deprecation():
+            return _validator(*fields, **kwargs)
+
+    class ModelMetaclass(type(_BaseModel)):
+        "创建模型时忽略 `json_encoders` 的弃用警告."
+
+        def __new__(mcs, *args: Any, **kwargs: Any):
+            with ignore_deprecation():
+                return super().__new__(mcs, *args, **kwargs)
+
+    class V1Methods:
+        "以 v1 的方法名调用 v2 的对应方法."
+
+        @classmethod
+        def parse_obj(cls: Type[Model_T], obj: Any) -> Model_T:
+            return cls.model_validate(obj)
+
+        @classmethod
+        def parse_raw(cls: Type[Model_T], b: Any) -> Model_T:
+            # 经过 `parse_obj`, 与 v1 一致, 子类对 `parse_obj` 的重写同样生效
+            return cls.parse_obj(json.loads(b))
+
+        @classmethod
+        def construct(
+            cls: Type[Model_T], _fields_set: Optional[Set[str]] = None, **values: Any
+        ) -> Model_T:
+            return cls.model_construct(_fields_set, **values)
+
+        @classmethod
+        def update_forward_refs(cls, **localns: Any) -> None:
+            with ignore_deprecation():
+                cls.model_rebuild(force=True, _types_namespace=localns)
+
+        def dict(
+            self,
+            *,
+            include=None,
+            exclude=None,
+            by_alias: bool = False,
+            exclude_unset: bool = False,
+            exclude_defaults: bool = False,
+            exclude_none: bool = False,
+        ) -> Dict[str, Any]:
+            return self.model_dump(
+                include=include,
+                exclude=exclude,
+                by_alias=by_alias,
+                exclude_unset=exclude_unset,
+                exclude_defaults=exclude_defaults,
+                exclude_none=exclude_none,
+                serialize_as_any=True,
+            )
+
+        def json(
+            self,
+            *,
+            include=None,
+            exclude=None,
+            by_alias: bool = False,
+            exclude_unset: bool = False,
+            exclude_defaults: bool = False,
+            exclude_none: bool = False,
+            encoder: Optional[Callable[[Any], Any]] = None,
+            **dumps_kwargs: Any,
+        ) -> str:
+            options = dict(
+                include=include,
+                exclude=exclude,
+                by_alias=by_alias,
+                exclude_unset=exclude_unset,
+                exclude_defaults=exclude_defaults,
+                exclude_none=exclude_none,
+                serialize_as_any=True,
+            )
+            if encoder is None and not dumps_kwargs:
+                return self.model_dump_json(**options)
+            # 与 v1 相同, 由 `json.dumps` 输出, 无法序列化的值交给 `encoder`
+            data = self.model_dump(
+                mode="json" if encoder is None else "python", **options
+            )
+            return json.dumps(data, default=encoder, **dumps_kwargs)
+
+        def copy(
+            self: Model_T,
+            *,
+            include=None,
+            exclude=None,
+            update: Optional[Dict[str, Any]] = None,
+            deep: bool = False,
+        ) -> Model_T:
+            if include is None and exclude is None:
+                return self.model_copy(update=update, deep=deep)
+            # `model_copy` 不支持 include 与 exclude, 使用 v2 保留的 v1 实现
+            with ignore_deprecation():
+                return _BaseModel.copy(
+                    self, include=include, exclude=exclude, update=update, deep=deep
+                )
+
+    class BaseModel(V1Methods, _BaseModel, metaclass=ModelMetaclass):
+        """
+        带有 v1 方法名的 pydantic v2 模型.
+        与 v1 相同, 数字会被转换为 str 字段的字符串.
+        """
+
+        model_config = ConfigDict(coerce_numbers_to_str=True)
+
+    class RootModel(V1Methods, _RootModel[Model_T], metaclass=ModelMetaclass):
+        """
+        带有 v1 方法名的 pydantic v2 `RootModel`, 内容也可以通过 `__root__` 访问.
+        与 v1 的 `__root__` 模型相同, `dict()` 的结果是 `{"__root__": ...}`.
+        """
+
+        model_config = ConfigDict(coerce_numbers_to_str=True)
+
+        def dict(self, **kwargs: Any) -> Dict[str, Any]:
+            return {"__root__": super().dict(**kwargs)}
+
+    # 类定义中不能出现 `__root__`, 因此在创建之后加上
+    RootModel.__root__ = property(
+        lambda self: self.__dict__[ROOT],
+        lambda self, value: setattr(self, ROOT, value),
+    )
+
+    class ModelField:
+        "以 v1 `ModelField` 的属性描述 v2 的字段."
+
+        __slots__ = ("name", "alias", "required", "default", "info")
+
+        def __init__(self, name: str, info: Any) -> None:
+            self.name = name
+            self.alias: str = info.alias or name
+            self.required: bool = info.is_required()
+            self.default = None if self.required else info.default
+            self.info = info
+
+        def get_default(self) -> Any:
+            return self.info.get_default(call_default_factory=True)
+
+    fields_cache: Dict[type, Dict[str, ModelField]] = {}
+
+    def model_fields(cls: type) -> Dict[str, ModelField]:
+        "按定义顺序排列的字段, 与 v1 的 `cls.__fields__` 相同."
+        fields = fields_cache.get(cls)
+        if fields is None:
+            fields = fields_cache[cls] = {
+                name: ModelField(name, info) for name, info in cls.model_fields.items()
+            }
+        return fields
+
+    def extra_behavior(cls: type) -> str:
+        "模型对多余字段的处理方式: `allow`, `ignore` 或 `forbid`."
+        return cls.model_config.get("extra") or "ignore"
+
+    def construct(
+        cls: Type[Model_T],
+        values: Dict[str, Any],
+        fields_set: Set[str],
+        extra: Optional[Dict[str, Any]] = None,
+    ) -> Model_T:
+        """
+        不经过校验直接构造模型.
+
+        Args:
+            cls (Type[Model_T]): 模型类.
+            values (Dict[str, Any]): 全部字段的值 (不复制), 不含多余的字段.
+            fields_set (Set[str]): 数据中给出的字段名, 含多余的字段.
+            extra (Optional[Dict[str, Any]]): 多余的字段, 仅对 `extra="allow"` 的模型有意义.
+
+        Returns:
+            Model_T: 构造的模型.
+        """
+        obj = cls.__new__(cls)
+        object.__setattr__(obj, "__dict__", values)
+        object.__setattr__(obj, "__pydantic_fields_set__", fields_set)
+        if cls.model_config.get("extra") == "allow":
+            object.__setattr__(obj, "__pydantic_extra__", extra or {})
+        else:
+            object.__setattr__(obj, "__pydantic_extra__", None)
+        object.__setattr__(obj, "__pydantic_private__", None)
+        return obj
+
+    def model_values(obj: Any) -> Dict[str, Any]:
+        "模型全部字段 (含多余字段) 的值, 与 v1 的 `obj.__dict__` 相同."
+        extra = obj.__pydantic_extra__
+        return {**obj.__dict__, **extra} if extra else obj.__dict__
+
+    def fields_set(obj: Any) -> Set[str]:
+        "数据中给出的字段名, 与 v1 的 `obj.__fields_set__` 相同."
+        return obj.__pydantic_fields_set__
+
+else:
+    if PYDANTIC_V2:
+        from pydantic.v1 import AnyHttpUrl, BaseModel, Field, validator
+        from pydantic.v1.fields import ModelField
+    else:
+        from pydantic import AnyHttpUrl, BaseModel, Field, validator
+        from pydantic.fields import ModelField
+
+    class RootModel(BaseModel):
+        "v1 的 `__root__` 模型, 以 `RootModel[tp]` 指定内容的类型."
+
+        def __class_getitem__(cls, tp: Any) -> type:
+            return type(cls)(
+                cls.__name__,
+                (cls,),
+                {"__annotations__": {"__root__": tp}, "__module__": __name__},
+            )
+
+    def model_fields(cls: type) -> Dict[str, ModelField]:
+        "按定义顺序排列的字段, 即 `cls.__fields__`."
+        return cls.__fields__
+
+    def extra_behavior(cls: type) -> str:
+        "模型对多余字段的处理方式: `allow`, `ignore` 或 `forbid`."
+        return cls.__config__.extra.value
+
+    def construct(
+        cls: Type[Model_T],
+        values: Dict[str, Any],
+        fields_set: Set[str],
+        extra: Optional[Dict[str, Any]] = None,
+    ) -> Model_T:
+        """
+        不经过校验直接构造模型.
+
+        Args:
+            cls (Type[Model_T]): 模型类.
+            values (Dict[str, Any]): 全部字段的值 (不复制), 不含多余的字段.
+            fields_set (Set[str]): 数据中给出的字段名, 含多余的字段.
+            extra (Optional[Dict[str, Any]]): 多余的字段, 仅对 `extra="allow"` 的模型有意义.
+
+        Returns:
+            Model_T: 构造的模型.
+        """
+        if extra:
+            values.update(extra)
+        obj = cls.__new__(cls)
+        object.__setattr__(obj, "__dict__", values)
+        object.__setattr__(obj, "__fields_set__", fields_set)
+        return obj
+
+    def model_values(obj: Any) -> Dict[str, Any]:
+        "模型全部字段 (含多余字段) 的值, 即 `obj.__dict__`."
+        return obj.__dict__
+
+    def fields_set(obj: Any) -> Set[str]:
+        "数据中给出的字段名, 即 `obj.__fields_set__`."
+        return obj.__fields_set__
+
+
+__all__ = [
+    "PYDANTIC_VERSION",
+    "PYDANTIC_V2",
+    "NATIVE_V2",
+    "ROOT",
+    "AnyHttpUrl",
+    "BaseModel",
+    "Field",
+    "ModelField",
+    "RootModel",
+    "construct",
+    "extra_behavior",
+    "fields_set",
+    "model_fields",
+    "model_values",
+    "validator",
+]
@@ -1,6 +1,6 @@
 from contextlib import contextmanager
-from contextvars import ContextVar
-from typing import TYPE_CHECKING
+from contextvars import ContextVar, Token
+from typing import TYPE_CHECKING, List, Tuple
 
 from graia.argon.model import UploadMethod
 
@@ -29,32 +29,46 @@ def enter_message_send_context(method: UploadMethod):
     upload_method_ctx.reset(t)
 
 
-@contextmanager
-def enter_context(app=None, event=None):
-    token_app = None
-    token_event = None
-    token_loop = None
-    token_bcc = None
-    token_adapter = None
+def push_context(app=None, event=None) -> List[Tuple[ContextVar, Token]]:
+    """
+    设置应用与事件的上下文, 只设置与当前值不同的上下文变量.
 
+    应用在 `launch` 时已设置了自身的上下文, 由它创建的任务都会继承,
+    因此在其中调用 API 或分发事件时通常只需设置 `event_ctx`, 甚至什么都不用设置.
+
+    Returns:
+        List[Tuple[ContextVar, Token]]: 需要交给 `pop_context` 还原的令牌.
+    """
+    tokens = []
     if app:
-        token_app = application_ctx.set(app)
-        token_loop = event_loop_ctx.set(app.broadcast.loop)
-        token_bcc = broadcast_ctx.set(app.broadcast)
-        token_adapter = adapter_ctx.set(app.adapter)
-    if event:
-        token_event = event_ctx.set(event)
+        if application_ctx.get(None) is not app:
+            tokens.append((application_ctx, application_ctx.set(app)))
+        broadcast = app.broadcast
+        if broadcast_ctx.get(None) is not broadcast:
+            tokens.append((broadcast_ctx, broadcast_ctx.set(broadcast)))
+        if event_loop_ctx.get(None) is not broadcast.loop:
+            tokens.append((event_loop_ctx, event_loop_ctx.set(broadcast.loop)))
+        if adapter_ctx.get(None) is not app.adapter:
+            tokens.append((adapter_ctx, adapter_ctx.set(app.adapter)))
+    if event and event_ctx.get(None) is not event:
+        tokens.append((event_ctx, event_ctx.set(event)))
+    return tokens
 
-    yield
 
+def pop_context(tokens: List[Tuple[ContextVar, Token]]) -> None:
+    """按设置的相反顺序还原 `push_context` 设置的上下文变量."""
+    for var, token in reversed(tokens):
+        try:
+            var.reset(token)
+        except ValueError:  # 令牌属于另一个上下文
+            pass
+
+
+@contextmanager
+def enter_context(app=None, event=None):
+    tokens = push_context(app, event)
     try:
-        if token_app:
-            application_ctx.reset(token_app)
-        if token_adapter:
-            adapter_ctx.reset(token_adapter)
-        if all([token_event, token_loop, token_bcc]):
-            event_ctx.reset(token_event)
-            event_loop_ctx.reset(token_loop)
-            broadcast_ctx.reset(token_bcc)
-    except ValueError:
-        pass
+        yield
+    finally:
+        if tokens:
+            pop_context(tokens)
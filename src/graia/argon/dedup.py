@@ -0,0 +1,102 @@
+"""
+事件去重.
+
+重连或同时使用多个适配器时, 同一条消息可能被推送多次.
+为适配器设置 `EventDeduplicator` 后, 在时间窗口内重复的事件不会被广播:
+
+    adapter.deduplicator = EventDeduplicator(window=120.0)
+
+多个适配器可以共用同一个实例, 去重键包含适配器所属的 bot 账号,
+因此多个账号在同一个群中收到的同一条消息不会被当作重复.
+"""
+import time
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+from graia.argon.event import MiraiEvent
+from graia.argon.event.message import MessageEvent
+from graia.argon.event.mirai import RequestEvent
+from graia.argon.message.element import Source
+from graia.argon.model import Member
+
+
+def event_key(event: MiraiEvent, account: Optional[int] = None) -> Optional[Hashable]:
+    """
+    事件的去重键.
+
+    消息事件为 `(bot 账号, 类型, Source.id, 群号或好友 QQ)`,
+    申请事件为 `(bot 账号, 类型, eventId)`, 其余事件没有可靠的标识, 返回 None 表示不参与去重.
+
+    Args:
+        event (MiraiEvent): 事件.
+        account (Optional[int]): 收到事件的 bot 账号.
+    """
+    if isinstance(event, MessageEvent):
+        chain = event.messageChain.__root__
+        if not chain or not isinstance(chain[0], Source):
+            return None
+        sender = event.sender
+        contact = sender.group.id if isinstance(sender, Member) else sender.id
+        return (account, event.__class__.__name__, chain[0].id, contact)
+    if isinstance(event, RequestEvent):
+        return (account, event.__class__.__name__, event.requestId)
+    return None
+
+
+class EventDeduplicator:
+    """
+    基于时间窗口的事件去重器.
+
+    已见过的键按首次出现的时间顺序保存在 `OrderedDict` 中, 查询与记录都是 O(1);
+    超过 `window` 秒的键会在记录时从头部淘汰, 数量超过 `max_size` 时淘汰最早的键.
+
+    Args:
+        window (float): 去重的时间窗口, 单位秒.
+        max_size (int): 最多保存的键数量, 用于限制内存占用.
+    """
+
+    def __init__(self, window: float = 60.0, max_size: int = 8192) -> None:
+        self.window = window
+        self.max_size = max_size
+        self.seen: "OrderedDict[Hashable, float]" = OrderedDict()
+        self.duplicates: int = 0
+
+    def __len__(self) -> int:
+        return len(self.seen)
+
+    def is_duplicate(self, event: MiraiEvent, account: Optional[int] = None) -> bool:
+        """
+        判断事件是否在窗口内出现过, 并记录该事件.
+
+        Args:
+            event (MiraiEvent): 事件.
+            account (Optional[int]): 收到事件的 bot 账号, 不同账号收到的事件互不重复.
+
+        Returns:
+            bool: 重复时为 True, 此时不应广播该事件.
+        """
+        key = event_key(event, account)
+        if key is None:
+            return False
+        now = time.monotonic()
+        self.expire(now)
+        if key in self.seen:
+            self.duplicates += 1
+            return True
+        self.seen[key] = now
+        if len(self.seen) > self.max_size:
+            self.seen.popitem(last=False)
+        return False
+
+    def expire(self, now: Optional[float] = None) -> None:
+        """淘汰超出时间窗口的键."""
+        deadline = (now if now is not None else time.monotonic()) - self.window
+        seen = self.seen
+        while seen:
+            key, first_seen = next(iter(seen.items()))
+            if first_seen >= deadline:
+                break
+            del seen[key]
+
+    def clear(self) -> None:
+        self.seen.clear()
@@ -1,4 +1,5 @@
-from typing import TYPE_CHECKING
+from operator import attrgetter
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
 
 from graia.broadcast.entities.dispatcher import BaseDispatcher
 from graia.broadcast.interfaces.dispatcher import DispatcherInterface
@@ -11,6 +12,35 @@ if TYPE_CHECKING:
 from graia.argon.message.chain import MessageChain
 from graia.argon.message.element import Source
 
+Resolver = Callable[[Any], Any]
+"取值函数, 接收事件并返回参数的值."
+
+
+def is_application(annotation: Any) -> bool:
+    "注解是否为应用类 (`ArgonMiraiApplication` 或其子类)."
+    from graia.argon.app import ArgonMiraiApplication
+
+    return isinstance(annotation, type) and issubclass(
+        annotation, ArgonMiraiApplication
+    )
+
+
+def application(event: Any) -> Any:
+    return application_ctx.get()
+
+
+def source(event: "MessageEvent") -> Source:
+    return event.messageChain.getFirst(Source)
+
+
+message_resolvers: Dict[Any, Resolver] = {
+    MessageChain: attrgetter("messageChain"),
+    Source: source,
+}
+"所有消息事件共有的注解."
+
+_application_annotations: Dict[Any, bool] = {}
+
 
 class MessageChainDispatcher(BaseDispatcher):
     @staticmethod
@@ -22,7 +52,14 @@ class MessageChainDispatcher(BaseDispatcher):
 class ApplicationDispatcher(BaseDispatcher):
     @staticmethod
     async def catch(interface: DispatcherInterface):
-        if getattr(interface.annotation, "__name__", None) == "GraiaMiraiApplication":
+        annotation = interface.annotation
+        try:
+            matched = _application_annotations[annotation]
+        except KeyError:
+            matched = _application_annotations[annotation] = is_application(annotation)
+        except TypeError:  # 无法哈希的注解
+            matched = is_application(annotation)
+        if matched:
             return application_ctx.get()
 
 
@@ -31,3 +68,42 @@ class SourceDispatcher(BaseDispatcher):
     async def catch(interface: DispatcherInterface["MessageEvent"]):
         if interface.annotation is Source:
             return interface.event.messageChain.getFirst(Source)
+
+
+class ResolutionDispatcher(BaseDispatcher):
+    """
+    以查表代替逐个调用 mixin 解析参数的 Dispatcher.
+
+    每个注解第一次出现时, 在 `resolvers` 中查找对应的取值函数 (应用类的注解总是被支持),
+    结果保存在该 Dispatcher 自己的 `table` 中; 此后同一注解的解析只是一次字典查找.
+
+    Attributes:
+        resolvers (Dict[Any, Resolver]): 注解到取值函数的映射, 由子类声明.
+        table (Dict[Any, Optional[Resolver]]): 已解析过的注解, 不支持的注解对应 None.
+    """
+
+    resolvers: Dict[Any, Resolver] = {}
+    table: Dict[Any, Optional[Resolver]] = {}
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls.table = {}
+
+    @classmethod
+    def resolve(cls, annotation: Any) -> Optional[Resolver]:
+        resolver = cls.resolvers.get(annotation)
+        if resolver is None and is_application(annotation):
+            resolver = application
+        return resolver
+
+    @classmethod
+    async def catch(cls, interface: DispatcherInterface):
+        annotation = interface.annotation
+        try:
+            resolver = cls.table[annotation]
+        except KeyError:
+            resolver = cls.table[annotation] = cls.resolve(annotation)
+        except TypeError:  # 无法哈希的注解
+            return None
+        if resolver is not None:
+            return resolver(interface.event)
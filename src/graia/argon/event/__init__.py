@@ -1,23 +1,84 @@
-from graia.broadcast import Dispatchable
+import importlib
+from typing import ClassVar, Dict, Optional, Type
+
+from graia.broadcast import Broadcast, Dispatchable
 from graia.broadcast.entities.dispatcher import BaseDispatcher
-from pydantic import BaseModel, validator
 
+from graia.argon.compat import BaseModel, model_fields, validator
 from graia.argon.exception import InvalidEventTypeDefinition
 
 
-class MiraiEvent(Dispatchable, BaseModel):
+class MiraiEvent(Dispatchable, BaseModel, extra="ignore"):
+    Dispatcher: ClassVar[Type[BaseDispatcher]]  # 不是字段
     type: str
 
     @validator("type", allow_reuse=True)
     def type_limit(cls, v):
-        if cls.type != v:
+        expected = model_fields(cls)["type"].default
+        if expected != v:
             raise InvalidEventTypeDefinition(
-                "{0}'s type must be '{1}', not '{2}'".format(cls.__name__, cls.type, v)
+                "{0}'s type must be '{1}', not '{2}'".format(cls.__name__, expected, v)
             )
         return v
 
-    class Config:
-        extra = "ignore"
-
     class Dispatcher:
         pass
+
+
+event_modules = (
+    "graia.argon.event.message",
+    "graia.argon.event.mirai",
+    "graia.argon.event.network",
+    "graia.argon.event.lifecycle",
+)
+"""按顺序尝试导入的事件模块, 消息事件最常见, 因此排在最前."""
+
+_event_cache: Dict[str, Optional[Type[Dispatchable]]] = {}
+
+
+def lookup(name: str) -> Optional[Type[Dispatchable]]:
+    "与原本的 `Broadcast.findEvent` 相同, 在已定义的事件类中查找."
+    for event_class in Broadcast.event_class_generator():
+        if event_class.__name__ == name:
+            return event_class
+    return None
+
+
+def find_event(name: str) -> Optional[Type[Dispatchable]]:
+    """
+    通过事件类型名称获取事件类, 事件模块只在第一次需要时才会被导入.
+
+    找不到的名称同样会被缓存 (此时所有事件模块都已导入), 之后才定义的同名事件类
+    需要先调用 `_event_cache.pop(name)` 才能被找到.
+
+    Args:
+        name (str): 事件类型名称, 即 mirai-api-http 推送数据中的 `type` 字段.
+
+    Returns:
+        Optional[Type[Dispatchable]]: 对应的事件类, 未找到时为 None.
+    """
+    try:
+        return _event_cache[name]
+    except KeyError:
+        pass
+    event_class = lookup(name)
+    if not event_class:
+        for module in event_modules:
+            importlib.import_module(module)
+            event_class = lookup(name)
+            if event_class:
+                break
+    _event_cache[name] = event_class
+    return event_class
+
+
+def install_event_lookup(broadcast: Broadcast) -> None:
+    """
+    让 `broadcast` 以 `find_event` 查找字符串形式的事件名, 只影响该实例.
+    `ArgonMiraiApplication` 会对其使用的 Broadcast 调用本函数;
+    需要在创建应用之前以名称注册监听器时, 可以自行调用.
+
+    Args:
+        broadcast (Broadcast): 要设置的 Broadcast 实例.
+    """
+    broadcast.findEvent = find_event
@@ -0,0 +1,223 @@
+"""
+常见消息事件的快速构造.
+
+`GroupMessage`, `FriendMessage` 与 `TempMessage` 占了推送数据的绝大多数.
+这里的构造函数只检查数据的类型与结构是否与 mirai-api-http 的格式完全一致,
+一致时直接填充模型 (不经过 pydantic 的校验), 得到与 `parse_obj` 相同的对象;
+只要有一处不一致就返回 None, 由调用方回退到 `parse_obj`.
+单个消息元素不一致时, 只有该元素回退到 `parse_obj`.
+"""
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+from graia.argon.compat import ModelField, construct, extra_behavior, model_fields
+from graia.argon.event import MiraiEvent
+from graia.argon.message.chain import MessageChain
+from graia.argon.message.element import At, AtAll, Element, Face, Plain, Source
+from graia.argon.model import Friend, Group, Member, MemberPerm
+
+MS_WATERSHED = 2e10
+"与 pydantic 一致: 超过该值的时间戳以毫秒计, 快速路径不处理这种情况."
+
+permissions: Dict[Any, MemberPerm] = {perm.value: perm for perm in MemberPerm}
+
+element_classes: Dict[str, Type[Element]] = {}
+
+
+class Mismatch(Exception):
+    "数据与预期的格式不一致, 需要回退到 pydantic."
+
+
+Checker = Callable[[Any], Any]
+"检查并转换单个字段的值, 不一致时抛出 `Mismatch`."
+
+MISSING = object()
+
+
+class ModelBuilder:
+    """
+    以模型的字段 (`model_fields`) 为准快速构造模型, 得到与 `parse_obj` 相同的对象.
+
+    数据中出现的字段由 `checkers` 中对应的函数检查; 没有对应函数的字段,
+    以字段名给出的有别名的字段, 以及缺少的必填字段都会引发 `Mismatch`.
+    缺少的可选字段取字段的默认值, 其余的键按模型的 `extra` 设置保留, 忽略或引发 `Mismatch`.
+
+    Args:
+        cls (Type[Any]): 模型类.
+        checkers (Dict[str, Checker]): 字段名到检查函数的映射.
+    """
+
+    def __init__(self, cls: Type[Any], checkers: Dict[str, Checker]) -> None:
+        self.cls = cls
+        fields = model_fields(cls)
+        self.fields: List[Tuple[str, str, Optional[Checker], ModelField]] = [
+            (name, field.alias, checkers.get(name), field)
+            for name, field in fields.items()
+        ]
+        self.keys = frozenset(field.alias for field in fields.values())
+        self.extra = extra_behavior(cls)
+
+    def __call__(self, data: Any):
+        if data.__class__ is not dict:
+            raise Mismatch
+        values: Dict[str, Any] = {}
+        fields_set = set()
+        for name, key, checker, field in self.fields:
+            value = data.get(key, MISSING)
+            if value is MISSING:
+                if field.required or name in data:  # 以字段名给出的值交由 pydantic 处理
+                    raise Mismatch
+                values[name] = field.get_default()
+            elif checker is None:
+                raise Mismatch
+            else:
+                values[name] = checker(value)
+                fields_set.add(name)
+        extra = None
+        if len(fields_set) < len(data):
+            if self.extra == "allow":
+                extra = {}
+                for key, value in data.items():
+                    if key not in self.keys:
+                        extra[key] = value
+                        fields_set.add(key)
+            elif self.extra != "ignore":
+                raise Mismatch
+        return construct(self.cls, values, fields_set, extra)
+
+
+def integer(value: Any) -> int:
+    if value.__class__ is not int:
+        raise Mismatch
+    return value
+
+
+def string(value: Any) -> str:
+    if value.__class__ is not str:
+        raise Mismatch
+    return value
+
+
+def optional_integer(value: Any) -> Optional[int]:
+    return None if value is None else integer(value)
+
+
+def optional_string(value: Any) -> Optional[str]:
+    return None if value is None else string(value)
+
+
+def timestamp(value: Any) -> datetime:
+    if value.__class__ is not int or not 0 <= value <= MS_WATERSHED:
+        raise Mismatch
+    return datetime.fromtimestamp(value, timezone.utc)
+
+
+def permission(value: Any) -> MemberPerm:
+    try:
+        return permissions[value]
+    except (KeyError, TypeError):
+        raise Mismatch from None
+
+
+build_friend = ModelBuilder(
+    Friend,
+    {"id": integer, "nickname": string, "remark": string},
+)
+build_group = ModelBuilder(
+    Group,
+    {"id": integer, "name": string, "accountPerm": permission},
+)
+build_member = ModelBuilder(
+    Member,
+    {
+        "id": integer,
+        "name": string,
+        "permission": permission,
+        "specialTitle": optional_string,
+        "joinTimestamp": optional_integer,
+        "lastSpeakTimestamp": optional_integer,
+        "mutetimeRemaining": optional_integer,
+        "group": build_group,
+    },
+)
+
+element_builders: Dict[Type[Element], ModelBuilder] = {
+    Plain: ModelBuilder(Plain, {"type": string, "text": string}),
+    Source: ModelBuilder(Source, {"type": string, "id": integer, "time": timestamp}),
+    At: ModelBuilder(
+        At, {"type": string, "target": integer, "display": optional_string}
+    ),
+    Face: ModelBuilder(
+        Face, {"type": string, "faceId": integer, "name": optional_string}
+    ),
+    AtAll: ModelBuilder(AtAll, {"type": string}),
+}
+"支持快速构造的消息元素."
+
+
+def find_element(name: str) -> Optional[Type[Element]]:
+    "与 `MessageChain.build_chain` 相同的查找规则, 结果被缓存, 未找到时重新扫描."
+    if name not in element_classes:
+        for element_cls in Element.__subclasses__():
+            element_classes.setdefault(element_cls.__name__, element_cls)
+    return element_classes.get(name)
+
+
+def build_chain(data: Any) -> MessageChain:
+    if data.__class__ is not list:
+        raise Mismatch
+    elements: List[Element] = []
+    for item in data:
+        if item.__class__ is not dict:
+            raise Mismatch
+        name = item.get("type")
+        element_cls = find_element(name) if name.__class__ is str else None
+        if element_cls is None:
+            continue  # 与 build_chain 相同, 忽略未知的元素
+        builder = element_builders.get(element_cls)
+        if builder is not None:
+            try:
+                elements.append(builder(item))
+                continue
+            except Mismatch:
+                pass
+        try:
+            elements.append(element_cls.parse_obj(item))
+        except Exception:  # 由完整的校验报告错误
+            raise Mismatch from None
+    return MessageChain.build(elements)
+
+
+sender_builders: Dict[str, Callable[[Any], Any]] = {
+    "GroupMessage": build_member,
+    "TempMessage": build_member,
+    "FriendMessage": build_friend,
+}
+"支持快速构造的事件类型及其 `sender` 的构造函数."
+
+event_builders: Dict[type, ModelBuilder] = {}
+
+
+def build_event(event_class: Type[MiraiEvent], data: dict) -> Optional[MiraiEvent]:
+    """
+    快速构造消息事件.
+
+    Args:
+        event_class (Type[MiraiEvent]): 事件类, 需为 `sender_builders` 中的类型.
+        data (dict): 不含 `type` 字段的推送数据 (含有时交由 `parse_obj` 处理).
+
+    Returns:
+        Optional[MiraiEvent]: 构造的事件, 数据格式不一致时为 None.
+    """
+    builder = event_builders.get(event_class)
+    if builder is None:
+        sender_builder = sender_builders.get(event_class.__name__)
+        if sender_builder is None:
+            return None
+        builder = event_builders[event_class] = ModelBuilder(
+            event_class, {"messageChain": build_chain, "sender": sender_builder}
+        )
+    try:
+        return builder(data)
+    except Mismatch:
+        return None
@@ -17,9 +17,9 @@ class ApplicationLaunched(Dispatchable):
     class Dispatcher(BaseDispatcher):
         @staticmethod
         async def catch(interface: "DispatcherInterface[ApplicationLaunched]"):
-            from .. import GraiaMiraiApplication
+            from graia.argon.app import ArgonMiraiApplication
 
-            if interface.annotation is GraiaMiraiApplication:
+            if interface.annotation is ArgonMiraiApplication:
                 return interface.event.app
 
 
@@ -32,7 +32,7 @@ class ApplicationShutdowned(Dispatchable):
     class Dispatcher(BaseDispatcher):
         @staticmethod
         async def catch(interface: "DispatcherInterface[ApplicationShutdowned]"):
-            from .. import GraiaMiraiApplication
+            from graia.argon.app import ArgonMiraiApplication
 
-            if interface.annotation is GraiaMiraiApplication:
+            if interface.annotation is ArgonMiraiApplication:
                 return interface.event.app
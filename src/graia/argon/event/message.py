@@ -1,15 +1,9 @@
 from datetime import datetime
+from operator import attrgetter
 from typing import List
 
-from graia.broadcast.entities.dispatcher import BaseDispatcher
-from graia.broadcast.interfaces.dispatcher import DispatcherInterface
-from pydantic import BaseModel, Field
-
-from graia.argon.dispatcher import (
-    ApplicationDispatcher,
-    MessageChainDispatcher,
-    SourceDispatcher,
-)
+from graia.argon.compat import BaseModel, Field
+from graia.argon.dispatcher import ResolutionDispatcher, message_resolvers
 from graia.argon.message.chain import MessageChain
 from graia.argon.model import Client, Friend, Group, Member
 
@@ -20,12 +14,8 @@ class MessageEvent(MiraiEvent):
     type: str = "MessageEvent"
     messageChain: MessageChain
 
-    class Dispatcher(BaseDispatcher):
-        mixin = [MessageChainDispatcher, ApplicationDispatcher, SourceDispatcher]
-
-        @staticmethod
-        async def catch(interface: DispatcherInterface):
-            pass
+    class Dispatcher(ResolutionDispatcher):
+        resolvers = message_resolvers
 
 
 class FriendMessage(MessageEvent):
@@ -33,13 +23,8 @@ class FriendMessage(MessageEvent):
     messageChain: MessageChain
     sender: Friend
 
-    class Dispatcher(BaseDispatcher):
-        mixin = [MessageChainDispatcher, ApplicationDispatcher, SourceDispatcher]
-
-        @staticmethod
-        async def catch(interface: DispatcherInterface["FriendMessage"]):
-            if interface.annotation is Friend:
-                return interface.event.sender
+    class Dispatcher(ResolutionDispatcher):
+        resolvers = {**message_resolvers, Friend: attrgetter("sender")}
 
 
 class GroupMessage(MessageEvent):
@@ -47,15 +32,12 @@ class GroupMessage(MessageEvent):
     messageChain: MessageChain
     sender: Member
 
-    class Dispatcher(BaseDispatcher):
-        mixin = [MessageChainDispatcher, ApplicationDispatcher, SourceDispatcher]
-
-        @staticmethod
-        async def catch(interface: DispatcherInterface["GroupMessage"]):
-            if interface.annotation is Group:
-                return interface.event.sender.group
-            elif interface.annotation is Member:
-                return interface.event.sender
+    class Dispatcher(ResolutionDispatcher):
+        resolvers = {
+            **message_resolvers,
+            Group: attrgetter("sender.group"),
+            Member: attrgetter("sender"),
+        }
 
 
 class TempMessage(MessageEvent):
@@ -67,15 +49,12 @@ class TempMessage(MessageEvent):
     def parse_obj(cls, obj):
         return super().parse_obj(obj)
 
-    class Dispatcher(BaseDispatcher):
-        mixin = [MessageChainDispatcher, ApplicationDispatcher, SourceDispatcher]
-
-        @staticmethod
-        async def catch(interface: DispatcherInterface["TempMessage"]):
-            if interface.annotation is Group:
-                return interface.event.sender.group
-            elif interface.annotation is Member:
-                return interface.event.sender
+    class Dispatcher(ResolutionDispatcher):
+        resolvers = {
+            **message_resolvers,
+            Group: attrgetter("sender.group"),
+            Member: attrgetter("sender"),
+        }
 
 
 class OtherClientMessage(MessageEvent):
@@ -83,13 +62,8 @@ class OtherClientMessage(MessageEvent):
     messageChain: MessageChain
     sender: Client
 
-    class Dispatcher(BaseDispatcher):
-        mixin = [MessageChainDispatcher, ApplicationDispatcher, SourceDispatcher]
-
-        @staticmethod
-        async def catch(interface: DispatcherInterface["OtherClientMessage"]):
-            if interface.annotation is Client:
-                return interface.event.sender
+    class Dispatcher(ResolutionDispatcher):
+        resolvers = {**message_resolvers, Client: attrgetter("sender")}
 
 
 class StrangerMessage(MessageEvent):
@@ -97,10 +71,5 @@ class StrangerMessage(MessageEvent):
     messageChain: MessageChain
     sender: Friend  # use Friend because it has the same structure as the stranger.
 
-    class Dispatcher(BaseDispatcher):
-        mixin = [MessageChainDispatcher, ApplicationDispatcher, SourceDispatcher]
-
-        @staticmethod
-        async def catch(interface: DispatcherInterface["StrangerMessage"]):
-            if interface.annotation is Friend:
-                return interface.event.sender
+    class Dispatcher(ResolutionDispatcher):
+        resolvers = {**message_resolvers, Friend: attrgetter("sender")}
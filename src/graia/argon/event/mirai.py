@@ -3,10 +3,9 @@ from typing import Any, Dict, List, Optional
 
 from graia.broadcast.entities.dispatcher import BaseDispatcher
 from graia.broadcast.interfaces.dispatcher import DispatcherInterface
-from pydantic import Field
-from pydantic.class_validators import validator
 from typing_extensions import Literal
 
+from graia.argon.compat import Field, validator
 from graia.argon.context import adapter_ctx
 from graia.argon.dispatcher import ApplicationDispatcher
 from graia.argon.exception import InvalidSession
@@ -26,7 +25,7 @@ class BotOnlineEvent(MiraiEvent):
         ArgonMiraiApplication (annotation): 发布事件的应用实例
     """
 
-    type = "BotOnlineEvent"
+    type: str = "BotOnlineEvent"
     qq: int
 
     Dispatcher = ApplicationDispatcher
@@ -41,7 +40,7 @@ class BotOfflineEventActive(MiraiEvent):
         ArgonMiraiApplication (annotation): 发布事件的应用实例
     """
 
-    type = "BotOfflineEventActive"
+    type: str = "BotOfflineEventActive"
     qq: int
 
     Dispatcher = ApplicationDispatcher
@@ -56,7 +55,7 @@ class BotOfflineEventForce(MiraiEvent):
         ArgonMiraiApplication (annotation): 发布事件的应用实例
     """
 
-    type = "BotOfflineEventForce"
+    type: str = "BotOfflineEventForce"
     qq: int
 
     Dispatcher = ApplicationDispatcher
@@ -71,7 +70,7 @@ class BotOfflineEventDropped(MiraiEvent):
         ArgonMiraiApplication (annotation): 发布事件的应用实例
     """
 
-    type = "BotOfflineEventDropped"
+    type: str = "BotOfflineEventDropped"
     qq: int
 
     Dispatcher = ApplicationDispatcher
@@ -86,7 +85,7 @@ class BotReloginEvent(MiraiEvent):
         ArgonMiraiApplication (annotation): 发布事件的应用实例
     """
 
-    type = "BotReloginEvent"
+    type: str = "BotReloginEvent"
     qq: int
 
     Dispatcher = ApplicationDispatcher
@@ -101,7 +100,7 @@ class FriendInputStatusChangedEvent(MiraiEvent):
         ArgonMiraiApplication (annotation): 发布事件的应用实例
     """
 
-    type = "FriendInputStatusChangedEvent"
+    type: str = "FriendInputStatusChangedEvent"
     friend: Friend
     inputting: bool
 
@@ -115,7 +114,7 @@ class FriendNickChangedEvent(MiraiEvent):
         ArgonMiraiApplication (annotation): 发布事件的应用实例
     """
 
-    type = "FriendNickChangedEvent"
+    type: str = "FriendNickChangedEvent"
     friend: Friend
     from_name: str = Field(..., alias="from")
     to_name: str = Field(..., alias="to")
@@ -130,7 +129,7 @@ class BotGroupPermissionChangeEvent(MiraiEvent):
         ArgonMiraiApplication (annotation): 发布事件的应用实例
     """
 
-    type = "BotGroupPermissionChangeEvent"
+    type: str = "BotGroupPermissionChangeEvent"
     origin: MemberPerm
     current: MemberPerm
     group: Group
@@ -149,10 +148,10 @@ class BotMuteEvent(MiraiEvent):
         Group (annotation, optional = None): 发生该事件的群组
     """
 
-    type = "BotMuteEvent"
+    type: str = "BotMuteEvent"
     durationSeconds: int
-    operator: Optional[Member]
-    group: Optional[Group]
+    operator: Optional[Member] = None
+    group: Optional[Group] = None
 
     class Dispatcher(BaseDispatcher):
         mixin = [ApplicationDispatcher]
@@ -176,9 +175,9 @@ class BotUnmuteEvent(MiraiEvent):
         Group (annotation, optional = None): 发生该事件的群组
     """
 
-    type = "BotUnmuteEvent"
-    operator: Optional[Member]
-    group: Optional[Group]
+    type: str = "BotUnmuteEvent"
+    operator: Optional[Member] = None
+    group: Optional[Group] = None
 
     class Dispatcher(BaseDispatcher):
         mixin = [ApplicationDispatcher]
@@ -201,7 +200,7 @@ class BotJoinGroupEvent(MiraiEvent):
         Group (annotation, optional = None): 发生该事件的群组
     """
 
-    type = "BotJoinGroupEvent"
+    type: str = "BotJoinGroupEvent"
     group: Group
     inviter: Optional[Member] = Field(..., alias="invitor")  # F**k you typo
 
@@ -269,12 +268,12 @@ class GroupRecallEvent(MiraiEvent):
         Group (annotation): 发生该事件的群组
     """
 
-    type = "GroupRecallEvent"
+    type: str = "GroupRecallEvent"
     authorId: int
     messageId: int
     time: datetime
     group: Group
-    operator: Optional[Member]
+    operator: Optional[Member] = None
 
     class Dispatcher(BaseDispatcher):
         mixin = [ApplicationDispatcher]
@@ -296,7 +295,7 @@ class FriendRecallEvent(MiraiEvent):
         ArgonMiraiApplication (annotation): 发布事件的应用实例
     """
 
-    type = "FriendRecallEvent"
+    type: str = "FriendRecallEvent"
     authorId: int
     messageId: int
     time: int
@@ -355,7 +354,7 @@ class GroupNameChangeEvent(MiraiEvent):
         Member (annotation): 更改群名称的成员, 权限必定为管理员或是群主
     """
 
-    type = "GroupNameChangeEvent"
+    type: str = "GroupNameChangeEvent"
     origin: str
     current: str
     group: Group
@@ -383,11 +382,11 @@ class GroupEntranceAnnouncementChangeEvent(MiraiEvent):
         Member (annotation, return:optional): 作出此操作的管理员/群主, 若为 None 则为应用实例所辖账号操作
     """
 
-    type = "GroupEntranceAnnouncementChangeEvent"
+    type: str = "GroupEntranceAnnouncementChangeEvent"
     origin: str
     current: str
     group: Group
-    operator: Optional[Member]
+    operator: Optional[Member] = None
 
     class Dispatcher(BaseDispatcher):
         mixin = [ApplicationDispatcher]
@@ -413,11 +412,11 @@ class GroupMuteAllEvent(MiraiEvent):
         Member (annotation, return:optional): 作出此操作的管理员/群主, 若为 None 则为应用实例所辖账号操作
     """
 
-    type = "GroupMuteAllEvent"
+    type: str = "GroupMuteAllEvent"
     origin: bool
     current: bool
     group: Group
-    operator: Optional[Member]
+    operator: Optional[Member] = None
 
     class Dispatcher(BaseDispatcher):
         mixin = [ApplicationDispatcher]
@@ -441,11 +440,11 @@ class GroupAllowAnonymousChatEvent(MiraiEvent):
         Member (annotation, return:optional): 作出此操作的管理员/群主, 若为 None 则为应用实例所辖账号操作
     """
 
-    type = "GroupAllowAnonymousChatEvent"
+    type: str = "GroupAllowAnonymousChatEvent"
     origin: bool
     current: bool
     group: Group
-    operator: Optional[Member]
+    operator: Optional[Member] = None
 
     class Dispatcher(BaseDispatcher):
         mixin = [ApplicationDispatcher]
@@ -469,11 +468,11 @@ class GroupAllowConfessTalkEvent(MiraiEvent):
         Member (annotation, return:optional): 作出此操作的管理员/群主, 若为 None 则为应用实例所辖账号操作
     """
 
-    type = "GroupAllowConfessTalkEvent"
+    type: str = "GroupAllowConfessTalkEvent"
     origin: bool
     current: bool
     group: Group
-    operator: Optional[Member]
+    operator: Optional[Member] = None
 
     class Dispatcher(BaseDispatcher):
         mixin = [ApplicationDispatcher]
@@ -497,11 +496,11 @@ class GroupAllowMemberInviteEvent(MiraiEvent):
         Member (annotation, return:optional): 作出此操作的管理员/群主, 若为 None 则为应用实例所辖账号操作
     """
 
-    type = "GroupAllowMemberInviteEvent"
+    type: str = "GroupAllowMemberInviteEvent"
     origin: bool
     current: bool
     group: Group
-    operator: Optional[Member]
+    operator: Optional[Member] = None
 
     class Dispatcher(BaseDispatcher):
         mixin = [ApplicationDispatcher]
@@ -525,7 +524,7 @@ class MemberJoinEvent(MiraiEvent):
         Member (annotation): 关于该用户的成员实例
     """
 
-    type = "MemberJoinEvent"
+    type: str = "MemberJoinEvent"
     member: Member
     inviter: Optional[Member] = Field(..., alias="invitor")
 
@@ -553,9 +552,9 @@ class MemberLeaveEventKick(MiraiEvent):
           - `"operator"` (default, const, str, return:optional): 执行了该操作的管理员/群主, 也可能是应用实例所辖账号.
     """
 
-    type = "MemberLeaveEventKick"
+    type: str = "MemberLeaveEventKick"
     member: Member
-    operator: Optional[Member]
+    operator: Optional[Member] = None
 
     class Dispatcher(BaseDispatcher):
         mixin = [ApplicationDispatcher]
@@ -582,7 +581,7 @@ class MemberLeaveEventQuit(MiraiEvent):
         Member (annotation): 主动退出群组的成员
     """
 
-    type = "MemberLeaveEventQuit"
+    type: str = "MemberLeaveEventQuit"
     member: Member
 
     class Dispatcher(BaseDispatcher):
@@ -609,11 +608,11 @@ class MemberCardChangeEvent(MiraiEvent):
           - `"operator"` (default, const, str, return:optional): 该操作的执行者, 可能是管理员/群主, 该成员自己, 也可能是应用实例所辖账号(这时, `operator` 为 `None`).
     """
 
-    type = "MemberCardChangeEvent"
+    type: str = "MemberCardChangeEvent"
     origin: str
     current: str
     member: Member
-    operator: Optional[Member]
+    operator: Optional[Member] = None
 
     class Dispatcher(BaseDispatcher):
         mixin = [ApplicationDispatcher]
@@ -638,7 +637,7 @@ class MemberSpecialTitleChangeEvent(MiraiEvent):
         Member (annotation): 被更改群头衔的群组成员
     """
 
-    type = "MemberSpecialTitleChangeEvent"
+    type: str = "MemberSpecialTitleChangeEvent"
     origin: str
     current: str
     member: Member
@@ -667,7 +666,7 @@ class MemberPermissionChangeEvent(MiraiEvent):
         Member (annotation): 被调整权限的群组成员
     """
 
-    type = "MemberPermissionChangeEvent"
+    type: str = "MemberPermissionChangeEvent"
     origin: str
     current: str
     member: Member
@@ -696,10 +695,10 @@ class MemberMuteEvent(MiraiEvent):
           - `"operator"` (default, const, str, return:optional): 该操作的执行者, 也可能是应用实例所辖账号.
     """
 
-    type = "MemberMuteEvent"
+    type: str = "MemberMuteEvent"
     durationSeconds: int
     member: Member
-    operator: Optional[Member]
+    operator: Optional[Member] = None
 
     class Dispatcher(BaseDispatcher):
         mixin = [ApplicationDispatcher]
@@ -728,9 +727,9 @@ class MemberUnmuteEvent(MiraiEvent):
           - `"operator"` (default, const, str, return:optional): 该操作的执行者, 可能是管理员或是群主, 也可能是应用实例所辖账号.
     """
 
-    type = "MemberUnmuteEvent"
+    type: str = "MemberUnmuteEvent"
     member: Member
-    operator: Optional[Member]
+    operator: Optional[Member] = None
 
     class Dispatcher(BaseDispatcher):
         mixin = [ApplicationDispatcher]
@@ -757,7 +756,7 @@ class MemberHonorChangeEvent:
         Member (annotation): 获得/失去荣誉的成员
     """
 
-    type = "MemberHonorChangeEvent"
+    type: str = "MemberHonorChangeEvent"
     member: Member
     action: str
     honor: str
@@ -829,7 +828,7 @@ class NewFriendRequestEvent(RequestEvent):
         4. 拒绝并不再接受来自对方的请求: `await event.rejectAndBlock()`, 具体查看该方法所附带的说明.
     """
 
-    type = "NewFriendRequestEvent"
+    type: str = "NewFriendRequestEvent"
 
     Dispatcher = ApplicationDispatcher
 
@@ -905,7 +904,7 @@ class MemberJoinRequestEvent(RequestEvent):
         6. 忽略并不再接受来自对方的请求: `await event.ignoreAndBlock()`, 具体查看该方法所附带的说明.
     """
 
-    type = "MemberJoinRequestEvent"
+    type: str = "MemberJoinRequestEvent"
     requestId: int = Field(..., alias="eventId")
     supplicant: int = Field(..., alias="fromId")  # 即请求方 QQ
     groupId: Optional[int] = Field(..., alias="groupId")
@@ -1014,7 +1013,7 @@ class BotInvitedJoinGroupRequestEvent(RequestEvent):
         3. 拒绝请求: `await event.reject()`, 具体查看该方法所附带的说明.
     """
 
-    type = "BotInvitedJoinGroupRequestEvent"
+    type: str = "BotInvitedJoinGroupRequestEvent"
     requestId: int = Field(..., alias="eventId")
     supplicant: int = Field(..., alias="fromId")  # 即请求方 QQ
     groupId: Optional[int] = Field(..., alias="groupId")
@@ -1064,9 +1063,9 @@ class OtherClientOnlineEvent(MiraiEvent):
         ArgonMiraiApplication (annotation): 发布事件的应用实例
     """
 
-    type = "OtherClientOnlineEvent"
+    type: str = "OtherClientOnlineEvent"
     client: Client
-    kind: Optional[int]
+    kind: Optional[int] = None
 
 
 class OtherClientOfflineEvent(MiraiEvent):
@@ -1078,7 +1077,7 @@ class OtherClientOfflineEvent(MiraiEvent):
         ArgonMiraiApplication (annotation): 发布事件的应用实例
     """
 
-    type = "OtherClientOfflineEvent"
+    type: str = "OtherClientOfflineEvent"
     client: Client
 
 
@@ -1093,6 +1092,6 @@ class CommandExecutedEvent(MiraiEvent):
 
     eventId: int
     name: str
-    friend: Optional[Friend]
-    member: Optional[Member]
+    friend: Optional[Friend] = None
+    member: Optional[Member] = None
     args: List[Element]
@@ -0,0 +1,252 @@
+"""
+群文件的本地索引.
+
+`FileIndex` 保存一个群的文件树, 按名称或前缀的查找都在本地完成.
+经由索引进行的修改会即时反映到索引中, 并把涉及的文件夹标记为待刷新;
+`refresh` 只重新列出这些文件夹 (以及超过 `max_age` 未刷新的文件夹).
+
+    index = FileIndex(app, group)
+    await index.build()
+    index.find_prefix("report")
+    await index.rename(file, "report-2021.pdf")
+    await index.refresh()
+"""
+import bisect
+import time
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Set, Tuple, Union
+
+from graia.argon.model import FileInfo, Group
+
+if TYPE_CHECKING:
+    from graia.argon.app import ArgonMiraiApplication
+
+
+class FileIndex:
+    """
+    一个群的文件树索引.
+
+    Args:
+        app (ArgonMiraiApplication): 应用实例.
+        group (Union[Group, int]): 群组或群号.
+        root (str): 作为索引根的文件夹 ID, 空串为根目录.
+    """
+
+    def __init__(
+        self, app: "ArgonMiraiApplication", group: Union[Group, int], root: str = ""
+    ) -> None:
+        self.app = app
+        self.group = group.id if isinstance(group, Group) else group
+        self.root = root
+        self.files: Dict[str, FileInfo] = {}
+        self.parents: Dict[str, str] = {}
+        self.children: Dict[str, Set[str]] = {}
+        self.names: List[Tuple[str, str]] = []
+        self.listed_at: Dict[str, float] = {}
+        self.dirty: Set[str] = set()
+
+    # 查询
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+    def __contains__(self, file_id: str) -> bool:
+        return file_id in self.files
+
+    def __iter__(self) -> Iterator[FileInfo]:
+        return iter(self.files.values())
+
+    def get(self, file_id: str) -> Optional[FileInfo]:
+        return self.files.get(file_id)
+
+    def list(self, directory: str = "") -> List[FileInfo]:
+        """列出索引中某个文件夹 (默认为根) 的直接内容."""
+        directory = directory or self.root
+        return [self.files[i] for i in self.children.get(directory, ())]
+
+    def path(self, file_id: str) -> str:
+        """由父文件夹关系得到的路径, 以 `/` 分隔."""
+        names = []
+        while file_id in self.files:
+            names.append(self.files[file_id].name)
+            file_id = self.parents[file_id]
+        return "/" + "/".join(reversed(names))
+
+    def find(self, name: str) -> List[FileInfo]:
+        """按完整名称查找."""
+        start = bisect.bisect_left(self.names, (name, ""))
+        result = []
+        for entry_name, file_id in self.names[start:]:
+            if entry_name != name:
+                break
+            result.append(self.files[file_id])
+        return result
+
+    def find_prefix(self, prefix: str) -> List[FileInfo]:
+        """按名称前缀查找, 结果按名称排序."""
+        start = bisect.bisect_left(self.names, (prefix, ""))
+        result = []
+        for entry_name, file_id in self.names[start:]:
+            if not entry_name.startswith(prefix):
+                break
+            result.append(self.files[file_id])
+        return result
+
+    # 维护
+
+    def add(self, file: FileInfo, parent: str) -> None:
+        if file.id in self.files:
+            self.remove(file.id)
+        self.files[file.id] = file
+        self.parents[file.id] = parent
+        self.children.setdefault(parent, set()).add(file.id)
+        bisect.insort(self.names, (file.name, file.id))
+
+    def remove(self, file_id: str) -> None:
+        """从索引中移除文件, 文件夹的内容会被一并移除."""
+        file = self.files.pop(file_id, None)
+        if file is None:
+            return
+        for child in list(self.children.pop(file_id, ())):
+            self.remove(child)
+        self.children.get(self.parents.pop(file_id), set()).discard(file_id)
+        self.listed_at.pop(file_id, None)
+        self.dirty.discard(file_id)
+        i = bisect.bisect_left(self.names, (file.name, file_id))
+        if i < len(self.names) and self.names[i] == (file.name, file_id):
+            del self.names[i]
+
+    def mark_dirty(self, directory: str = "") -> None:
+        """标记文件夹在下次 `refresh` 时重新列出."""
+        self.dirty.add(directory or self.root)
+
+    async def build(self) -> None:
+        """清空并重新建立整个索引."""
+        self.files.clear()
+        self.parents.clear()
+        self.children.clear()
+        self.names.clear()
+        self.listed_at.clear()
+        self.dirty.clear()
+        await self.index_tree(self.root)
+
+    async def index_tree(self, directory: str) -> None:
+        """递归地索引 `directory` 的全部内容."""
+        now = time.monotonic()
+        self.children.setdefault(directory, set())
+        self.listed_at[directory] = now
+        async for file in self.app.iterFile(self.group, directory, recursive=True):
+            parent = (
+                file.parent.id
+                if file.parent and file.parent.id in self.files
+                else directory
+            )
+            self.add(file, parent)
+            if file.is_directory:
+                self.children.setdefault(file.id, set())
+                self.listed_at[file.id] = now
+
+    async def refresh(self, max_age: Optional[float] = None) -> int:
+        """
+        重新列出被标记的文件夹, 以及超过 `max_age` 秒未刷新的文件夹.
+        新出现的子文件夹会被完整索引, 消失的文件连同其内容会被移除.
+
+        Args:
+            max_age (Optional[float]): 文件夹列表的最长有效时间, 为 None 时只刷新被标记的文件夹.
+
+        Returns:
+            int: 被重新列出的文件夹数量.
+        """
+        directories = set(self.dirty)
+        if max_age is not None:
+            deadline = time.monotonic() - max_age
+            directories.update(d for d, t in self.listed_at.items() if t < deadline)
+        self.dirty.clear()
+        for directory in directories:
+            if directory != self.root and directory not in self.files:
+                continue  # 已经随上级文件夹被移除
+            await self.refresh_directory(directory)
+        return len(directories)
+
+    async def refresh_directory(self, directory: str) -> None:
+        listed: Dict[str, FileInfo] = {}
+        async for file in self.app.iterFile(self.group, directory):
+            listed[file.id] = file
+        self.listed_at[directory] = time.monotonic()
+        for file_id in self.children.get(directory, set()) - listed.keys():
+            self.remove(file_id)
+        for file_id, file in listed.items():
+            known = self.files.get(file_id)
+            if known is not None and self.parents[file_id] == directory:
+                file.download_info = file.download_info or known.download_info
+                if known.name != file.name:
+                    self.attach(file, directory, self.detach(file_id))
+                else:
+                    self.files[file_id] = file
+                continue
+            self.add(file, directory)
+            if file.is_directory:
+                await self.index_tree(file_id)
+
+    # 修改
+
+    async def make_directory(self, name: str, parent: str = "") -> FileInfo:
+        parent = parent or self.root
+        file = await self.app.makeDirectory(self.group, name, parent)
+        self.add(file, parent)
+        self.children.setdefault(file.id, set())
+        self.listed_at[file.id] = time.monotonic()
+        return file
+
+    async def delete(self, file: Union[FileInfo, str]) -> None:
+        file_id = file.id if isinstance(file, FileInfo) else file
+        await self.app.deleteFile(self.group, file_id)
+        self.remove(file_id)
+
+    async def rename(self, file: Union[FileInfo, str], name: str) -> None:
+        file_id = file.id if isinstance(file, FileInfo) else file
+        await self.app.renameFile(self.group, file_id, name)
+        known = self.files.get(file_id)
+        if known is not None:
+            parent = self.parents[file_id]
+            self.mark_dirty(parent)
+            subtree = self.detach(file_id)
+            known.name = name
+            self.attach(known, parent, subtree)
+
+    async def move(self, file: Union[FileInfo, str], directory: str = "") -> None:
+        file_id = file.id if isinstance(file, FileInfo) else file
+        directory = directory or self.root
+        await self.app.moveFile(self.group, file_id, directory)
+        known = self.files.get(file_id)
+        if known is not None:
+            self.mark_dirty(self.parents[file_id])
+            self.attach(known, directory, self.detach(file_id))
+        self.mark_dirty(directory)
+
+    def detach(self, file_id: str) -> List[Tuple[FileInfo, str]]:
+        "移除文件及其内容, 返回被移除的内容以便重新挂载."
+        subtree = []
+        stack = list(self.children.get(file_id, ()))
+        while stack:
+            child = stack.pop()
+            subtree.append((self.files[child], self.parents[child]))
+            stack.extend(self.children.get(child, ()))
+        listed_at = {
+            i: self.listed_at[i]
+            for i in [file_id, *(child.id for child, _ in subtree)]
+            if i in self.listed_at
+        }
+        self.remove(file_id)
+        self.listed_at.update(listed_at)
+        return subtree
+
+    def attach(
+        self, file: FileInfo, parent: str, subtree: List[Tuple[FileInfo, str]]
+    ) -> None:
+        self.add(file, parent)
+        if file.is_directory:
+            self.children.setdefault(file.id, set())
+        for child, child_parent in subtree:
+            self.add(child, child_parent)
+            if child.is_directory:
+                self.children.setdefault(child.id, set())
@@ -4,7 +4,8 @@ import copy
 from typing import Iterable, List, Optional, Sequence, Tuple, Type, TypeVar, Union
 
 from graia.broadcast.utilles import run_always_await
-from pydantic import BaseModel
+
+from graia.argon.compat import ROOT, RootModel, construct, validator
 
 from .element import Element, _update_forward_refs
 
@@ -13,12 +14,15 @@ MessageIndex = Tuple[int, Optional[int]]
 Element_T = TypeVar("Element_T", bound=Element)
 
 
-class MessageChain(BaseModel):
+class MessageChain(RootModel[List[Element]]):
     """
     即 "消息链", 被用于承载整个消息内容的数据结构, 包含有一有序列表, 包含有继承了 Element 的各式类实例.
     """
 
-    __root__: List[Element]
+    @validator("__root__", pre=True, allow_reuse=True)
+    def _(cls, v):
+        # 作为其他模型的字段被校验时同样将 dict 转为对应的元素
+        return cls.build_chain(v)
 
     @staticmethod
     def build_chain(obj: List[Union[dict, Element]]) -> List[Element]:
@@ -56,7 +60,19 @@ class MessageChain(BaseModel):
         return cls(__root__=cls.build_chain(obj))
 
     def __init__(self, __root__: Iterable[Element]) -> None:
-        super().__init__(__root__=self.build_chain(__root__))
+        super().__init__(**{ROOT: self.build_chain(__root__)})
+
+    @classmethod
+    def build(cls, elements: List[Element]) -> "MessageChain":
+        """不经过校验, 直接以 `elements` (不复制) 构造消息链, 用于由已有元素生成消息链的内部代码.
+
+        Args:
+            elements (List[Element]): 消息元素的列表, 其中只能有 Element 实例.
+
+        Returns:
+            MessageChain: 以该列表为内容的消息链
+        """
+        return construct(cls, {ROOT: elements}, {ROOT})
 
     @classmethod
     def create(
@@ -226,7 +242,7 @@ class MessageChain(BaseModel):
                 else:
                     final_text = first_slice[0].text[item.start[1] :]
                     result = [
-                        *([Plain(final_text)] if final_text else []),
+                        *([Plain.intern(final_text)] if final_text else []),
                         *first_slice[1:],
                     ]
             else:
@@ -243,11 +259,11 @@ class MessageChain(BaseModel):
                 final_text = first_slice[-1].text[: item.stop[1]]
                 result = [
                     *first_slice[:-1],
-                    *([Plain(final_text)] if final_text else []),
+                    *([Plain.intern(final_text)] if final_text else []),
                 ]
             else:
                 result = first_slice
-        return MessageChain(result)
+        return MessageChain.build(result)
 
     def exclude(self, *types: Type[Element]) -> MessageChain:
         """将除了在给出的消息元素类型中符合的消息元素重新包装为一个新的消息链
@@ -258,7 +274,7 @@ class MessageChain(BaseModel):
         Returns:
             MessageChain: 返回的消息链中不包含参数中给出的消息元素类型
         """
-        return MessageChain([i for i in self.__root__ if type(i) not in types])
+        return MessageChain.build([i for i in self.__root__ if type(i) not in types])
 
     def include(self, *types: Type[Element]) -> MessageChain:
         """将只在给出的消息元素类型中符合的消息元素重新包装为一个新的消息链
@@ -269,7 +285,7 @@ class MessageChain(BaseModel):
         Returns:
             MessageChain: 返回的消息链中只包含参数中给出的消息元素类型
         """
-        return MessageChain([i for i in self.__root__ if type(i) in types])
+        return MessageChain.build([i for i in self.__root__ if type(i) in types])
 
     def split(self, pattern: str, raw_string: bool = False) -> List["MessageChain"]:
         """和 `str.split` 差不多, 提供一个字符串, 然后返回分割结果.
@@ -286,15 +302,15 @@ class MessageChain(BaseModel):
                 split_result = element.text.split(pattern)
                 for index, split_str in enumerate(split_result):
                     if tmp and index > 0:
-                        result.append(MessageChain(tmp))
+                        result.append(MessageChain.build(tmp))
                         tmp = []
                     if split_str or raw_string:
-                        tmp.append(Plain(split_str))
+                        tmp.append(Plain.intern(split_str))
             else:
                 tmp.append(element)
         else:
             if tmp:
-                result.append(MessageChain(tmp))
+                result.append(MessageChain.build(tmp))
                 tmp = []
         return result
 
@@ -371,17 +387,17 @@ class MessageChain(BaseModel):
         for i in self.__root__:
             if not isinstance(i, Plain):
                 if plain:
-                    result.append(Plain("".join(plain)))
+                    result.append(Plain.intern("".join(plain)))
                     plain.clear()  # 清空缓存
                 result.append(i)
             else:
                 plain.append(i.text)
         else:
             if plain:
-                result.append(Plain("".join(plain)))
+                result.append(Plain.intern("".join(plain)))
                 plain.clear()
         if copy:
-            return MessageChain(result)
+            return MessageChain.build(result)
         else:
             self.__root__ = result
 
@@ -0,0 +1,514 @@
+"""
+`MessageChain` 的紧凑二进制编码.
+
+与 JSON 相比:
+ - 元素类型编码为固定表中的序号, 字段按定义顺序依次写入, 不写字段名.
+ - 整数使用 zigzag varint, 常见的 QQ 号与消息 ID 只占 4 ~ 5 字节.
+ - `Image` 与 `Voice` 的 `base64` 字段以原始字节保存, 比 base64 文本小约 1/4.
+ - 解码时直接构造元素, 不再经过 pydantic 校验.
+
+    data = dumps(chain)
+    chain = loads(data)
+
+`dump_frame` 在编码前加上长度前缀, 多条消息链可以依次写入同一个流,
+再由 `StreamDecoder` 从任意切分的数据块中逐条解出.
+
+编码格式的兼容性: `ELEMENT_TYPES` 与 `ENUM_TYPES` 只能在末尾追加,
+元素新增的字段也只能追加在已有字段之后.
+"""
+import base64
+import binascii
+import struct
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from pathlib import Path, PurePath
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Type
+
+from graia.argon.compat import BaseModel, construct, model_fields, model_values
+
+from .chain import MessageChain
+from .element import Element, ForwardNode, ImageType, PokeMethods
+
+ELEMENT_TYPES: List[str] = [
+    "Plain",
+    "Source",
+    "Quote",
+    "At",
+    "AtAll",
+    "Face",
+    "Xml",
+    "Json",
+    "App",
+    "Poke",
+    "Dice",
+    "MusicShare",
+    "Forward",
+    "File",
+    "Image",
+    "FlashImage",
+    "Voice",
+]
+"已知元素类型的编码序号, 只能在末尾追加."
+
+MODEL_TYPES: List[Type[BaseModel]] = [ForwardNode]
+"可以出现在元素字段中的非元素模型, 只能在末尾追加."
+
+ENUM_TYPES: List[Type[Enum]] = [PokeMethods, ImageType]
+"可以出现在元素字段中的枚举类型, 只能在末尾追加."
+
+NONE = 0x00
+FALSE = 0x01
+TRUE = 0x02
+INT = 0x03
+FLOAT = 0x04
+STR = 0x05
+BYTES = 0x06
+LIST = 0x07
+DICT = 0x08
+DATETIME = 0x09
+ELEMENT = 0x0A
+CHAIN = 0x0B
+ENUM = 0x0C
+MODEL = 0x0D
+PATH = 0x0E
+BASE64 = 0x0F
+
+EPOCH = datetime(1970, 1, 1)
+SECOND = timedelta(seconds=1)
+
+pack_float = struct.Struct("<d").pack
+unpack_float = struct.Struct("<d").unpack_from
+
+
+class CodecError(ValueError):
+    "数据无法被编码或解码."
+
+
+def element_classes() -> Dict[str, Type[Element]]:
+    """按 `type` 索引所有元素类, 包括间接子类 (如 `FlashImage`)."""
+    classes: Dict[str, Type[Element]] = {}
+    stack = list(Element.__subclasses__())
+    while stack:
+        cls = stack.pop()
+        stack.extend(cls.__subclasses__())
+        name = model_fields(cls)["type"].default
+        if name:
+            classes.setdefault(name, cls)
+    return classes
+
+
+class Schema:
+    """一种元素或模型的编码信息: 类, 字段顺序以及编码序号."""
+
+    __slots__ = ("cls", "tag", "fields", "field_set", "defaults")
+
+    def __init__(self, cls: Type[BaseModel], tag: int) -> None:
+        self.cls = cls
+        self.tag = tag
+        fields = model_fields(cls)
+        self.fields: Tuple[str, ...] = tuple(f for f in fields if f != "type")
+        self.field_set = frozenset(fields)
+        self.defaults: Dict[str, Any] = {
+            name: None if field.required else field.get_default()
+            for name, field in fields.items()
+        }
+        "按定义顺序排列的字段默认值, 必需字段总会被编码, 以 None 占位."
+
+    def build(
+        self, values: Dict[str, Any], extra: Optional[Dict[str, Any]] = None
+    ) -> BaseModel:
+        "与 `construct` 相同, 但省去了逐个字段的处理."
+        fields_set = set(values)
+        if extra:
+            fields_set.update(extra)
+        return construct(self.cls, {**self.defaults, **values}, fields_set, extra)
+
+
+schemas_by_name: Dict[str, Schema] = {}
+schemas_by_tag: List[Optional[Schema]] = []
+model_schemas: Dict[type, Schema] = {}
+enum_tags: Dict[type, int] = {cls: i for i, cls in enumerate(ENUM_TYPES)}
+
+
+def load_schemas() -> None:
+    if schemas_by_tag:
+        return
+    classes = element_classes()
+    for tag, name in enumerate(ELEMENT_TYPES):
+        cls = classes.get(name)
+        schema = Schema(cls, tag) if cls else None
+        schemas_by_tag.append(schema)
+        if schema:
+            schemas_by_name[name] = schema
+    for tag, cls in enumerate(MODEL_TYPES):
+        model_schemas[cls] = Schema(cls, tag)
+
+
+# 编码
+
+
+def write_varint(out: bytearray, value: int) -> None:
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def write_str(out: bytearray, value: str) -> None:
+    data = value.encode("utf-8")
+    write_varint(out, len(data))
+    out += data
+
+
+def write_value(out: bytearray, value: Any) -> None:
+    cls = value.__class__
+    if value is None:
+        out.append(NONE)
+    elif cls is bool:
+        out.append(TRUE if value else FALSE)
+    elif cls is int:
+        out.append(INT)
+        write_varint(out, value << 1 if value >= 0 else (-value << 1) - 1)
+    elif cls is str:
+        out.append(STR)
+        write_str(out, value)
+    elif isinstance(value, Element):
+        out.append(ELEMENT)
+        write_element(out, value)
+    elif cls is MessageChain:
+        out.append(CHAIN)
+        write_chain(out, value)
+    elif cls is datetime:
+        out.append(DATETIME)
+        if value.tzinfo is not None and value.utcoffset():
+            raise CodecError(f"only UTC or naive datetime is supported: {value!r}")
+        out.append(value.tzinfo is not None)
+        seconds = (value.replace(tzinfo=None) - EPOCH) // SECOND
+        write_varint(out, seconds << 1 if seconds >= 0 else (-seconds << 1) - 1)
+        write_varint(out, value.microsecond)
+    elif cls is float:
+        out.append(FLOAT)
+        out += pack_float(value)
+    elif isinstance(value, (bytes, bytearray)):
+        out.append(BYTES)
+        write_varint(out, len(value))
+        out += value
+    elif isinstance(value, (list, tuple)):
+        out.append(LIST)
+        write_varint(out, len(value))
+        for item in value:
+            write_value(out, item)
+    elif isinstance(value, dict):
+        out.append(DICT)
+        write_varint(out, len(value))
+        for key, item in value.items():
+            write_str(out, key)
+            write_value(out, item)
+    elif cls in enum_tags:
+        out.append(ENUM)
+        write_varint(out, enum_tags[cls])
+        write_value(out, value.value)
+    elif cls in model_schemas:
+        out.append(MODEL)
+        write_model(out, model_schemas[cls], value)
+    elif isinstance(value, PurePath):
+        out.append(PATH)
+        write_str(out, str(value))
+    else:
+        raise CodecError(f"unsupported value: {value!r}")
+
+
+def write_fields(out: bytearray, schema: Schema, value: BaseModel) -> None:
+    values = model_values(value)
+    write_varint(out, len(schema.fields))
+    for name in schema.fields:
+        write_value(out, values.get(name))
+    extra = [key for key in values if key not in schema.field_set]
+    write_varint(out, len(extra))
+    for key in extra:
+        write_str(out, key)
+        write_value(out, values[key])
+
+
+def write_model(out: bytearray, schema: Schema, value: BaseModel) -> None:
+    write_varint(out, schema.tag)
+    write_fields(out, schema, value)
+
+
+def write_element(out: bytearray, element: Element) -> None:
+    schema = schemas_by_name.get(element.type)
+    if schema is None or schema.cls is not element.__class__:
+        # 未知的元素类型: 写入类型名与全部字段
+        out.append(0)
+        write_str(out, element.type)
+        fields = {k: v for k, v in model_values(element).items() if k != "type"}
+        write_value(out, fields)
+        return
+    write_varint(out, schema.tag + 1)
+    if "base64" in schema.field_set:
+        write_media_fields(out, schema, element)
+    else:
+        write_fields(out, schema, element)
+
+
+def write_media_fields(out: bytearray, schema: Schema, element: Element) -> None:
+    "与 `write_fields` 相同, 但把可以无损还原的 base64 文本写为原始字节."
+    values = model_values(element)
+    write_varint(out, len(schema.fields))
+    for name in schema.fields:
+        value = values.get(name)
+        if name == "base64" and value.__class__ is str:
+            try:
+                data = base64.b64decode(value, validate=True)
+            except binascii.Error:
+                data = None
+            if data is not None and base64.b64encode(data).decode() == value:
+                out.append(BASE64)
+                write_varint(out, len(data))
+                out += data
+                continue
+        write_value(out, value)
+    extra = [key for key in values if key not in schema.field_set]
+    write_varint(out, len(extra))
+    for key in extra:
+        write_str(out, key)
+        write_value(out, values[key])
+
+
+def write_chain(out: bytearray, chain: MessageChain) -> None:
+    elements = chain.__root__
+    write_varint(out, len(elements))
+    for element in elements:
+        write_element(out, element)
+
+
+def dumps(chain: MessageChain) -> bytes:
+    """将消息链编码为字节串."""
+    load_schemas()
+    out = bytearray()
+    write_chain(out, chain)
+    return bytes(out)
+
+
+def dump_frame(chain: MessageChain) -> bytes:
+    """编码消息链并加上 varint 长度前缀, 用于写入流."""
+    body = dumps(chain)
+    out = bytearray()
+    write_varint(out, len(body))
+    out += body
+    return bytes(out)
+
+
+# 解码
+
+
+class Incomplete(Exception):
+    "数据在一个值的中间结束."
+
+
+def read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    result = 0
+    shift = 0
+    try:
+        while True:
+            byte = data[pos]
+            pos += 1
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return result, pos
+            shift += 7
+    except IndexError:
+        raise Incomplete from None
+
+
+def read_bytes(data: bytes, pos: int) -> Tuple[bytes, int]:
+    length, pos = read_varint(data, pos)
+    end = pos + length
+    if end > len(data):
+        raise Incomplete
+    return data[pos:end], end
+
+
+def read_str(data: bytes, pos: int) -> Tuple[str, int]:
+    raw, pos = read_bytes(data, pos)
+    return raw.decode("utf-8"), pos
+
+
+def read_value(data: bytes, pos: int) -> Tuple[Any, int]:
+    try:
+        tag = data[pos]
+    except IndexError:
+        raise Incomplete from None
+    pos += 1
+    if tag == NONE:
+        return None, pos
+    if tag == FALSE:
+        return False, pos
+    if tag == TRUE:
+        return True, pos
+    if tag == INT:
+        value, pos = read_varint(data, pos)
+        return (value >> 1) ^ -(value & 1), pos
+    if tag == STR:
+        return read_str(data, pos)
+    if tag == ELEMENT:
+        return read_element(data, pos)
+    if tag == CHAIN:
+        return read_chain(data, pos)
+    if tag == DATETIME:
+        try:
+            aware = data[pos]
+        except IndexError:
+            raise Incomplete from None
+        seconds, pos = read_varint(data, pos + 1)
+        microsecond, pos = read_varint(data, pos)
+        value = EPOCH + timedelta(seconds=(seconds >> 1) ^ -(seconds & 1))
+        value = value.replace(microsecond=microsecond)
+        return (value.replace(tzinfo=timezone.utc) if aware else value), pos
+    if tag == FLOAT:
+        if pos + 8 > len(data):
+            raise Incomplete
+        return unpack_float(data, pos)[0], pos + 8
+    if tag == BYTES:
+        return read_bytes(data, pos)
+    if tag == BASE64:
+        raw, pos = read_bytes(data, pos)
+        return base64.b64encode(raw).decode(), pos
+    if tag == LIST:
+        length, pos = read_varint(data, pos)
+        items = []
+        for _ in range(length):
+            item, pos = read_value(data, pos)
+            items.append(item)
+        return items, pos
+    if tag == DICT:
+        length, pos = read_varint(data, pos)
+        result = {}
+        for _ in range(length):
+            key, pos = read_str(data, pos)
+            result[key], pos = read_value(data, pos)
+        return result, pos
+    if tag == ENUM:
+        index, pos = read_varint(data, pos)
+        value, pos = read_value(data, pos)
+        return ENUM_TYPES[index](value), pos
+    if tag == MODEL:
+        index, pos = read_varint(data, pos)
+        return read_fields(data, pos, model_schemas[MODEL_TYPES[index]])
+    if tag == PATH:
+        text, pos = read_str(data, pos)
+        return Path(text), pos
+    raise CodecError(f"unknown tag {tag:#x} at {pos - 1}")
+
+
+def read_fields(data: bytes, pos: int, schema: Schema) -> Tuple[Any, int]:
+    count, pos = read_varint(data, pos)
+    values: Dict[str, Any] = {}
+    fields = schema.fields
+    for i in range(count):
+        value, pos = read_value(data, pos)
+        if i < len(fields):
+            values[fields[i]] = value
+    count, pos = read_varint(data, pos)
+    extra: Dict[str, Any] = {}
+    for _ in range(count):
+        key, pos = read_str(data, pos)
+        extra[key], pos = read_value(data, pos)
+    return schema.build(values, extra), pos
+
+
+def read_element(data: bytes, pos: int) -> Tuple[Element, int]:
+    tag, pos = read_varint(data, pos)
+    if tag == 0:
+        name, pos = read_str(data, pos)
+        fields, pos = read_value(data, pos)
+        schema = schemas_by_name.get(name)
+        if schema is not None:
+            return schema.cls.parse_obj({**fields, "type": name}), pos
+        # 当前版本中不存在的元素类型
+        return construct(Element, {"type": name}, {"type", *fields}, fields), pos
+    schema = schemas_by_tag[tag - 1] if tag <= len(schemas_by_tag) else None
+    if schema is None:
+        raise CodecError(f"unknown element tag {tag - 1}")
+    return read_fields(data, pos, schema)
+
+
+def read_chain(data: bytes, pos: int) -> Tuple[MessageChain, int]:
+    count, pos = read_varint(data, pos)
+    elements = []
+    for _ in range(count):
+        element, pos = read_element(data, pos)
+        elements.append(element)
+    return MessageChain.build(elements), pos
+
+
+def loads(data: bytes) -> MessageChain:
+    """从 `dumps` 的结果还原消息链."""
+    load_schemas()
+    try:
+        chain, pos = read_chain(data, 0)
+    except Incomplete:
+        raise CodecError("truncated data") from None
+    if pos != len(data):
+        raise CodecError(f"{len(data) - pos} trailing bytes")
+    return chain
+
+
+class StreamDecoder:
+    """
+    从 `dump_frame` 写出的流中逐条解出消息链, 数据可以按任意边界分块传入.
+
+        decoder = StreamDecoder()
+        for block in blocks:
+            for chain in decoder.feed(block):
+                ...
+    """
+
+    def __init__(self) -> None:
+        self.buffer = bytearray()
+
+    def feed(self, data: bytes) -> List[MessageChain]:
+        """传入一块数据, 返回其中已经完整的消息链."""
+        load_schemas()
+        buffer = self.buffer
+        buffer += data
+        result = []
+        pos = 0
+        while pos < len(buffer):
+            try:
+                length, start = read_varint(buffer, pos)
+            except Incomplete:
+                break
+            end = start + length
+            if end > len(buffer):
+                break
+            chain, stop = read_chain(bytes(buffer[start:end]), 0)
+            if stop != length:
+                raise CodecError(f"frame length mismatch: {stop} != {length}")
+            result.append(chain)
+            pos = end
+        del buffer[:pos]
+        return result
+
+    def __len__(self) -> int:
+        "尚未解码的字节数."
+        return len(self.buffer)
+
+
+def iter_frames(
+    read: Callable[[int], bytes], chunk_size: int = 65536
+) -> Iterator[MessageChain]:
+    """
+    从 `read` (如文件对象的 `read` 方法) 中依次读出消息链, 直到数据结束.
+
+    Raises:
+        CodecError: 数据在一条消息链的中间结束.
+    """
+    decoder = StreamDecoder()
+    while True:
+        block = read(chunk_size)
+        if not block:
+            break
+        yield from decoder.feed(block)
+    if len(decoder):
+        raise CodecError("stream ended inside a frame")
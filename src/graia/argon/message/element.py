@@ -5,13 +5,16 @@ from datetime import datetime
 from enum import Enum
 from json import dumps as j_dump
 from pathlib import Path
-from typing import TYPE_CHECKING, List, Optional, Union
-
-import aiohttp
-from aiohttp import ClientSession
-from pydantic import BaseModel, validator
-from pydantic.fields import Field
-
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Type, TypeVar, Union
+
+from graia.argon.compat import (
+    NATIVE_V2,
+    BaseModel,
+    Field,
+    construct,
+    model_fields,
+    validator,
+)
 from graia.argon.context import application_ctx, upload_method_ctx
 from graia.argon.exception import InvalidArgument
 from graia.argon.model import ArgonBaseModel, UploadMethod
@@ -19,6 +22,18 @@ from graia.argon.model import ArgonBaseModel, UploadMethod
 if TYPE_CHECKING:
     from graia.argon.message.chain import MessageChain
 
+Element_T = TypeVar("Element_T", bound="Element")
+
+element_defaults: Dict[type, Dict[str, Any]] = {}
+"各元素类按定义顺序排列的字段默认值, 供 `Element.build` 使用."
+
+INTERN_LIMIT = 4096
+"最多缓存的 `Plain` 实例数."
+INTERN_TEXT_LENGTH = 16
+"只复用不超过该长度的 `Plain`."
+
+interned_plain: Dict[str, "Plain"] = {}
+
 
 class Element(ArgonBaseModel, abc.ABC):
     """
@@ -31,6 +46,20 @@ class Element(ArgonBaseModel, abc.ABC):
     def __hash__(self):
         return hash((type(self),) + tuple(self.__dict__.values()))
 
+    @classmethod
+    def build(cls: Type[Element_T], **values: Any) -> Element_T:
+        """
+        不经过校验 (也不调用 `__init__`) 直接构造元素, 用于由已知有效的数据生成元素的内部代码.
+        调用方需保证字段完整且类型正确.
+        """
+        defaults = element_defaults.get(cls)
+        if defaults is None:
+            defaults = element_defaults[cls] = {
+                name: None if field.required else field.get_default()
+                for name, field in model_fields(cls).items()
+            }
+        return construct(cls, {**defaults, **values}, set(values))
+
     def asDisplay(self) -> str:
         return ""
 
@@ -54,21 +83,40 @@ class Plain(Element):
         """
         super().__init__(text=text, **kwargs)
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        if interned_plain.get(self.__dict__.get("text")) is self:
+            raise TypeError("interned Plain is immutable, create a new Plain instead")
+        super().__setattr__(name, value)
+
+    if not NATIVE_V2:
+
+        def __copy__(self) -> "Plain":
+            # pydantic v1 默认的浅拷贝与原实例共用 `__dict__`, 修改副本会改动被复用的实例
+            return self.copy()
+
+    @classmethod
+    def intern(cls, text: str) -> "Plain":
+        """
+        获取内容为 `text` 的 `Plain`, 较短的文本会复用同一个实例.
+        被复用的实例是不可变的, 对其属性赋值会引发 TypeError, 拷贝得到的副本则可以修改.
+        """
+        element = interned_plain.get(text)
+        if element is None:
+            element = cls.build(text=text)
+            if len(text) <= INTERN_TEXT_LENGTH and len(interned_plain) < INTERN_LIMIT:
+                interned_plain[text] = element
+        return element
+
     def asDisplay(self) -> str:
         return self.text
 
 
-class Source(Element):
+class Source(Element, json_encoders={datetime: lambda v: int(v.timestamp())}):
     "表示消息在一个特定聊天区域内的唯一标识"
     type: str = "Source"
     id: int
     time: datetime
 
-    class Config:
-        json_encoders = {
-            datetime: lambda v: int(v.timestamp()),
-        }
-
 
 class Quote(Element):
     "表示消息中回复其他消息/用户的部分, 通常包含一个完整的消息链(`origin` 属性)"
@@ -146,7 +194,7 @@ class Face(Element):
 
 
 class Xml(Element):
-    type = "Xml"
+    type: str = "Xml"
     xml: str
 
     def asDisplay(self) -> str:
@@ -154,7 +202,7 @@ class Xml(Element):
 
 
 class Json(Element):
-    type = "Json"
+    type: str = "Json"
     Json: str = Field(..., alias="json")
 
     def __init__(self, json: Union[dict, str], **kwargs) -> None:
@@ -170,7 +218,7 @@ class Json(Element):
 
 
 class App(Element):
-    type = "App"
+    type: str = "App"
     content: str
 
     def asDisplay(self) -> str:
@@ -197,7 +245,7 @@ class PokeMethods(Enum):
 
 
 class Poke(Element):
-    type = "Poke"
+    type: str = "Poke"
     name: PokeMethods
 
     def asDisplay(self) -> str:
@@ -205,7 +253,7 @@ class Poke(Element):
 
 
 class Dice(Element):
-    type = "Dice"
+    type: str = "Dice"
     value: int
 
     def asDisplay(self) -> str:
@@ -213,30 +261,25 @@ class Dice(Element):
 
 
 class MusicShare(Element):
-    type = "MusicShare"
-    kind: Optional[str]
-    title: Optional[str]
-    summary: Optional[str]
-    jumpUrl: Optional[str]
-    pictureUrl: Optional[str]
-    musicUrl: Optional[str]
-    brief: Optional[str]
+    type: str = "MusicShare"
+    kind: Optional[str] = None
+    title: Optional[str] = None
+    summary: Optional[str] = None
+    jumpUrl: Optional[str] = None
+    pictureUrl: Optional[str] = None
+    musicUrl: Optional[str] = None
+    brief: Optional[str] = None
 
     def asDisplay(self) -> str:
         return f"[音乐分享:{self.title}]"
 
 
-class ForwardNode(BaseModel):
+class ForwardNode(BaseModel, json_encoders={datetime: lambda v: int(v.timestamp())}):
     senderId: int
     time: datetime
     senderName: str
-    messageChain: Optional["MessageChain"]
-    messageId: Optional[int]
-
-    class Config:
-        json_encoders = {
-            datetime: lambda v: int(v.timestamp()),
-        }
+    messageChain: Optional["MessageChain"] = None
+    messageId: Optional[int] = None
 
 
 class Forward(Element):
@@ -246,7 +289,7 @@ class Forward(Element):
     nodeList (List[ForwardNode]): 转发的消息节点
     """
 
-    type = "Forward"
+    type: str = "Forward"
     nodeList: List[ForwardNode]
 
     def asDisplay(self) -> str:
@@ -254,7 +297,7 @@ class Forward(Element):
 
 
 class File(Element):
-    type = "File"
+    type: str = "File"
     id: str
     name: str
     size: int
@@ -278,7 +321,7 @@ image_upload_method_type_map = {
 
 
 class Image(Element):
-    type = "Image"
+    type: str = "Image"
     ready: bool = True
     imageId: Optional[str] = None
     url: Optional[str] = None
@@ -317,7 +360,7 @@ class Image(Element):
 
 
 class FlashImage(Image):
-    type = "FlashImage"
+    type: str = "FlashImage"
 
     def __init__(
         self,
@@ -350,13 +393,13 @@ class FlashImage(Image):
 
 
 class Voice(Element):
-    type = "Voice"
-    voiceId: Optional[str]
-    url: Optional[str]
-    path: Optional[Path]
-    base64: Optional[str]
-    length: Optional[int]
-    data_bytes: Optional[bytes]
+    type: str = "Voice"
+    voiceId: Optional[str] = None
+    url: Optional[str] = None
+    path: Optional[Path] = None
+    base64: Optional[str] = None
+    length: Optional[int] = None
+    data_bytes: Optional[bytes] = None
 
     def __init__(
         self,
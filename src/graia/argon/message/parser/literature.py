@@ -120,9 +120,9 @@ class Literature(BaseDispatcher):
         map_with_bar = {**self.gen_long_map_with_bar(), **self.gen_short_map_with_bar()}
         parsed_args = {
             map_with_bar[k]: (
-                MessageChain.create(
+                MessageChain.build(
                     [
-                        Plain(i)
+                        Plain.intern(i)
                         if not re.match("^\$\d+$", i)
                         else id_elem_map[int(i[1:])]
                         for i in re.split(r"((?<!\\)\$[0-9]+)", v)
@@ -140,9 +140,11 @@ class Literature(BaseDispatcher):
             for k, v in parsed_args
         }
         variables = [
-            MessageChain.create(
+            MessageChain.build(
                 [
-                    Plain(i) if not re.match("^\$\d+$", i) else id_elem_map[int(i[1:])]
+                    Plain.intern(i)
+                    if not re.match("^\$\d+$", i)
+                    else id_elem_map[int(i[1:])]
                     for i in re.split(r"((?<!\\)\$[0-9]+)", v)
                     if i
                 ]
@@ -180,10 +182,9 @@ class Literature(BaseDispatcher):
                 return
 
         chain_frames = chain_frames[len(self.prefixs) :]
-        return MessageChain.create(
-            list(itertools.chain(*[i.__root__ + [Plain(" ")] for i in chain_frames]))[
-                :-1
-            ]
+        space = Plain.intern(" ")
+        return MessageChain.build(
+            list(itertools.chain(*[i.__root__ + [space] for i in chain_frames]))[:-1]
         ).merge(copy=True)
 
     async def beforeDispatch(self, interface: DispatcherInterface):
@@ -0,0 +1,487 @@
+"""
+热路径的指标统计.
+
+全局的 `metrics` 默认是关闭的, 此时各埋点只做一次属性判断.
+通过 `metrics.enable(...)` 启用并挂载输出端:
+
+    from graia.argon.metrics import PrometheusSink, metrics
+
+    metrics.enable(PrometheusSink(port=9100))
+
+内置的指标:
+ - `argon_call_api_seconds{action}`: `call_api` 耗时.
+ - `argon_call_api_errors_total{action, error}`: `call_api` 抛出的异常.
+ - `argon_call_api_retries_total{action, reason}`: `error_wrapper` 的重试.
+ - `argon_pending_calls`: 等待 websocket 回复的请求数.
+ - `argon_build_event_seconds{event}`: `build_event` 解析耗时.
+ - `argon_app_api_seconds{method}`: `ArgonMiraiApplication` 接口方法耗时.
+ - `argon_dispatch_seconds{event}`: 单个监听器从参数解析到执行完成的耗时.
+ - `argon_dispatch_inflight`: 正在执行的监听器数量.
+ - `argon_reconnects_total`: 适配器重启次数.
+ - `argon_reconnect_seconds`: 从适配器断开到重新连上的耗时.
+ - `argon_reconnect_circuit_open`: 重连的熔断是否打开 (0 或 1).
+ - `argon_ws_rtt_seconds`: websocket 心跳的往返时间.
+ - `argon_ws_heartbeat_timeouts_total`: 因心跳超时断开 websocket 连接的次数.
+ - `argon_events_deduplicated_total{event}`: 被去重丢弃的事件.
+ - `argon_scheduler_pending_events`: 调度器中等待执行的事件数.
+ - `argon_scheduler_active_events`: 调度器中正在执行的事件数.
+ - `argon_shard_events_total{worker}`: 分片集群转发给各工作进程的事件.
+ - `argon_shard_events_dropped_total{worker}`: 工作进程积压过多而丢弃的事件.
+ - `argon_offload_seconds{function}`: 进程池中执行的函数耗时 (含传输).
+ - `argon_chat_log_dropped_total`: 聊天记录队列已满而丢弃的记录.
+"""
+import abc
+import asyncio
+import socket
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from loguru import logger
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+def escape_label_value(value: str) -> str:
+    "按 Prometheus 文本格式转义标签值中的反斜杠, 双引号与换行."
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_key(labels: Dict[str, object]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class Metric(abc.ABC):
+    """指标基类."""
+
+    type: str = ""
+
+    def __init__(self, name: str, help: str = "") -> None:
+        self.name = name
+        self.help = help
+
+    @abc.abstractmethod
+    def snapshot(self) -> Dict[LabelKey, object]:
+        """以 `{标签: 值}` 的形式返回当前数据."""
+
+    @abc.abstractmethod
+    def render(self) -> List[str]:
+        """以 Prometheus 文本格式输出."""
+
+    @staticmethod
+    def format_labels(key: LabelKey, extra: Sequence[Tuple[str, str]] = ()) -> str:
+        pairs = [*key, *extra]
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{k}="{escape_label_value(v)}"' for k, v in pairs) + "}"
+
+
+class Counter(Metric):
+    "只增不减的计数器."
+    type = "counter"
+
+    def __init__(self, name: str, help: str = "") -> None:
+        super().__init__(name, help)
+        self.values: Dict[LabelKey, float] = {}
+
+    def inc(self, value: float = 1.0, **labels) -> None:
+        key = _label_key(labels)
+        self.values[key] = self.values.get(key, 0.0) + value
+
+    def snapshot(self) -> Dict[LabelKey, object]:
+        return dict(self.values)
+
+    def render(self) -> List[str]:
+        return [
+            f"{self.name}{self.format_labels(k)} {v}" for k, v in self.values.items()
+        ]
+
+
+class Gauge(Counter):
+    "可任意设置的瞬时值."
+    type = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        self.values[_label_key(labels)] = value
+
+
+class Histogram(Metric):
+    "按桶统计分布的直方图."
+    type = "histogram"
+
+    def __init__(
+        self, name: str, help: str = "", buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> None:
+        super().__init__(name, help)
+        self.buckets: Tuple[float, ...] = tuple(sorted(buckets))
+        self.values: Dict[LabelKey, List[float]] = {}
+        """每个标签对应 `[各桶计数..., +Inf 计数, 总和]`"""
+
+    def observe(self, value: float, **labels) -> None:
+        key = _label_key(labels)
+        data = self.values.get(key)
+        if data is None:
+            data = self.values[key] = [0.0] * (len(self.buckets) + 2)
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                data[index] += 1
+                break
+        else:
+            data[-2] += 1
+        data[-1] += value
+
+    def snapshot(self) -> Dict[LabelKey, object]:
+        result = {}
+        for key, data in self.values.items():
+            cumulative = 0.0
+            buckets = {}
+            for bound, count in zip((*self.buckets, float("inf")), data[:-1]):
+                cumulative += count
+                buckets[bound] = cumulative
+            result[key] = {"count": cumulative, "sum": data[-1], "buckets": buckets}
+        return result
+
+    def render(self) -> List[str]:
+        lines = []
+        for key, value in self.snapshot().items():
+            for bound, count in value["buckets"].items():
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(
+                    f"{self.name}_bucket{self.format_labels(key, [('le', le)])} {count}"
+                )
+            lines.append(f"{self.name}_sum{self.format_labels(key)} {value['sum']}")
+            lines.append(f"{self.name}_count{self.format_labels(key)} {value['count']}")
+        return lines
+
+
+class MetricsSink(abc.ABC):
+    """
+    指标输出端.
+
+    拉取式的输出端 (如 Prometheus) 只需在 `start` 中准备好读取 `Metrics` 的方式;
+    推送式的输出端 (如 statsd) 还会在每次记录时通过 `record` 收到数据.
+    """
+
+    push: bool = False
+
+    async def start(self, metrics: "Metrics") -> None:
+        self.metrics = metrics
+
+    async def stop(self) -> None:
+        pass
+
+    def record(self, kind: str, name: str, value: float, labels: Dict[str, object]):
+        pass
+
+
+class InMemorySink(MetricsSink):
+    "在内存中保留指标, 通过 `snapshot` 读取, 适合测试与调试."
+
+    def __init__(self, metrics: Optional["Metrics"] = None) -> None:
+        self.metrics = metrics
+
+    def snapshot(self) -> Dict[str, dict]:
+        return self.metrics.snapshot() if self.metrics else {}
+
+
+class PrometheusSink(MetricsSink):
+    """
+    以 Prometheus 文本格式在 HTTP 端点上暴露指标.
+
+    Args:
+        host (str): 监听地址.
+        port (int): 监听端口.
+        path (str): 指标路径.
+    """
+
+    def __init__(
+        self, host: str = "127.0.0.1", port: int = 9100, path: str = "/metrics"
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.path = path
+        self.runner = None
+
+    async def start(self, metrics: "Metrics") -> None:
+        from aiohttp import web
+
+        await super().start(metrics)
+
+        async def handler(_request):
+            return web.Response(
+                text=metrics.render(), content_type="text/plain", charset="utf-8"
+            )
+
+        app = web.Application()
+        app.router.add_get(self.path, handler)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, self.host, self.port).start()
+        logger.info(f"metrics: serving on http://{self.host}:{self.port}{self.path}")
+
+    async def stop(self) -> None:
+        if self.runner:
+            await self.runner.cleanup()
+            self.runner = None
+
+
+class StatsdSink(MetricsSink):
+    """
+    以 statsd 协议通过 UDP 推送指标, 数据会被缓冲并定时批量发送.
+
+    Args:
+        host (str): statsd 服务地址.
+        port (int): statsd 服务端口.
+        prefix (str): 指标名前缀.
+        interval (float): 发送间隔, 单位秒.
+        max_packet (int): 单个 UDP 包的最大字节数.
+        max_buffer (int): 缓冲区最多保留的记录数, 超出 (如输出端尚未启动) 时丢弃新的记录.
+    """
+
+    push = True
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8125,
+        prefix: str = "",
+        interval: float = 1.0,
+        max_packet: int = 1400,
+        max_buffer: int = 10000,
+    ) -> None:
+        self.address = (host, port)
+        self.prefix = prefix
+        self.interval = interval
+        self.max_packet = max_packet
+        self.max_buffer = max_buffer
+        self.buffer: List[str] = []
+        self.dropped: int = 0
+        self.socket: Optional[socket.socket] = None
+        self.flush_task: Optional[asyncio.Task] = None
+
+    async def start(self, metrics: "Metrics") -> None:
+        await super().start(metrics)
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.setblocking(False)
+        self.flush_task = asyncio.get_running_loop().create_task(self.flush_cycle())
+
+    def record(self, kind: str, name: str, value: float, labels: Dict[str, object]):
+        if len(self.buffer) >= self.max_buffer:
+            self.dropped += 1
+            return
+        suffix = {"counter": "c", "gauge": "g", "histogram": "ms"}[kind]
+        if kind == "histogram":
+            value = value * 1000
+        tags = ",".join(f"{k}:{v}" for k, v in labels.items())
+        self.buffer.append(
+            f"{self.prefix}{name}:{value:g}|{suffix}" + (f"|#{tags}" if tags else "")
+        )
+
+    def flush(self) -> None:
+        if self.dropped:
+            logger.warning(
+                f"metrics: statsd buffer full, {self.dropped} records dropped"
+            )
+            self.dropped = 0
+        lines, self.buffer = self.buffer, []
+        packet: List[str] = []
+        size = 0
+        for line in lines:
+            if packet and size + len(line) + 1 > self.max_packet:
+                self.send("\n".join(packet))
+                packet, size = [], 0
+            packet.append(line)
+            size += len(line) + 1
+        if packet:
+            self.send("\n".join(packet))
+
+    def send(self, data: str) -> None:
+        try:
+            self.socket.sendto(data.encode("utf-8"), self.address)
+        except OSError as e:
+            logger.debug(f"metrics: statsd send failed: {e}")
+
+    async def flush_cycle(self) -> None:
+        try:
+            while True:
+                await asyncio.sleep(self.interval)
+                self.flush()
+        except asyncio.CancelledError:
+            self.flush()
+
+    async def stop(self) -> None:
+        if self.flush_task:
+            self.flush_task.cancel()
+            self.flush_task = None
+        if self.socket:
+            self.socket.close()
+            self.socket = None
+
+
+class Metrics:
+    """
+    指标注册表.
+
+    埋点处应先判断 `metrics.enabled`, 以保证关闭时几乎没有开销.
+    """
+
+    def __init__(self) -> None:
+        self.enabled: bool = False
+        self.metrics: Dict[str, Metric] = {}
+        self.sinks: List[MetricsSink] = []
+        self.push_sinks: List[MetricsSink] = []
+        self.pending_sinks: List[MetricsSink] = []
+        """尚未启动的输出端, 由 `start` (应用的 `launch` 中调用) 启动."""
+        self.start_tasks: Set[asyncio.Task] = set()
+
+    def enable(self, *sinks: MetricsSink) -> None:
+        """
+        启用统计并挂载输出端.
+
+        在事件循环中调用时, 需要异步启动的输出端立即在该循环中启动;
+        否则它们会在应用的 `launch` 中, 于应用所运行的事件循环上启动.
+        """
+        self.enabled = True
+        for sink in sinks:
+            self.add_sink(sink)
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def add_sink(self, sink: MetricsSink) -> None:
+        self.sinks.append(sink)
+        if sink.push:
+            self.push_sinks.append(sink)
+        if isinstance(sink, InMemorySink):
+            sink.metrics = self
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.pending_sinks.append(sink)
+            return
+        task = loop.create_task(sink.start(self))
+        self.start_tasks.add(task)
+        task.add_done_callback(self.start_done)
+
+    def start_done(self, task: asyncio.Task) -> None:
+        self.start_tasks.discard(task)
+        if not task.cancelled() and task.exception():
+            logger.opt(exception=task.exception()).error(
+                "metrics: failed to start sink"
+            )
+
+    async def start(self) -> None:
+        """在当前事件循环中启动尚未启动的输出端, 并等待已在启动中的输出端."""
+        sinks, self.pending_sinks = self.pending_sinks, []
+        for sink in sinks:
+            await sink.start(self)
+        if self.start_tasks:
+            await asyncio.wait(set(self.start_tasks))
+
+    async def close(self) -> None:
+        """停止所有输出端."""
+        for task in self.start_tasks:
+            task.cancel()
+        self.start_tasks.clear()
+        self.pending_sinks.clear()
+        for sink in self.sinks:
+            await sink.stop()
+        self.sinks.clear()
+        self.push_sinks.clear()
+
+    def get(self, name: str, cls: type, help: str = "") -> Metric:
+        metric = self.metrics.get(name)
+        if metric is None:
+            metric = self.metrics[name] = cls(name, help)
+        return metric
+
+    def counter(self, name: str, help: str = "") -> Counter:
+        return self.get(name, Counter, help)
+
+    def gauge(self, name: str, help: str = "") -> Gauge:
+        return self.get(name, Gauge, help)
+
+    def histogram(self, name: str, help: str = "") -> Histogram:
+        return self.get(name, Histogram, help)
+
+    def inc(self, name: str, value: float = 1.0, **labels) -> None:
+        if not self.enabled:
+            return
+        self.counter(name).inc(value, **labels)
+        for sink in self.push_sinks:
+            sink.record("counter", name, value, labels)
+
+    def set(self, name: str, value: float, **labels) -> None:
+        if not self.enabled:
+            return
+        self.gauge(name).set(value, **labels)
+        for sink in self.push_sinks:
+            sink.record("gauge", name, value, labels)
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        if not self.enabled:
+            return
+        self.histogram(name).observe(value, **labels)
+        for sink in self.push_sinks:
+            sink.record("histogram", name, value, labels)
+
+    @contextmanager
+    def timer(self, name: str, **labels) -> Iterator[None]:
+        """统计代码块耗时并记入直方图 `name`."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def snapshot(self) -> Dict[str, dict]:
+        """以字典形式返回所有指标的当前数据."""
+        return {
+            name: {
+                "type": metric.type,
+                "help": metric.help,
+                "values": {
+                    ",".join(f"{k}={v}" for k, v in key): value
+                    for key, value in metric.snapshot().items()
+                },
+            }
+            for name, metric in self.metrics.items()
+        }
+
+    def render(self) -> str:
+        """以 Prometheus 文本格式输出所有指标."""
+        lines = []
+        for name, metric in self.metrics.items():
+            if metric.help:
+                lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.type}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """清空所有已记录的数据."""
+        self.metrics.clear()
+
+
+metrics = Metrics()
@@ -1,25 +1,43 @@
 from datetime import datetime
 from enum import Enum
-from typing import TYPE_CHECKING, Optional, Union
+from typing import TYPE_CHECKING, Optional, Set, Union
+
 from loguru import logger
-from pydantic import BaseModel, Field, validator
-from pydantic.main import BaseConfig, Extra
-from pydantic.networks import AnyHttpUrl
 from typing_extensions import Literal
 from yarl import URL
 
+from graia.argon.compat import AnyHttpUrl, BaseModel, Field, validator
+
 if TYPE_CHECKING:
     from graia.argon import ArgonMiraiApplication
+    from graia.argon.chatlog import ChatLogPipeline
 
 
-class ArgonBaseModel(BaseModel):
-    class Config(BaseConfig):
-        extra = Extra.allow
+class ArgonBaseModel(BaseModel, extra="allow"):
+    pass
 
 
 class ChatLogConfig(BaseModel):
+    """
+    聊天记录日志的配置, 日志在后台线程中写入 (见 `graia.argon.chatlog`).
+
+    Attributes:
+        enabled (bool): 是否记录聊天日志.
+        log_level (str): 日志等级.
+        sample_rate (float): 采样比例, 取值 0 ~ 1.
+        groups (Optional[Set[int]]): 只记录这些群的消息, 为 None 时不限制.
+        ignore_groups (Set[int]): 不记录这些群的消息.
+        batch_size (int): 后台线程每批处理的最大消息数.
+        max_queue_size (int): 队列长度上限, 超出时丢弃新的消息.
+    """
+
     enabled: bool = True
     log_level: str = "INFO"
+    sample_rate: float = 1.0
+    groups: Optional[Set[int]] = None
+    ignore_groups: Set[int] = set()
+    batch_size: int = 256
+    max_queue_size: int = 10000
     group_message_log_format: str = "{bot_id}: [{group_name}({group_id})] {member_name}({member_id}) -> {message_string}"
     friend_message_log_format: str = (
         "{bot_id}: [{friend_name}({friend_id})] -> {message_string}"
@@ -32,88 +50,25 @@ class ChatLogConfig(BaseModel):
         "{bot_id}: [{stranger_name}({stranger_id})] -> {message_string}"
     )
 
-    def initialize(self, app: "ArgonMiraiApplication"):
-        from graia.argon.event.message import (
-            GroupMessage,
-            FriendMessage,
-            TempMessage,
-            OtherClientMessage,
-            StrangerMessage,
-        )
+    def initialize(self, app: "ArgonMiraiApplication") -> "ChatLogPipeline":
+        """
+        启动日志线程并注册监听器.
+
+        Returns:
+            ChatLogPipeline: 已启动的日志管线, 需要在停止时调用 `close`.
+        """
+        from graia.argon.chatlog import ChatLogPipeline, formatters
+
+        pipeline = ChatLogPipeline(self, app.mirai_session.account)
+        pipeline.start()
+        event_ctx = app.broadcast.event_ctx
+
+        def log_chat_message():
+            pipeline.put(event_ctx.get())
 
-        @app.broadcast.receiver(GroupMessage)
-        def log_group_message(event: GroupMessage):
-            logger.log(
-                self.log_level,
-                self.group_message_log_format.format_map(
-                    dict(
-                        group_id=event.sender.group.id,
-                        group_name=event.sender.group.name,
-                        member_id=event.sender.id,
-                        member_name=event.sender.name,
-                        member_permission=event.sender.permission.name,
-                        bot_id=app.mirai_session.account,
-                        bot_permission=event.sender.group.accountPerm.name,
-                        message_string=event.messageChain.asDisplay().__repr__(),
-                    )
-                ),
-            )
-
-        @app.broadcast.receiver(FriendMessage)
-        def log_friend_message(event: FriendMessage):
-            logger.log(
-                self.log_level,
-                self.friend_message_log_format.format_map(
-                    dict(
-                        bot_id=app.mirai_session.account,
-                        friend_name=event.sender.nickname,
-                        friend_id=event.sender.id,
-                        message_string=event.messageChain.asDisplay().__repr__(),
-                    )
-                ),
-            )
-
-        @app.broadcast.receiver(TempMessage)
-        def log_temp_message(event: TempMessage):
-            logger.log(
-                self.log_level,
-                self.temp_message_log_format.format_map(
-                    dict(
-                        group_id=event.sender.group.id,
-                        group_name=event.sender.group.name,
-                        member_id=event.sender.id,
-                        member_name=event.sender.name,
-                        member_permission=event.sender.permission.name,
-                        bot_id=app.mirai_session.account,
-                        bot_permission=event.sender.group.accountPerm.name,
-                        message_string=event.messageChain.asDisplay().__repr__(),
-                    )
-                ),
-            )
-
-        @app.broadcast.receiver(StrangerMessage)
-        def log_stranger_message(event: StrangerMessage):
-            logger.log(
-                self.log_level,
-                self.stranger_message_log_format.format_map(
-                    bot_id=app.mirai_session.account,
-                    stranger_name=event.sender.nickname,
-                    stranger_id=event.sender.id,
-                    message_string=event.messageChain.asDisplay().__repr__(),
-                ),
-            )
-
-        @app.broadcast.receiver(OtherClientMessage)
-        def log_other_client_message(event: OtherClientMessage):
-            logger.log(
-                self.log_level,
-                self.other_client_message_log_format.format_map(
-                    bot_id=app.mirai_session.account,
-                    platform_name=event.sender.platform,
-                    platform_id=event.sender.id,
-                    message_string=event.messageChain.asDisplay().__repr__(),
-                ),
-            )
+        for event_type in formatters:
+            app.broadcast.receiver(event_type)(log_chat_message)
+        return pipeline
 
 
 class MiraiSession(ArgonBaseModel):
@@ -199,9 +154,6 @@ class GroupConfig(ArgonBaseModel):
 
     # 调用 json 方法时记得加 exclude_none=True.
 
-    class Config:
-        allow_mutation = True
-
 
 class MemberInfo(ArgonBaseModel):
     "描述群组成员的可修改状态, 修改需要管理员/群主权限."
@@ -211,11 +163,10 @@ class MemberInfo(ArgonBaseModel):
 
     # 调用 json 方法时记得加 exclude_none=True.
 
-    class Config:
-        allow_mutation = True
-
 
-class DownloadInfo(ArgonBaseModel):
+class DownloadInfo(
+    ArgonBaseModel, json_encoders={datetime: lambda v: int(v.timestamp())}
+):
     sha: str = ""
     md5: str = ""
     download_times: int = Field(..., alias="downloadTimes")
@@ -224,11 +175,6 @@ class DownloadInfo(ArgonBaseModel):
     last_modify_time: datetime = Field(..., alias="lastModifyTime")
     url: Optional[str] = None
 
-    class Config:
-        json_encoders = {
-            datetime: lambda v: int(v.timestamp()),
-        }
-
 
 class FileInfo(ArgonBaseModel):
     "群组文件详细信息"
@@ -240,6 +186,7 @@ class FileInfo(ArgonBaseModel):
     contact: Optional[Union[Group, Friend]] = None
     is_file: bool = Field(..., alias="isFile")
     is_directory: bool = Field(..., alias="isDirectory")
+    size: int = 0
     download_info: Optional[DownloadInfo] = Field(None, alias="downloadInfo")
 
     @validator("contact", pre=True, allow_reuse=True)
@@ -287,8 +234,8 @@ class Profile(ArgonBaseModel):
     """
 
     nickname: str
-    email: Optional[str]
-    age: Optional[int]
+    email: Optional[str] = None
+    age: Optional[int] = None
     level: int
     sign: str
     sex: Literal["UNKNOWN", "MALE", "FEMALE"]
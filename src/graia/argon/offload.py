@@ -0,0 +1,183 @@
+"""
+在进程池中运行 CPU 密集的监听器.
+
+所有监听器都运行在同一个事件循环中, 一个耗时的命令 (图片渲染, 文本分析等) 会阻塞所有会话.
+`ProcessOffload` 把这类函数交给进程池执行: 消息链以 `graia.argon.message.codec`
+的二进制格式传输, 事件的其余部分以 pickle 传输, 函数返回的消息链在主进程中发出.
+
+被卸载的函数必须定义在模块顶层, 在子进程中按模块与名称重新导入.
+函数接收消息链与事件, 返回回复 (`MessageChain`, `str` 或 None):
+
+    pool = ProcessOffload(max_workers=4)
+
+    @bcc.receiver(GroupMessage, dispatchers=[Literature("#render")])
+    @pool.handler
+    def render(chain: MessageChain, event: GroupMessage) -> MessageChain:
+        ...
+
+也可以在普通的监听器中直接等待结果:
+
+    reply = await pool.run(render, event)
+"""
+import asyncio
+import importlib
+import multiprocessing
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional, Tuple, Union
+
+from loguru import logger
+
+from graia.argon.context import application_ctx, event_ctx
+from graia.argon.event.message import (
+    FriendMessage,
+    GroupMessage,
+    MessageEvent,
+    TempMessage,
+)
+from graia.argon.message import codec
+from graia.argon.message.chain import MessageChain
+from graia.argon.metrics import metrics
+
+Reply = Union[MessageChain, str, None]
+OffloadFunction = Callable[..., Reply]
+
+
+def reference(func: OffloadFunction) -> Tuple[str, str]:
+    """函数在子进程中重新导入所用的 (模块, 限定名)."""
+    qualname = getattr(func, "__qualname__", "")
+    if not qualname or "<locals>" in qualname or "<lambda>" in qualname:
+        raise ValueError(f"{func!r} must be defined at module level to be offloaded")
+    return func.__module__, qualname
+
+
+def resolve(module: str, qualname: str) -> OffloadFunction:
+    target: Any = importlib.import_module(module)
+    for name in qualname.split("."):
+        target = getattr(target, name)
+    return getattr(target, "__offloaded__", target)
+
+
+def invoke(
+    func_ref: Tuple[str, str],
+    chain_data: bytes,
+    event_data: Optional[bytes],
+    args: tuple,
+) -> Optional[bytes]:
+    "在子进程中执行: 还原消息链与事件, 调用函数并编码返回的消息链."
+    chain = codec.loads(chain_data)
+    event = None
+    if event_data is not None:
+        event = pickle.loads(event_data)
+        event.__dict__["messageChain"] = chain
+    result = resolve(*func_ref)(chain, event, *args)
+    if result is None:
+        return None
+    if isinstance(result, str):
+        result = MessageChain.create(result)
+    return codec.dumps(result)
+
+
+async def reply(event: MessageEvent, chain: MessageChain) -> None:
+    """向消息事件所在的会话发送消息链."""
+    app = application_ctx.get()
+    if isinstance(event, GroupMessage):
+        await app.sendGroupMessage(event.sender.group, chain)
+    elif isinstance(event, TempMessage):
+        await app.sendTempMessage(event.sender.group, event.sender, chain)
+    elif isinstance(event, FriendMessage):
+        await app.sendFriendMessage(event.sender, chain)
+    else:
+        logger.warning(f"offload: cannot reply to {event.__class__.__name__}")
+
+
+class ProcessOffload:
+    """
+    执行卸载函数的进程池.
+
+    Args:
+        max_workers (Optional[int]): 子进程数量, 默认为 CPU 核数.
+        start_method (Optional[str]): 子进程的启动方式, 如 `spawn`, `forkserver`, 默认使用平台的默认值.
+
+    Attributes:
+        executor (Optional[ProcessPoolExecutor]): 进程池, 在第一次使用时创建.
+    """
+
+    def __init__(
+        self, max_workers: Optional[int] = None, start_method: Optional[str] = None
+    ) -> None:
+        self.max_workers = max_workers
+        self.start_method = start_method
+        self.executor: Optional[ProcessPoolExecutor] = None
+
+    def start(self) -> ProcessPoolExecutor:
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(
+                self.max_workers,
+                multiprocessing.get_context(self.start_method)
+                if self.start_method
+                else None,
+            )
+        return self.executor
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(wait)
+            self.executor = None
+
+    async def run(
+        self,
+        func: OffloadFunction,
+        message: Union[MessageEvent, MessageChain],
+        *args: Any,
+    ) -> Optional[MessageChain]:
+        """
+        在子进程中调用 `func(chain, event, *args)`.
+
+        Args:
+            func (OffloadFunction): 模块顶层的函数.
+            message (Union[MessageEvent, MessageChain]): 消息事件或消息链, 只传入消息链时 `event` 为 None.
+            *args: 其余参数, 需要可以被 pickle.
+
+        Returns:
+            Optional[MessageChain]: 函数返回的消息链.
+        """
+        func_ref = reference(getattr(func, "__offloaded__", func))
+        if isinstance(message, MessageChain):
+            chain, event_data = message, None
+        else:
+            chain = message.messageChain
+            event_data = pickle.dumps(message.copy(exclude={"messageChain"}))
+        start = time.perf_counter()
+        result = await asyncio.get_running_loop().run_in_executor(
+            self.start(), invoke, func_ref, codec.dumps(chain), event_data, args
+        )
+        if metrics.enabled:
+            metrics.observe(
+                "argon_offload_seconds",
+                time.perf_counter() - start,
+                function=func_ref[1],
+            )
+        return codec.loads(result) if result is not None else None
+
+    def handler(self, func: OffloadFunction) -> Callable[[], Any]:
+        """
+        把函数包装为在子进程中执行的监听器, 返回的消息链会被发送到事件所在的会话.
+
+        包装后的监听器不声明参数, 事件从上下文中获取, 因此可以与 `Literature` 等装饰器一同使用.
+        """
+        reference(func)
+
+        async def offloaded_handler():
+            event = event_ctx.get()
+            result = await self.run(func, event)
+            if result is not None:
+                await reply(event, result)
+
+        offloaded_handler.__offloaded__ = func
+        offloaded_handler.__module__ = func.__module__
+        offloaded_handler.__name__ = func.__name__
+        offloaded_handler.__qualname__ = func.__qualname__
+        offloaded_handler.__doc__ = func.__doc__
+        return offloaded_handler
@@ -0,0 +1,209 @@
+"""
+重连与 `call_api` 重试的退避策略.
+"""
+import asyncio
+import random
+import time
+from typing import Dict, Optional, Set
+
+from aiohttp import ClientConnectionError, ClientConnectorError, ClientResponseError
+from loguru import logger
+
+from graia.argon.exception import InvalidSession
+from graia.argon.model import CallMethod
+
+
+class Backoff:
+    """
+    带抖动的指数退避.
+
+    第 n 次 (从 0 开始) 的等待时间为 `min(maximum, initial * multiplier ** n)`,
+    再随机缩短至多 `jitter` 的比例, 以免大量客户端同时重试.
+
+    Args:
+        initial (float): 首次等待时间, 单位秒.
+        maximum (float): 等待时间上限, 单位秒.
+        multiplier (float): 每次失败后等待时间的倍率.
+        jitter (float): 抖动比例, 取值 0 ~ 1.
+    """
+
+    def __init__(
+        self,
+        initial: float = 0.1,
+        maximum: float = 30.0,
+        multiplier: float = 2.0,
+        jitter: float = 0.5,
+    ) -> None:
+        self.initial = initial
+        self.maximum = maximum
+        self.multiplier = multiplier
+        self.jitter = jitter
+
+    def delay(self, attempt: int) -> float:
+        """第 `attempt` 次重试前的等待时间."""
+        delay = min(self.maximum, self.initial * self.multiplier ** attempt)
+        return delay * (1 - self.jitter * random.random())
+
+
+class ReconnectPolicy(Backoff):
+    """
+    适配器的重连策略, 由 `ArgonMiraiApplication.daemon` 使用.
+
+    稳定运行超过 `stable_after` 秒的连接断开时 (如 mirai 重启) 立即以最短的间隔重连,
+    否则按指数退避; 连续失败 `failure_threshold` 次后进入熔断状态,
+    之后每 `cooldown` 秒才尝试一次, 直到连接成功.
+
+    Args:
+        initial (float): 首次重连的等待时间, 单位秒.
+        maximum (float): 重连等待时间上限, 单位秒.
+        multiplier (float): 每次失败后等待时间的倍率.
+        jitter (float): 抖动比例, 取值 0 ~ 1.
+        stable_after (float): 连接被视为稳定所需的时长, 单位秒.
+        failure_threshold (int): 触发熔断的连续失败次数.
+        cooldown (float): 熔断时的重试间隔, 单位秒.
+    """
+
+    def __init__(
+        self,
+        initial: float = 0.1,
+        maximum: float = 30.0,
+        multiplier: float = 2.0,
+        jitter: float = 0.5,
+        *,
+        stable_after: float = 30.0,
+        failure_threshold: int = 10,
+        cooldown: float = 60.0,
+    ) -> None:
+        super().__init__(initial, maximum, multiplier, jitter)
+        self.stable_after = stable_after
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.failures: int = 0
+        self.connected_at: Optional[float] = None
+
+    @property
+    def circuit_open(self) -> bool:
+        return self.failures >= self.failure_threshold
+
+    def connected(self) -> None:
+        """会话已建立时调用."""
+        if self.circuit_open:
+            logger.info("reconnect: connection recovered")
+        self.connected_at = time.monotonic()
+
+    def disconnected(self) -> float:
+        """
+        连接断开时调用.
+
+        Returns:
+            float: 下一次重连前应等待的时间, 单位秒.
+        """
+        uptime = (
+            time.monotonic() - self.connected_at
+            if self.connected_at is not None
+            else 0.0
+        )
+        self.connected_at = None
+        if uptime >= self.stable_after:
+            if self.circuit_open:
+                logger.info("reconnect: circuit closed")
+            self.failures = 0
+        else:
+            self.failures += 1
+        if self.failures == self.failure_threshold:
+            logger.warning(
+                f"reconnect: {self.failures} consecutive failures, "
+                f"circuit open, retry every {self.cooldown}s"
+            )
+        if self.circuit_open:
+            return self.cooldown * (1 - self.jitter * random.random())
+        return self.delay(self.failures)
+
+
+class RetryPolicy(Backoff):
+    """
+    `call_api` 的重试策略.
+
+    只有确定未被 mirai 执行的请求 (sessionKey 失效, 连接未建立, 被限流) 会无条件重试;
+    结果未知的请求 (超时, 连接中断, 网关错误) 只在操作幂等时重试,
+    以免重复发送消息等副作用.
+
+    Args:
+        initial (float): 首次重试的等待时间, 单位秒.
+        maximum (float): 重试等待时间上限, 单位秒.
+        multiplier (float): 每次失败后等待时间的倍率.
+        jitter (float): 抖动比例, 取值 0 ~ 1.
+        max_attempts (int): 最多尝试的次数, 包括第一次.
+        deadline (float): 一次调用 (含全部重试与等待) 的总时限, 单位秒.
+        timeout (Optional[float]): 单次尝试的时限, 单位秒, 为 None 时不限制.
+        idempotent (Optional[Dict[str, bool]]): 覆盖默认幂等性判断的 action 表.
+    """
+
+    idempotent_actions: Set[str] = {
+        "about",
+        "messageFromId",
+        "botProfile",
+        "friendProfile",
+        "memberProfile",
+        "file/list",
+        "file/info",
+    }
+    "默认视为幂等的 action, 此外 GET 请求以及以 `List` 结尾的 action 也视为幂等."
+
+    def __init__(
+        self,
+        initial: float = 0.5,
+        maximum: float = 8.0,
+        multiplier: float = 2.0,
+        jitter: float = 0.5,
+        *,
+        max_attempts: int = 5,
+        deadline: float = 60.0,
+        timeout: Optional[float] = 30.0,
+        idempotent: Optional[Dict[str, bool]] = None,
+    ) -> None:
+        super().__init__(initial, maximum, multiplier, jitter)
+        self.max_attempts = max_attempts
+        self.deadline = deadline
+        self.timeout = timeout
+        self.idempotent = idempotent or {}
+
+    def is_idempotent(self, action: str, method: CallMethod) -> bool:
+        if action in self.idempotent:
+            return self.idempotent[action]
+        return (
+            action in self.idempotent_actions
+            or action.endswith("List")
+            or method in (CallMethod.GET, CallMethod.RESTGET)
+        )
+
+    @staticmethod
+    def classify(error: BaseException) -> Optional[str]:
+        """
+        判断异常是否可以重试.
+
+        Returns:
+            Optional[str]: `"rejected"` 表示请求未被执行, `"unknown"` 表示结果未知,
+            None 表示不应重试.
+        """
+        if isinstance(error, (InvalidSession, ClientConnectorError)):
+            return "rejected"
+        if isinstance(error, ClientResponseError):
+            if error.status in (429, 503):
+                return "rejected"
+            if error.status in (408, 502, 504):
+                return "unknown"
+            return None
+        if isinstance(
+            error, (asyncio.TimeoutError, ClientConnectionError, ConnectionError)
+        ):
+            return "unknown"
+        return None
+
+    def should_retry(
+        self, action: str, method: CallMethod, error: BaseException
+    ) -> bool:
+        kind = self.classify(error)
+        return kind == "rejected" or (
+            kind == "unknown" and self.is_idempotent(action, method)
+        )
@@ -0,0 +1,309 @@
+"""
+适配器流量的录制与回放.
+
+`RecordingAdapter` 包装一个已有的适配器, 把收到的每一帧数据和每一次 `call_api` (含耗时)
+追加写入 gzip 压缩的 JSON Lines 日志; `ReplayAdapter` 读取该日志,
+把其中的事件重新经过 `build_event` 和 `Broadcast`, 可以按原速或尽可能快地回放.
+
+日志中每行都是一个数组:
+ - `["start", 时间戳]`: 一段录制的开始 (Unix 时间).
+ - `["in", 相对时间, 原始帧]`: 收到的数据. 验证帧中的 sessionKey 会被替换为 `REDACTED`.
+ - `["call", 相对时间, action, method, data, 耗时, 结果, 错误]`: 一次 `call_api`.
+"""
+import asyncio
+import builtins
+import gzip
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from loguru import logger
+
+from graia.argon import exception
+from graia.argon.adapter import Adapter, require_verified
+from graia.argon.model import CallMethod
+
+REDACTED = "<redacted>"
+"录制时替换 sessionKey 的占位符."
+
+REPLAY_SESSION_KEY = "replay"
+"回放时使用的 sessionKey, 录制的日志中不含真实的 sessionKey."
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, (bytes, bytearray)):
+        return {"$bytes": len(obj)}
+    if isinstance(obj, Path):
+        return str(obj)
+    return repr(obj)
+
+
+class TrafficRecorder:
+    """
+    只追加的压缩流量日志写入器.
+
+    Args:
+        path (Union[str, Path]): 日志文件路径, 已存在时会在末尾追加.
+        flush_every (int): 每写入多少条记录刷新一次缓冲区.
+    """
+
+    def __init__(self, path: Union[str, Path], flush_every: int = 64) -> None:
+        self.path = Path(path)
+        self.flush_every = flush_every
+        self.file: Optional[gzip.GzipFile] = None
+        self.origin: float = 0.0
+        self.pending: int = 0
+
+    def open(self) -> None:
+        if not self.file:
+            self.file = gzip.open(self.path, "ab")
+            self.origin = time.monotonic()
+            self.write(["start", time.time()])
+
+    def write(self, record: List[Any]) -> None:
+        if not self.file:
+            self.open()
+        self.file.write(
+            json.dumps(
+                record, separators=(",", ":"), ensure_ascii=False, default=_default
+            ).encode("utf-8")
+            + b"\n"
+        )
+        self.pending += 1
+        if self.pending >= self.flush_every:
+            self.flush()
+
+    def elapsed(self) -> float:
+        return round(time.monotonic() - self.origin, 6)
+
+    def record_frame(self, frame: dict) -> None:
+        data = frame.get("data")
+        if isinstance(data, dict) and "session" in data:
+            frame = {**frame, "data": {**data, "session": REDACTED}}
+        self.write(["in", self.elapsed(), frame])
+
+    def record_call(
+        self,
+        action: str,
+        method: CallMethod,
+        data: Optional[dict],
+        started: float,
+        result: Any = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        self.write(
+            [
+                "call",
+                round(started - self.origin, 6),
+                action,
+                method.value,
+                {k: v for k, v in (data or {}).items() if k != "sessionKey"},
+                round(time.monotonic() - started, 6),
+                result,
+                f"{error.__class__.__name__}: {error}" if error else None,
+            ]
+        )
+
+    def flush(self) -> None:
+        if self.file:
+            self.file.flush()
+            self.pending = 0
+
+    def close(self) -> None:
+        if self.file:
+            self.file.close()
+            self.file = None
+
+
+def read_traffic(path: Union[str, Path]) -> Iterator[List[Any]]:
+    """逐条读取流量日志, 支持多段追加录制以及末尾被截断的日志."""
+    with gzip.open(path, "rb") as f:
+        try:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        except (EOFError, json.JSONDecodeError):
+            logger.warning(f"traffic log {path} is truncated, stop reading")
+
+
+def forwarded(name: str) -> property:
+    "读写被包装的适配器的同名属性, 忽略 `Adapter.__init__` 中赋予的默认值."
+
+    def getter(self: "RecordingAdapter") -> Any:
+        return getattr(self.adapter, name)
+
+    def setter(self: "RecordingAdapter", value: Any) -> None:
+        if "adapter" in self.__dict__:
+            setattr(self.adapter, name, value)
+
+    return property(getter, setter)
+
+
+class RecordingAdapter(Adapter):
+    """
+    录制流量的适配器包装.
+
+    事件由被包装的适配器解析和发布, 因此 `deduplicator`, `scheduler` 与 `fast_events`
+    读写的都是被包装的适配器的设置.
+
+    Args:
+        adapter (Adapter): 被包装的适配器, 实际的连接与收发都由它完成.
+        path (Union[str, Path]): 流量日志路径.
+    """
+
+    deduplicator = forwarded("deduplicator")
+    scheduler = forwarded("scheduler")
+    fast_events = forwarded("fast_events")
+
+    def __init__(self, adapter: Adapter, path: Union[str, Path]) -> None:
+        super().__init__(adapter.broadcast, adapter.mirai_session)
+        self.adapter = adapter
+        self.verified = adapter.verified
+        self.recorder = TrafficRecorder(path)
+        raw_data_parser = adapter.raw_data_parser
+
+        async def recording_raw_data_parser(raw_data: dict) -> None:
+            self.recorder.record_frame(raw_data)
+            await raw_data_parser(raw_data)
+
+        adapter.raw_data_parser = recording_raw_data_parser
+
+    async def fetch_cycle(self) -> None:
+        await self.adapter.fetch_cycle()
+
+    @require_verified
+    async def call_api(
+        self, action: str, method: CallMethod, data: Optional[dict] = None
+    ) -> Union[dict, list]:
+        started = time.monotonic()
+        try:
+            result = await self.adapter.call_api(action, method, data)
+        except Exception as e:
+            self.recorder.record_call(action, method, data, started, error=e)
+            raise
+        self.recorder.record_call(action, method, data, started, result)
+        return result
+
+    async def start(self):
+        self.recorder.open()
+        await self.adapter.start()
+        self.session = self.adapter.session
+        self.running = self.adapter.running
+        self.fetch_task = self.adapter.fetch_task
+
+    async def stop(self):
+        self.running = False
+        await self.adapter.stop()
+        self.recorder.flush()
+
+    async def disconnect(self) -> None:
+        self.running = False
+        await self.adapter.disconnect()
+
+    async def invalidate_session(self, session_key: Optional[str] = None) -> None:
+        await self.adapter.invalidate_session(session_key)
+
+    async def close(self) -> None:
+        """关闭流量日志以及被包装的适配器."""
+        self.recorder.close()
+        await self.adapter.close()
+
+
+class ReplayAdapter(Adapter):
+    """
+    回放流量日志的适配器, 不需要任何网络连接.
+
+    `call_api` 按 action 依次返回日志中录制的结果, 没有录制结果时返回空字典.
+
+    Args:
+        broadcast (Broadcast): Broadcast 实例
+        mirai_session (MiraiSession): Session 实例
+        path (Union[str, Path]): 流量日志路径.
+        speed (Optional[float]): 回放速度倍率, 为 None 时尽可能快地回放.
+    """
+
+    def __init__(
+        self,
+        broadcast,
+        mirai_session,
+        path: Union[str, Path],
+        speed: Optional[float] = 1.0,
+    ) -> None:
+        super().__init__(broadcast, mirai_session)
+        self.path = Path(path)
+        self.speed = speed
+        self.responses: Dict[str, List[List[Any]]] = {}
+        self.finished = asyncio.Event()
+        self.replayed: int = 0
+
+    def load_responses(self) -> None:
+        self.responses.clear()
+        for record in read_traffic(self.path):
+            if record[0] == "call":
+                self.responses.setdefault(record[2], []).append(record)
+
+    async def replay(self) -> int:
+        """
+        回放日志中的所有事件.
+
+        Returns:
+            int: 被广播的事件数量.
+        """
+        self.load_responses()
+        self.replayed = 0
+        origin = time.monotonic()
+        offset = 0.0
+        for record in read_traffic(self.path):
+            if record[0] == "start":
+                offset = time.monotonic() - origin
+                continue
+            if record[0] != "in":
+                continue
+            if self.speed:
+                delay = offset + record[1] / self.speed - (time.monotonic() - origin)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            data = record[2].get("data", {})
+            if not isinstance(data, dict):
+                continue
+            if data.get("session"):
+                self.mirai_session.session_key = REPLAY_SESSION_KEY
+                self.verified.set()
+                continue
+            if "type" not in data:
+                continue
+            try:
+                event = await self.build_event(data)
+            except ValueError as e:
+                logger.warning(e)
+                continue
+            self.post_event(event)
+            self.replayed += 1
+        if not self.mirai_session.session_key:
+            self.mirai_session.session_key = REPLAY_SESSION_KEY
+        self.verified.set()
+        self.finished.set()
+        return self.replayed
+
+    async def fetch_cycle(self) -> None:
+        self.finished.clear()
+        await self.replay()
+        while self.running:
+            await asyncio.sleep(0.5)
+
+    @require_verified
+    async def call_api(
+        self, action: str, method: CallMethod, data: Optional[dict] = None
+    ) -> Union[dict, list]:
+        recorded = self.responses.get(action)
+        if not recorded:
+            return {}
+        record = recorded.pop(0)
+        if record[7]:
+            name, _, message = record[7].partition(": ")
+            exc_type = getattr(exception, name, None) or getattr(builtins, name, None)
+            if isinstance(exc_type, type) and issubclass(exc_type, Exception):
+                raise exc_type(message)
+            raise RuntimeError(record[7])
+        return record[6]
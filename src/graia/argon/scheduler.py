@@ -0,0 +1,179 @@
+"""
+按会话分片的有序调度.
+
+`Broadcast.postEvent` 为每个事件各创建一个任务, 同一个群的消息可能被乱序处理,
+事件过多时任务数量也没有上限.
+为适配器设置 `DispatchScheduler` 后, 事件按会话 (群, 好友) 分片:
+同一分片内的事件按收到的顺序依次处理, 同时处理的事件总数不超过 `concurrency`.
+
+    adapter.scheduler = DispatchScheduler(broadcast, concurrency=32)
+
+有待处理事件的分片轮流获得执行机会, 消息密集的群不会让其他会话一直等待.
+
+一个事件的监听器全部执行完毕后, 同一分片的下一个事件才开始处理.
+监听器通过 `InterruptControl` 等待同一会话的下一条消息时, 应先调用 `release` 释放分片,
+否则下一条消息要等到等待超时后才会被处理:
+
+    scheduler.release()
+    reply = await inc.wait(waiter)
+
+`release` 同时归还 `concurrency` 的名额, 等待中断的事件不占用并发数.
+"""
+import asyncio
+from collections import deque
+from contextvars import ContextVar
+from typing import Deque, Dict, Hashable, Optional
+
+from graia.broadcast import Broadcast
+from loguru import logger
+
+from graia.argon.event import MiraiEvent
+from graia.argon.event.message import MessageEvent
+from graia.argon.metrics import metrics
+from graia.argon.model import Client, Friend, Group, Member
+
+
+def shard_key(event: MiraiEvent) -> Optional[Hashable]:
+    """
+    事件所属的会话.
+
+    群消息, 临时消息与带有 `group` 或 `member` 的群事件属于所在的群,
+    好友消息, 陌生人消息与好友事件属于对应的 QQ, 其余事件返回 None, 不保证顺序.
+    """
+    if isinstance(event, MessageEvent):
+        sender = event.sender
+        if isinstance(sender, Member):
+            return ("group", sender.group.id)
+        if isinstance(sender, Client):
+            return ("client", sender.id)
+        return ("friend", sender.id)
+    group = getattr(event, "group", None)
+    if isinstance(group, Group):
+        return ("group", group.id)
+    member = getattr(event, "member", None)
+    if isinstance(member, Member):
+        return ("group", member.group.id)
+    friend = getattr(event, "friend", None)
+    if isinstance(friend, Friend):
+        return ("friend", friend.id)
+    return None
+
+
+class Dispatch:
+    """
+    正在处理的一个事件.
+
+    Attributes:
+        key (Hashable): 事件所属的分片.
+        holding (bool): 是否仍占用分片与并发名额.
+    """
+
+    __slots__ = ("key", "holding")
+
+    def __init__(self, key: Hashable) -> None:
+        self.key = key
+        self.holding = True
+
+
+current_dispatch: ContextVar[Optional[Dispatch]] = ContextVar(
+    "current_dispatch", default=None
+)
+
+
+class DispatchScheduler:
+    """
+    按会话分片, 分片内有序, 总并发数有上限的事件调度器.
+
+    每个分片是一个先进先出队列, 有待处理事件的分片在 `ready` 中排队;
+    分片中的一个事件处理完毕 (或被 `release`) 后, 该分片 (仍有事件时) 才排到队尾,
+    因此同一分片的事件依次处理, 各分片轮流执行.
+    不属于任何会话的事件各自成为一个分片.
+
+    Args:
+        broadcast (Broadcast): Broadcast 实例.
+        concurrency (int): 同时处理的事件数量上限.
+
+    Attributes:
+        shards (Dict[Hashable, Deque[MiraiEvent]]): 各分片中等待处理的事件.
+        ready (Deque[Hashable]): 等待执行的分片.
+        active (int): 正在处理的事件数量.
+        pending (int): 等待处理的事件数量.
+    """
+
+    def __init__(self, broadcast: Broadcast, concurrency: int = 64) -> None:
+        self.broadcast = broadcast
+        self.concurrency = concurrency
+        self.shards: Dict[Hashable, Deque[MiraiEvent]] = {}
+        self.ready: Deque[Hashable] = deque()
+        self.active: int = 0
+        self.pending: int = 0
+        self.idle: asyncio.Event = asyncio.Event()
+        self.idle.set()
+
+    def post(self, event: MiraiEvent) -> None:
+        """将事件放入所属分片的队列."""
+        key = shard_key(event)
+        if key is None:
+            key = object()
+        queue = self.shards.get(key)
+        if queue is None:
+            queue = self.shards[key] = deque()
+            self.ready.append(key)
+        queue.append(event)
+        self.pending += 1
+        self.idle.clear()
+        self.schedule()
+
+    def schedule(self) -> None:
+        while self.ready and self.active < self.concurrency:
+            key = self.ready.popleft()
+            event = self.shards[key].popleft()
+            self.pending -= 1
+            self.active += 1
+            # 分片在 `finish` 之前不会回到 `ready`
+            self.broadcast.loop.create_task(self.dispatch(Dispatch(key), event))
+        if metrics.enabled:
+            metrics.set("argon_scheduler_pending_events", self.pending)
+            metrics.set("argon_scheduler_active_events", self.active)
+
+    def finish(self, dispatch: Dispatch) -> None:
+        "归还事件占用的分片与并发名额."
+        if not dispatch.holding:
+            return
+        dispatch.holding = False
+        self.active -= 1
+        if self.shards[dispatch.key]:
+            self.ready.append(dispatch.key)
+        else:
+            del self.shards[dispatch.key]
+        self.schedule()
+        if not self.active and not self.pending:
+            self.idle.set()
+
+    def release(self) -> None:
+        """
+        在监听器中调用, 提前释放当前事件所在的分片与并发名额, 同一分片的下一个事件随即可以开始处理.
+        用于通过 `InterruptControl` 等待同一会话的后续消息, 不在调度的事件中调用时不做任何事.
+        """
+        dispatch = current_dispatch.get()
+        if dispatch is not None:
+            self.finish(dispatch)
+
+    async def dispatch(self, dispatch: Dispatch, event: MiraiEvent) -> None:
+        broadcast = self.broadcast
+        current_dispatch.set(dispatch)
+        try:
+            await broadcast.layered_scheduler(
+                listener_generator=broadcast.default_listener_generator(
+                    event.__class__
+                ),
+                event=event,
+            )
+        except Exception as e:
+            logger.exception(f"dispatch of {event.__class__.__name__} failed: {e!r}")
+        finally:
+            self.finish(dispatch)
+
+    async def join(self) -> None:
+        """等待所有已放入的事件处理完毕."""
+        await self.idle.wait()
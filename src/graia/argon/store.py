@@ -0,0 +1,387 @@
+"""
+本地消息存储.
+
+mirai-api-http 只在内存中缓存少量最近的消息. `MessageStore` 把收到和发出的消息链
+保存在 SQLite (WAL 模式) 中, 按消息 ID, 会话与发送者建立索引, 供引用查找,
+撤回处理与上下文回溯使用; 设置后 `getMessageFromId` 会先查询本地存储.
+消息 ID 只在会话内唯一, 查找时应指定会话.
+
+    app = ArgonMiraiApplication(bcc, adapter, message_store=MessageStore("messages.db"))
+
+写入先在内存中缓冲, 每 `flush_interval` 秒或累计 `batch_size` 条后在后台线程中批量提交,
+尚未提交的消息同样可以被查询到.
+"""
+import asyncio
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from graia.broadcast import Broadcast
+from loguru import logger
+
+from graia.argon.compat import BaseModel
+from graia.argon.event.message import (
+    FriendMessage,
+    GroupMessage,
+    MessageEvent,
+    OtherClientMessage,
+    StrangerMessage,
+    TempMessage,
+)
+from graia.argon.event.mirai import FriendRecallEvent, GroupRecallEvent
+from graia.argon.message.chain import MessageChain
+from graia.argon.message.element import Source
+
+T = TypeVar("T")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER NOT NULL,
+    context_id INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    sender_id INTEGER NOT NULL,
+    time INTEGER NOT NULL,
+    outbound INTEGER NOT NULL DEFAULT 0,
+    recalled INTEGER NOT NULL DEFAULT 0,
+    chain TEXT NOT NULL,
+    PRIMARY KEY (id, context_id)
+);
+CREATE INDEX IF NOT EXISTS messages_context ON messages (context_id, time);
+CREATE INDEX IF NOT EXISTS messages_sender ON messages (sender_id, time);
+"""
+
+kinds: Dict[type, str] = {
+    GroupMessage: "group",
+    FriendMessage: "friend",
+    TempMessage: "temp",
+    StrangerMessage: "stranger",
+    OtherClientMessage: "client",
+}
+"消息事件类型到 `kind` 列取值的映射."
+
+
+class StoredMessage(BaseModel):
+    """
+    存储中的一条消息.
+
+    Attributes:
+        id (int): 消息 ID, 即 `Source.id`.
+        context_id (int): 所在会话, 群消息与临时消息为群号, 其余为对方的 QQ 号.
+        kind (str): `group`, `friend`, `temp`, `stranger` 或 `client`.
+        sender_id (int): 发送者的 QQ 号, 发出的消息为机器人自身.
+        time (datetime): 发送时间.
+        outbound (bool): 是否为机器人发出的消息.
+        recalled (bool): 是否已被撤回.
+        messageChain (MessageChain): 消息链.
+    """
+
+    id: int
+    context_id: int
+    kind: str
+    sender_id: int
+    time: datetime
+    outbound: bool = False
+    recalled: bool = False
+    messageChain: MessageChain
+
+
+Row = Tuple[int, int, str, int, int, int, int, str]
+
+
+class MessageStore:
+    """
+    基于 SQLite 的消息存储, 所有数据库操作都在同一个后台线程中进行.
+
+    Args:
+        path (str): 数据库文件路径, `:memory:` 为内存数据库.
+        batch_size (int): 缓冲的消息达到该数量时立即提交.
+        flush_interval (float): 定期提交的间隔, 单位秒.
+        account (Optional[int]): 机器人的 QQ 号, 作为发出消息的 `sender_id`, 由应用设置.
+    """
+
+    def __init__(
+        self,
+        path: str = "messages.db",
+        batch_size: int = 128,
+        flush_interval: float = 1.0,
+        account: Optional[int] = None,
+    ) -> None:
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.account = account
+        self.connection: Optional[sqlite3.Connection] = None
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.pending: Dict[Tuple[int, int], Row] = {}
+        self.recalls: List[Tuple[int, Optional[int]]] = []
+        self.flush_task: Optional[asyncio.Task] = None
+        self.flushing: Optional[asyncio.Task] = None
+        self.attached: bool = False
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        return await asyncio.get_running_loop().run_in_executor(
+            self.executor, func, *args
+        )
+
+    def connect(self) -> None:
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(SCHEMA)
+        self.connection = connection
+
+    async def open(self) -> None:
+        if self.connection is not None:
+            return
+        self.executor = ThreadPoolExecutor(1, thread_name_prefix="argon-store")
+        await self.run(self.connect)
+        self.flush_task = asyncio.get_running_loop().create_task(self.flush_cycle())
+
+    async def close(self) -> None:
+        """提交缓冲中的消息并关闭数据库."""
+        if self.connection is None:
+            return
+        if self.flush_task:
+            self.flush_task.cancel()
+            self.flush_task = None
+        await self.flush()
+        await self.run(self.connection.close)
+        self.connection = None
+        self.executor.shutdown()
+        self.executor = None
+
+    def attach(self, broadcast: Broadcast) -> None:
+        """注册记录消息事件与撤回事件的监听器, 重复调用无效."""
+        if self.attached:
+            return
+        self.attached = True
+        event_ctx = broadcast.event_ctx
+
+        def store_message():
+            self.record_event(event_ctx.get())
+
+        def store_recall():
+            event = event_ctx.get()
+            if isinstance(event, GroupRecallEvent):
+                context_id = event.group.id
+            elif event.authorId == self.account:  # 好友会话以对方的 QQ 号为会话
+                context_id = event.operator
+            else:
+                context_id = event.authorId
+            self.mark_recalled(event.messageId, context_id)
+
+        for event_type in kinds:
+            broadcast.receiver(event_type)(store_message)
+        broadcast.receiver(GroupRecallEvent)(store_recall)
+        broadcast.receiver(FriendRecallEvent)(store_recall)
+
+    # 写入
+
+    def record(
+        self,
+        message_id: int,
+        context_id: int,
+        kind: str,
+        sender_id: int,
+        chain: MessageChain,
+        timestamp: Optional[float] = None,
+        outbound: bool = False,
+    ) -> None:
+        """
+        缓冲一条消息. 消息链在此时序列化, 之后对它的修改不会影响存储.
+
+        Raises:
+            RuntimeError: 存储尚未打开或已经关闭.
+        """
+        if self.connection is None:
+            raise RuntimeError("message store is not open, call `open` first")
+        row = (
+            message_id,
+            context_id,
+            kind,
+            sender_id,
+            int(timestamp if timestamp is not None else time.time()),
+            int(outbound),
+            0,
+            chain.json(),
+        )
+        self.pending[(message_id, context_id)] = row
+        if len(self.pending) >= self.batch_size and not self.flushing:
+            self.flushing = asyncio.get_running_loop().create_task(self.flush())
+
+    def record_event(self, event: MessageEvent) -> None:
+        chain = event.messageChain
+        source = chain.__root__[0] if chain.__root__ else None
+        if not isinstance(source, Source):
+            return
+        sender = event.sender
+        group = getattr(sender, "group", None)
+        self.record(
+            source.id,
+            group.id if group is not None else sender.id,
+            kinds[event.__class__],
+            sender.id,
+            chain,
+            source.time.timestamp(),
+        )
+
+    def record_sent(
+        self, message_id: int, context_id: int, kind: str, chain: MessageChain
+    ) -> None:
+        if message_id < 0:  # 发送失败
+            return
+        self.record(
+            message_id, context_id, kind, self.account or 0, chain, outbound=True
+        )
+
+    def mark_recalled(self, message_id: int, context_id: Optional[int] = None) -> None:
+        """标记消息已被撤回, `context_id` 为 None 时标记所有会话中该 ID 的消息."""
+        for key, row in self.pending.items():
+            if key[0] == message_id and context_id in (None, key[1]):
+                self.pending[key] = row[:6] + (1,) + row[7:]
+        self.recalls.append((message_id, context_id))
+
+    async def flush_cycle(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"message store: flush failed: {e!r}")
+
+    async def flush(self) -> None:
+        """提交缓冲中的消息与撤回标记, 各批次按调用顺序在后台线程中依次写入."""
+        pending, self.pending = self.pending, {}
+        recalls, self.recalls = self.recalls, []
+        try:
+            if pending or recalls:
+                await self.run(self.write, list(pending.values()), recalls)
+        finally:
+            if self.flushing is asyncio.current_task():
+                self.flushing = None
+
+    def write(self, rows: List[Row], recalls: List[Tuple[int, Optional[int]]]) -> None:
+        connection = self.connection
+        with connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO messages VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            for message_id, context_id in recalls:
+                if context_id is None:
+                    connection.execute(
+                        "UPDATE messages SET recalled = 1 WHERE id = ?", (message_id,)
+                    )
+                else:
+                    connection.execute(
+                        "UPDATE messages SET recalled = 1 WHERE id = ? AND context_id = ?",
+                        (message_id, context_id),
+                    )
+
+    # 查询
+
+    @staticmethod
+    def parse(row: Row) -> StoredMessage:
+        "由数据库中或尚未提交的一行构造 `StoredMessage`."
+        return StoredMessage(
+            id=row[0],
+            context_id=row[1],
+            kind=row[2],
+            sender_id=row[3],
+            time=row[4],
+            outbound=row[5],
+            recalled=row[6],
+            messageChain=MessageChain.parse_raw(row[7]),
+        )
+
+    def select(self, query: str, params: Tuple[Any, ...]) -> List[Row]:
+        return self.connection.execute(query, params).fetchall()
+
+    async def get(
+        self, message_id: int, context_id: Optional[int] = None
+    ) -> Optional[StoredMessage]:
+        """
+        按消息 ID 查找消息.
+
+        Args:
+            message_id (int): 消息 ID.
+            context_id (Optional[int]): 消息所在的会话. 为 None 时,
+                只有该 ID 仅在一个会话中出现过才返回结果, 以免返回其他会话的消息.
+
+        Returns:
+            Optional[StoredMessage]: 找到的消息, 不存在或无法确定会话时为 None.
+        """
+        if context_id is not None:
+            row = self.pending.get((message_id, context_id))
+            if row is not None:
+                return self.parse(row)
+            if self.connection is None:
+                return None
+            rows = await self.run(
+                self.select,
+                "SELECT * FROM messages WHERE id = ? AND context_id = ?",
+                (message_id, context_id),
+            )
+            return self.parse(rows[0]) if rows else None
+        matches: Dict[int, Row] = {}
+        if self.connection is not None:
+            rows = await self.run(
+                self.select,
+                "SELECT * FROM messages WHERE id = ? LIMIT 2",
+                (message_id,),
+            )
+            matches.update((row[1], row) for row in rows)
+        # 尚未提交的消息比数据库中的更新
+        matches.update(
+            (key[1], row) for key, row in self.pending.items() if key[0] == message_id
+        )
+        if len(matches) != 1:
+            return None
+        return self.parse(next(iter(matches.values())))
+
+    async def history(
+        self,
+        context_id: Optional[int] = None,
+        sender_id: Optional[int] = None,
+        *,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 100,
+    ) -> List[StoredMessage]:
+        """
+        查询一段时间内的消息, 按时间先后排列.
+
+        Args:
+            context_id (Optional[int]): 只查询该会话中的消息.
+            sender_id (Optional[int]): 只查询该发送者的消息.
+            since (Optional[datetime]): 起始时间 (含).
+            until (Optional[datetime]): 结束时间 (含).
+            limit (int): 最多返回最近的多少条消息.
+
+        Returns:
+            List[StoredMessage]: 查询结果.
+        """
+        await self.flush()
+        conditions: List[str] = []
+        params: List[Any] = []
+        if context_id is not None:
+            conditions.append("context_id = ?")
+            params.append(context_id)
+        if sender_id is not None:
+            conditions.append("sender_id = ?")
+            params.append(sender_id)
+        if since is not None:
+            conditions.append("time >= ?")
+            params.append(int(since.timestamp()))
+        if until is not None:
+            conditions.append("time <= ?")
+            params.append(int(until.timestamp()))
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = await self.run(
+            self.select,
+            f"SELECT * FROM messages {where} ORDER BY time DESC LIMIT ?",
+            (*params, limit),
+        )
+        return [self.parse(row) for row in reversed(rows)]
@@ -0,0 +1,322 @@
+"""
+从收到事件到发出回复的结构化追踪.
+
+追踪默认关闭, 启用后会记录以下 span:
+ - `mirai.frame`: 一帧数据的处理, 作为一次追踪的根.
+ - `frame.decode`: 解码帧数据.
+ - `build_event`: 解析事件.
+ - `listener`: 单个监听器的执行, 通过 `event_ctx` 中的事件关联到它的 `mirai.frame`.
+ - `dispatch.resolve`: 监听器的参数解析.
+ - `handler`: 监听器函数本身的执行.
+ - `call_api`: 每次对 mirai-api-http 的调用.
+
+span 的 id 与时间戳格式与 OpenTelemetry 相同, 可以通过 `OpenTelemetryExporter` 转发.
+
+    from graia.argon.trace import InMemoryExporter, tracer
+
+    exporter = InMemoryExporter()
+    tracer.enable(exporter)
+    tracer.instrument(broadcast)
+"""
+import random
+import time
+import weakref
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+from graia.broadcast import Broadcast
+
+from graia.argon.context import event_ctx
+
+
+class Span:
+    """
+    一个追踪片段.
+
+    Attributes:
+        name (str): 名称.
+        trace_id (str): 32 位十六进制的追踪 id.
+        span_id (str): 16 位十六进制的片段 id.
+        parent (Optional[Span]): 父片段.
+        start_time (int): 开始时间, Unix 纳秒.
+        end_time (Optional[int]): 结束时间, Unix 纳秒.
+        attributes (Dict[str, Any]): 附加属性.
+        error (Optional[str]): 片段内抛出的异常.
+    """
+
+    __slots__ = (
+        "name",
+        "trace_id",
+        "span_id",
+        "parent",
+        "start_time",
+        "end_time",
+        "attributes",
+        "error",
+        "__weakref__",
+    )
+
+    def __init__(
+        self, name: str, parent: Optional["Span"] = None, **attributes: Any
+    ) -> None:
+        self.name = name
+        self.parent = parent
+        self.trace_id = parent.trace_id if parent else f"{random.getrandbits(128):032x}"
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.start_time = time.time_ns()
+        self.end_time: Optional[int] = None
+        self.attributes = attributes
+        self.error: Optional[str] = None
+
+    @property
+    def parent_id(self) -> Optional[str]:
+        return self.parent.span_id if self.parent else None
+
+    @property
+    def duration(self) -> Optional[float]:
+        """持续时间, 单位秒."""
+        if self.end_time is None:
+            return None
+        return (self.end_time - self.start_time) / 1e9
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+    def __repr__(self) -> str:
+        return f"<Span {self.name} {self.span_id} parent={self.parent_id} {self.attributes}>"
+
+
+span_ctx: ContextVar[Optional[Span]] = ContextVar("span", default=None)
+
+
+class SpanExporter:
+    "接收开始与结束的片段."
+
+    def start(self, span: Span) -> None:
+        "片段开始时调用, 父片段总是先于子片段开始."
+
+    def export(self, span: Span) -> None:
+        "片段结束时调用. 异步执行的子片段 (如 `listener`) 可能晚于父片段结束."
+        raise NotImplementedError
+
+
+class InMemoryExporter(SpanExporter):
+    "在内存中保存已结束的片段, 适合测试."
+
+    def __init__(self) -> None:
+        self.spans: List[Span] = []
+
+    def export(self, span: Span) -> None:
+        self.spans.append(span)
+
+    def clear(self) -> None:
+        self.spans.clear()
+
+    def reply_breakdown(self) -> List[Dict[str, Any]]:
+        """
+        对每个发出过 `call_api` 的监听器, 给出从收到数据到该调用完成的耗时及其分解 (单位秒).
+
+        Returns:
+            List[Dict[str, Any]]: 包含 `listener`, `action`, `total`, `decode`,
+            `build_event`, `resolve`, `handler`, `call_api` 的字典列表.
+        """
+        children: Dict[str, List[Span]] = {}
+        for span in self.spans:
+            if span.parent_id:
+                children.setdefault(span.parent_id, []).append(span)
+
+        def first(parent: Span, name: str) -> Optional[Span]:
+            for child in children.get(parent.span_id, []):
+                if child.name == name:
+                    return child
+
+        def duration(span: Optional[Span]) -> Optional[float]:
+            return span.duration if span else None
+
+        result = []
+        for span in self.spans:
+            if span.name != "call_api":
+                continue
+            handler = span.parent
+            while handler and handler.name != "handler":
+                handler = handler.parent
+            listener = handler.parent if handler else None
+            root = listener.parent if listener else None
+            if not (handler and listener and root):
+                continue
+            result.append(
+                {
+                    "listener": listener.attributes.get("listener"),
+                    "action": span.attributes.get("action"),
+                    "total": (span.end_time - root.start_time) / 1e9,
+                    "decode": duration(first(root, "frame.decode")),
+                    "build_event": duration(first(root, "build_event")),
+                    "resolve": duration(first(listener, "dispatch.resolve")),
+                    "handler": handler.duration,
+                    "call_api": span.duration,
+                }
+            )
+        return result
+
+
+class OpenTelemetryExporter(SpanExporter):
+    """
+    把片段转发给 OpenTelemetry, 需要安装 `opentelemetry-api`.
+
+    Args:
+        tracer_name (str): 传给 `opentelemetry.trace.get_tracer` 的名称.
+    """
+
+    def __init__(self, tracer_name: str = "graia.argon") -> None:
+        from opentelemetry import trace as otel_trace
+
+        self.otel_trace = otel_trace
+        self.otel_tracer = otel_trace.get_tracer(tracer_name)
+        self.otel_spans: "weakref.WeakKeyDictionary[Span, Any]" = (
+            weakref.WeakKeyDictionary()
+        )
+        """片段对应的 OpenTelemetry 片段, 子片段持有父片段的引用, 因此父片段结束后仍可作为父级."""
+
+    def start(self, span: Span) -> None:
+        parent = self.otel_spans.get(span.parent) if span.parent else None
+        self.otel_spans[span] = self.otel_tracer.start_span(
+            span.name,
+            context=self.otel_trace.set_span_in_context(parent) if parent else None,
+            attributes={k: str(v) for k, v in span.attributes.items()},
+            start_time=span.start_time,
+        )
+
+    def export(self, span: Span) -> None:
+        otel_span = self.otel_spans.get(span)
+        if otel_span is None:  # 在启用之前开始的片段
+            return
+        if span.error:
+            otel_span.set_status(
+                self.otel_trace.Status(self.otel_trace.StatusCode.ERROR, span.error)
+            )
+        otel_span.end(end_time=span.end_time)
+
+
+class Tracer:
+    """
+    片段的创建与导出.
+
+    埋点处应先判断 `tracer.enabled`, 以保证关闭时几乎没有开销.
+    """
+
+    def __init__(self) -> None:
+        self.enabled: bool = False
+        self.exporters: List[SpanExporter] = []
+        self.event_spans: Dict[int, Span] = {}
+
+    def enable(self, *exporters: SpanExporter) -> None:
+        self.enabled = True
+        self.exporters.extend(exporters)
+
+    def disable(self) -> None:
+        self.enabled = False
+        self.exporters.clear()
+
+    def current(self) -> Optional[Span]:
+        """当前的片段; 没有时使用 `event_ctx` 中事件所属的片段."""
+        span = span_ctx.get()
+        if span is None:
+            event = event_ctx.get(None)
+            if event is not None:
+                span = self.event_spans.get(id(event))
+        return span
+
+    def begin(
+        self, name: str, parent: Optional[Span] = None, **attributes: Any
+    ) -> Span:
+        """开始一个片段并将其设为当前片段, 需要与 `end` 成对使用."""
+        span = Span(name, parent or self.current(), **attributes)
+        span_ctx.set(span)
+        for exporter in self.exporters:
+            exporter.start(span)
+        return span
+
+    def end(self, span: Span, error: Optional[BaseException] = None) -> None:
+        """结束片段, 并把当前片段恢复为其父片段."""
+        span.end_time = time.time_ns()
+        if error is not None:
+            span.error = f"{error.__class__.__name__}: {error}"
+        if span_ctx.get() is span:
+            span_ctx.set(span.parent)
+        for exporter in self.exporters:
+            exporter.export(span)
+
+    @contextmanager
+    def span(
+        self, name: str, *, root: bool = False, **attributes: Any
+    ) -> Iterator[Span]:
+        """以上下文管理器的形式创建片段, `root` 为 True 时开始一次新的追踪."""
+        span = Span(name, None if root else self.current(), **attributes)
+        token = span_ctx.set(span)
+        for exporter in self.exporters:
+            exporter.start(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{e.__class__.__name__}: {e}"
+            raise
+        finally:
+            span_ctx.reset(token)
+            span.end_time = time.time_ns()
+            for exporter in self.exporters:
+                exporter.export(span)
+
+    def bind_event(self, event: Any, span: Optional[Span] = None) -> None:
+        """将事件关联到片段 (默认为当前片段), 事件被回收时自动解除."""
+        span = span or span_ctx.get()
+        if span is None:
+            return
+        key = id(event)
+        self.event_spans[key] = span
+        try:
+            weakref.finalize(event, self.event_spans.pop, key, None)
+        except TypeError:  # 不支持弱引用的对象
+            pass
+
+    def instrument(self, broadcast: Broadcast) -> None:
+        """为 `broadcast` 的监听器执行创建 `listener` 片段."""
+        executor = broadcast.Executor
+        if getattr(executor, "__argon_traced__", False):
+            return
+
+        async def traced_executor(target, *args, **kwargs):
+            if not self.enabled:
+                return await executor(target, *args, **kwargs)
+            event = broadcast.event_ctx.get()
+            callable_target = getattr(target, "callable", target)
+            span = self.begin(
+                "listener",
+                self.event_spans.get(id(event)),
+                listener=getattr(
+                    callable_target, "__qualname__", repr(callable_target)
+                ),
+                event=event.__class__.__name__,
+            )
+            try:
+                result = await executor(target, *args, **kwargs)
+            except BaseException as e:
+                self.end(span, e)
+                raise
+            self.end(span)
+            return result
+
+        traced_executor.__argon_traced__ = True
+        broadcast.Executor = traced_executor
+
+
+tracer = Tracer()
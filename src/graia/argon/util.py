@@ -1,11 +1,15 @@
 import functools
-from typing import Callable, ContextManager, TypeVar, Union
+import time
+from contextvars import ContextVar, Token
+from typing import Callable, List, Optional, Tuple, TypeVar, Union
 
 from graia.broadcast.entities.dispatcher import BaseDispatcher
 from graia.broadcast.interfaces.dispatcher import DispatcherInterface
 from typing_extensions import ParamSpec
 
-from graia.argon.context import enter_context
+from graia.argon.context import pop_context, push_context
+from graia.argon.metrics import metrics
+from graia.argon.trace import span_ctx, tracer
 
 P = ParamSpec("P")
 R = TypeVar("R")
@@ -47,22 +51,60 @@ def validate_response(code: Union[dict, int]):
             raise exception_code
 
 
+_execution_start: ContextVar[Optional[float]] = ContextVar(
+    "execution_start", default=None
+)
+_execution_tokens: ContextVar[List[Tuple[ContextVar, Token]]] = ContextVar(
+    "execution_tokens"
+)
+
+
 class ApplicationMiddlewareDispatcher(BaseDispatcher):
     always = True
-    context: ContextManager
 
     def __init__(self, app) -> None:
         self.app = app
+        self.inflight = 0
 
     def beforeExecution(self, interface: "DispatcherInterface"):
-        self.context = enter_context(self.app, interface.event)
-        self.context.__enter__()
+        # 令牌保存在执行所在的上下文中, 并发执行的监听器互不干扰
+        _execution_tokens.set(push_context(self.app, interface.event))
+        if metrics.enabled:
+            _execution_start.set(time.perf_counter())
+            self.inflight += 1
+            metrics.set("argon_dispatch_inflight", self.inflight)
+        if tracer.enabled:
+            tracer.begin("dispatch.resolve")
+
+    def afterDispatch(self, interface: "DispatcherInterface", exception, tb):
+        if tracer.enabled:
+            span = span_ctx.get()
+            if span is not None and span.name == "dispatch.resolve":
+                tracer.end(span, exception)
+            tracer.begin("handler")
 
     def afterExecution(self, interface: "DispatcherInterface", exception, tb):
-        self.context.__exit__(exception.__class__ if exception else None, exception, tb)
+        tokens = _execution_tokens.get(None)
+        if tokens:
+            pop_context(tokens)
+        if tracer.enabled:
+            span = span_ctx.get()
+            if span is not None and span.name in ("dispatch.resolve", "handler"):
+                tracer.end(span, exception)
+        if metrics.enabled:
+            start = _execution_start.get(None)
+            if start is not None:
+                _execution_start.set(None)
+                self.inflight -= 1
+                metrics.set("argon_dispatch_inflight", self.inflight)
+                metrics.observe(
+                    "argon_dispatch_seconds",
+                    time.perf_counter() - start,
+                    event=interface.event.__class__.__name__,
+                )
 
     async def catch(self, interface: "DispatcherInterface"):
-        from graia.argon import ArgonMiraiApplication
+        from graia.argon.app import ArgonMiraiApplication
 
         if interface.annotation is ArgonMiraiApplication:
             return self.app
@@ -71,7 +113,21 @@ class ApplicationMiddlewareDispatcher(BaseDispatcher):
 def app_ctx_manager(func: Callable[P, R]) -> Callable[P, R]:
     @functools.wraps(func)
     async def wrapper(self, *args: P.args, **kwargs: P.kwargs):
-        with enter_context(app=self):
-            return await func(self, *args, **kwargs)
+        tokens = push_context(self)
+        try:
+            if not metrics.enabled:
+                return await func(self, *args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return await func(self, *args, **kwargs)
+            finally:
+                metrics.observe(
+                    "argon_app_api_seconds",
+                    time.perf_counter() - start,
+                    method=func.__name__,
+                )
+        finally:
+            if tokens:
+                pop_context(tokens)
 
     return wrapper
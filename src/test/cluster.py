@@ -0,0 +1,180 @@
+"""
+分片集群的正确性检查, 使用 `FakeMiraiServer`, 不需要运行中的 mirai.
+
+用法: python src/test/cluster.py
+
+检查:
+ - 两个工作进程: 同一个群的消息总是由同一个工作进程按顺序处理, 两个工作进程都分到了群,
+   工作进程的 `call_api` 经由前端完成并收到结果.
+ - 工作进程不读取数据时, 前端在发送缓冲区超出上限后改为暂存事件, 恢复读取后按顺序发出.
+ - 前端断开时, 工作进程中进行中的与之后的 `call_api` 都以 `ConnectionResetError` 失败.
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(__file__, "..", "..")))
+
+from fake_mirai import FakeMiraiServer
+from graia.broadcast import Broadcast
+from loguru import logger
+
+from graia.argon.adapter import CombinedAdapter
+from graia.argon.app import ArgonMiraiApplication
+from graia.argon.cluster import ShardFront, ShardWorkerAdapter, read_frame, write_frame
+from graia.argon.event.message import GroupMessage
+from graia.argon.message.chain import MessageChain
+from graia.argon.model import CallMethod, ChatLogConfig, MiraiSession
+
+GROUPS = 8
+MESSAGES = 64
+
+
+def worker_main(index: int, path: str) -> None:
+    logger.remove()
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    bcc = Broadcast(loop=loop)
+    app = ArgonMiraiApplication(
+        bcc,
+        ShardWorkerAdapter(bcc, path, index),
+        chat_log_config=ChatLogConfig(enabled=False),
+    )
+
+    @bcc.receiver(GroupMessage)
+    async def echo(event: GroupMessage):
+        text = event.messageChain.asDisplay()
+        reply = await app.sendGroupMessage(
+            event.sender.group, MessageChain.create(f"{index}:{text}")
+        )
+        await app.sendGroupMessage(
+            event.sender.group, MessageChain.create(f"ack:{reply.messageId}")
+        )
+
+    loop.run_until_complete(app.lifecycle())
+
+
+async def wait_until(condition, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        await asyncio.sleep(0.05)
+
+
+async def check_workers(server: FakeMiraiServer, front: ShardFront) -> None:
+    front.spawn(worker_main, "spawn")
+    await wait_until(lambda: len(front.connections) == 2, 30)
+    for i in range(MESSAGES):
+        group = server.groups[i % GROUPS]["id"]
+        await server.push(server.group_message(str(i), group, 20000))
+    await wait_until(lambda: len(server.messages) >= 2 * MESSAGES, 30)
+
+    echoes = {}
+    acks = set()
+    for message_id, chain in server.messages.items():
+        text = chain[1]["text"]
+        if text.startswith("ack:"):
+            acks.add(int(text[4:]))
+            continue
+        worker, number = text.split(":")
+        echoes.setdefault(int(number) % GROUPS, []).append(
+            (message_id, worker, int(number))
+        )
+    workers = set()
+    for group, replies in echoes.items():
+        assert len({worker for _, worker, _ in replies}) == 1, replies
+        workers.add(replies[0][1])
+        numbers = [number for _, _, number in sorted(replies)]
+        assert numbers == sorted(numbers), replies
+    assert workers == {"0", "1"}, workers
+    assert acks == {id for replies in echoes.values() for id, _, _ in replies}
+    assert front.dropped == 0
+
+
+async def check_backpressure(adapter: CombinedAdapter, path: str) -> None:
+    front = ShardFront(adapter, path, workers=1, max_buffer=4096)
+    await front.start()
+    reader, writer = await asyncio.open_unix_connection(path)
+    write_frame(writer, {"op": "hello", "index": 0})
+    assert (await read_frame(reader))["op"] == "session"
+    await wait_until(lambda: front.connections, 5)
+    # 工作进程不读取数据, 套接字缓冲区填满后前端开始暂存
+    writer.transport.pause_reading()
+    sent = 0
+    while not front.pending[0]:
+        front.forward({"type": "FriendMessage", "sender": {"id": 1}, "n": sent})
+        sent += 1
+        await asyncio.sleep(0)
+    for _ in range(16):
+        front.forward({"type": "FriendMessage", "sender": {"id": 1}, "n": sent})
+        sent += 1
+    assert len(front.pending[0]) == 17 and 0 in front.draining
+    writer.transport.resume_reading()
+    received = [(await read_frame(reader))["data"]["n"] for _ in range(sent)]
+    assert received == list(range(sent)), received
+    assert not front.pending[0] and front.dropped == 0
+    writer.close()
+    await front.stop()
+
+
+async def check_disconnect(
+    adapter: CombinedAdapter, server: FakeMiraiServer, path: str
+) -> None:
+    front = ShardFront(adapter, path, workers=1)
+    await front.start()
+    bcc = Broadcast(loop=asyncio.get_running_loop())
+    worker = ShardWorkerAdapter(bcc, path, 0)
+    worker.running = True
+    fetch_task = asyncio.get_running_loop().create_task(worker.fetch_cycle())
+    await asyncio.wait_for(worker.verified.wait(), 5)
+    assert (await worker.call_api("about", CallMethod.GET))["version"]
+    server.latency = 0.5
+    call = asyncio.get_running_loop().create_task(
+        worker.call_api("about", CallMethod.GET)
+    )
+    await asyncio.sleep(0.1)
+    await front.stop()
+    for awaitable in (call, worker.call_api("about", CallMethod.GET)):
+        try:
+            await asyncio.wait_for(awaitable, 5)
+        except ConnectionResetError:
+            pass
+        else:
+            raise AssertionError("call_api should fail after the front disconnects")
+    server.latency = 0.0
+    await fetch_task
+
+
+async def main() -> None:
+    logger.remove()
+    server = FakeMiraiServer()
+    url = await server.start()
+    bcc = Broadcast(loop=asyncio.get_running_loop())
+    adapter = CombinedAdapter(bcc, MiraiSession(url, server.account, server.verify_key))
+    app = ArgonMiraiApplication(
+        bcc, adapter, chat_log_config=ChatLogConfig(enabled=False)
+    )
+    path = os.path.join(tempfile.mkdtemp(), "argon.sock")
+    front = ShardFront(adapter, path, workers=2)
+    await front.start()
+    await app.launch()
+    try:
+        await check_workers(server, front)
+        await front.stop()
+        await check_backpressure(adapter, path)
+        await check_disconnect(adapter, server, path)
+    finally:
+        await front.stop()
+        app.running = False
+        if app.daemon_task:
+            app.daemon_task.cancel()
+        await adapter.stop()
+        await adapter.close()
+        await server.close()
+    print("cluster ok")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
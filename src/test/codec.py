@@ -0,0 +1,205 @@
+"""
+`graia.argon.message.codec` 的往返测试与体积/速度对比.
+
+用法: python src/test/codec.py [--rounds 2000]
+
+对每条样例消息链检查: 二进制编码解码后元素类型, `dict()` 与 JSON 形式均与原消息链一致;
+再把全部样例写成帧流, 以随机长度切块后用 `StreamDecoder` 解出.
+"""
+import argparse
+import base64
+import io
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timezone
+
+sys.path.append(os.path.abspath(os.path.join(__file__, "..", "..")))
+
+from graia.argon.message.chain import MessageChain
+from graia.argon.message.codec import (
+    CodecError,
+    StreamDecoder,
+    dump_frame,
+    dumps,
+    iter_frames,
+    loads,
+)
+from graia.argon.message.element import (
+    App,
+    At,
+    AtAll,
+    Dice,
+    Face,
+    FlashImage,
+    Forward,
+    ForwardNode,
+    Image,
+    Json,
+    MusicShare,
+    Plain,
+    Poke,
+    PokeMethods,
+    Quote,
+    Source,
+    Voice,
+)
+
+NOW = datetime.fromtimestamp(1633024800, timezone.utc)
+
+
+def samples():
+    png = base64.b64encode(os.urandom(4096)).decode()
+    yield MessageChain.create([Plain("hello")])
+    yield MessageChain.create(
+        [
+            Source(id=-12345, time=NOW),
+            At(2_987_654_321, display="@某人"),
+            Plain(" 你好 🌏"),
+        ]
+    )
+    yield MessageChain.create(
+        [
+            Source(id=42, time=NOW),
+            Quote(
+                id=41,
+                groupId=123456789,
+                senderId=10000,
+                targetId=123456789,
+                origin=MessageChain.create(
+                    [Plain("原消息"), Face(faceId=178, name="斜眼笑")]
+                ),
+            ),
+            AtAll(),
+            Plain("回复"),
+        ]
+    )
+    yield MessageChain.create(
+        [
+            Image(
+                imageId="{01E9451B-70ED-EAE3-B37C-101F1EEBF5B5}.jpg",
+                url="https://example.com/a.jpg",
+            )
+        ]
+    )
+    # FlashImage 与 Voice 的 __init__ 目前无法直接调用, 以 construct 构造
+    yield MessageChain.create(
+        [Image(base64=png), FlashImage.construct(type="FlashImage", imageId="{X}.png")]
+    )
+    yield MessageChain.create([Image(base64="bm90IGNhbm9uaWNhbA")])  # 非规范的 base64
+    yield MessageChain.create(
+        [Voice.construct(type="Voice", voiceId="v", length=12, base64=png)]
+    )
+    yield MessageChain.create(
+        [
+            Json(json={"app": "com.tencent.miniapp", "ver": 1}),
+            App(content="<app/>"),
+            Poke(name=PokeMethods.ChuoYiChuo),
+            Dice(value=6),
+            MusicShare(kind="NeteaseCloudMusic", title="t", summary=None),
+        ]
+    )
+    yield MessageChain.create(
+        [
+            Forward(
+                nodeList=[
+                    ForwardNode(
+                        senderId=1,
+                        time=NOW,
+                        senderName="a",
+                        messageChain=MessageChain.create([Plain("x")]),
+                        messageId=None,
+                    )
+                ]
+            )
+        ]
+    )
+    yield MessageChain.parse_obj(
+        [
+            {"type": "Source", "id": 7, "time": 1633024800},
+            {
+                "type": "Plain",
+                "text": "from mirai",
+                "extra_field": [1, 2.5, {"k": None}],
+            },
+            {"type": "Face", "faceId": 1},
+        ]
+    )
+
+
+def check_round_trip(chain: MessageChain) -> None:
+    decoded = loads(dumps(chain))
+    assert decoded.dict() == chain.dict(), (decoded, chain)
+    assert decoded.json() == chain.json(), (decoded.json(), chain.json())
+    assert [type(i) for i in decoded] == [type(i) for i in chain]
+
+
+def check_stream(chains) -> None:
+    stream = b"".join(dump_frame(chain) for chain in chains)
+    decoder = StreamDecoder()
+    decoded = []
+    pos = 0
+    while pos < len(stream):
+        step = random.randint(1, 97)
+        decoded.extend(decoder.feed(stream[pos : pos + step]))
+        pos += step
+    assert len(decoder) == 0
+    assert [c.dict() for c in decoded] == [c.dict() for c in chains]
+    assert [c.dict() for c in iter_frames(io.BytesIO(stream).read, 64)] == [
+        c.dict() for c in chains
+    ]
+    try:
+        list(iter_frames(io.BytesIO(stream[:-1]).read))
+    except CodecError:
+        pass
+    else:
+        raise AssertionError("truncated stream was accepted")
+
+
+def compare(chains, rounds: int) -> None:
+    print(f"{'sample':>6} {'json':>8} {'binary':>8}")
+    for i, chain in enumerate(chains):
+        print(f"{i:>6} {len(chain.json().encode()):>8} {len(dumps(chain)):>8}")
+    parse_json = lambda text: MessageChain.parse_obj(json.loads(text))
+    comparable = []  # 只比较 JSON 形式可以被解析回来的消息链
+    for chain in chains:
+        try:
+            parse_json(chain.json())
+        except Exception:
+            continue
+        comparable.append(chain)
+    text = [chain.json() for chain in comparable]
+    data = [dumps(chain) for chain in comparable]
+
+    def timeit(func, items):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for item in items:
+                func(item)
+        return (time.perf_counter() - start) / rounds / len(items) * 1e6
+
+    print(
+        "encode: json {:.1f}us, binary {:.1f}us".format(
+            timeit(MessageChain.json, comparable), timeit(dumps, comparable)
+        )
+    )
+    print(
+        "decode: json {:.1f}us, binary {:.1f}us".format(
+            timeit(parse_json, text),
+            timeit(loads, data),
+        )
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+    chains = list(samples())
+    for chain in chains:
+        check_round_trip(chain)
+    check_stream(chains)
+    print(f"round trip ok: {len(chains)} chains")
+    compare(chains, args.rounds)
@@ -0,0 +1,139 @@
+"""
+应用上下文的正确性检查与 API 调用开销的微基准测试, 不需要运行中的 mirai.
+
+用法: python src/test/context.py [--calls 20000]
+
+检查: 没有应用时 `event_ctx` 同样会被还原; 异常时上下文被还原;
+并发执行的监听器各自看到自己的事件.
+再比较每次 API 调用在以下情况下的上下文开销:
+逐次设置全部上下文变量的旧做法, 在应用上下文之外调用, 以及在 `launch` 设置的上下文中调用.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+sys.path.append(os.path.abspath(os.path.join(__file__, "..", "..")))
+
+from benchmark import StubAdapter, synthetic_frames
+from graia.broadcast import Broadcast
+from loguru import logger
+
+from graia.argon.app import ArgonMiraiApplication
+from graia.argon.context import (
+    adapter_ctx,
+    application_ctx,
+    broadcast_ctx,
+    enter_context,
+    event_ctx,
+    event_loop_ctx,
+    pop_context,
+    push_context,
+)
+from graia.argon.event.message import GroupMessage
+from graia.argon.model import MiraiSession
+from graia.argon.util import ApplicationMiddlewareDispatcher, app_ctx_manager
+
+
+@contextmanager
+def legacy_enter_context(app):
+    "原先的做法: 每次都设置并还原四个上下文变量."
+    tokens = (
+        application_ctx.set(app),
+        event_loop_ctx.set(app.broadcast.loop),
+        broadcast_ctx.set(app.broadcast),
+        adapter_ctx.set(app.adapter),
+    )
+    yield
+    application_ctx.reset(tokens[0])
+    event_loop_ctx.reset(tokens[1])
+    broadcast_ctx.reset(tokens[2])
+    adapter_ctx.reset(tokens[3])
+
+
+class ContextApplication(ArgonMiraiApplication):
+    @app_ctx_manager
+    async def noop(self):
+        return application_ctx.get()
+
+    async def legacy_noop(self):
+        with legacy_enter_context(self):
+            return application_ctx.get()
+
+
+def check_reset(app: ArgonMiraiApplication, event: GroupMessage) -> None:
+    with enter_context(event=event):
+        assert event_ctx.get() is event
+    assert event_ctx.get(None) is None, "event_ctx leaked without app"
+    try:
+        with enter_context(app, event):
+            raise KeyError
+    except KeyError:
+        pass
+    assert application_ctx.get(None) is None and event_ctx.get(None) is None
+    tokens = push_context(app)
+    assert push_context(app) == [], "unchanged context was set again"
+    pop_context(tokens)
+    assert application_ctx.get(None) is None
+
+
+async def check_concurrent(app: ArgonMiraiApplication, events) -> None:
+    bcc = app.broadcast
+    bcc.dispatcher_interface.inject_global_raw(ApplicationMiddlewareDispatcher(app))
+    seen = []
+
+    @bcc.receiver(GroupMessage)
+    async def listener(event: GroupMessage):
+        await asyncio.sleep(0.01)
+        assert event_ctx.get() is event, "execution context was clobbered"
+        assert application_ctx.get() is app
+        seen.append(event)
+
+    for event in events:
+        bcc.postEvent(event)
+    await asyncio.sleep(0.1)
+    assert len(seen) == len(events), seen
+    assert application_ctx.get(None) is None and event_ctx.get(None) is None
+
+
+async def timeit(func, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        await func()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+async def main(calls: int) -> None:
+    logger.remove()
+    bcc = Broadcast(loop=asyncio.get_running_loop())
+    app = ContextApplication(
+        bcc, StubAdapter(bcc, MiraiSession("http://localhost", account=123456789))
+    )
+    app.adapter.verified.set()
+    events = [await app.adapter.build_event(frame) for frame in synthetic_frames(8)]
+
+    check_reset(app, events[0])
+    await check_concurrent(app, events)
+    print("context ok")
+
+    results = {
+        "legacy": await timeit(app.legacy_noop, calls),
+        "outside app context": await timeit(app.noop, calls),
+    }
+    tokens = push_context(app)  # 与 launch 相同
+    try:
+        results["inside app context"] = await timeit(app.noop, calls)
+        results["muteAll (stub)"] = await timeit(lambda: app.muteAll(10000), calls)
+    finally:
+        pop_context(tokens)
+    for name, value in results.items():
+        print(f"{name:>20}: {value:.2f}us/call")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=20000)
+    args = parser.parse_args()
+    asyncio.run(main(args.calls))
@@ -0,0 +1,239 @@
+"""
+`graia.argon.event.builder` 与 pydantic 的差异测试及吞吐量对比.
+
+用法: python src/test/event_builder.py [--cases 5000] [--rounds 20000] [--seed 0]
+
+随机生成 (并随机破坏) 群消息, 好友消息与临时消息的推送数据, 检查:
+快速构造成功时, 事件与 `parse_obj` 的结果在类型, `dict()`, JSON 与 `fields_set` 上一致;
+快速构造放弃时, 回退的结果与 `parse_obj` 相同 (或同样抛出异常).
+此外对每个支持快速构造的模型的每个字段, 分别比较字段缺失, 为 None 以及以字段名代替别名时的结果.
+"""
+import argparse
+import copy
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(__file__, "..", "..")))
+
+from graia.argon.compat import (
+    BaseModel,
+    RootModel,
+    fields_set,
+    model_fields,
+    model_values,
+)
+from graia.argon.event import builder
+from graia.argon.event.message import FriendMessage, GroupMessage, TempMessage
+from graia.argon.message.element import At, AtAll, Face, Plain, Source
+from graia.argon.model import Friend, Group, Member
+
+GROUP = {"id": 123456789, "name": "测试群", "permission": "MEMBER"}
+MEMBER = {
+    "id": 20000,
+    "memberName": "某人",
+    "specialTitle": "",
+    "permission": "ADMINISTRATOR",
+    "joinTimestamp": 1600000000,
+    "lastSpeakTimestamp": 1634000000,
+    "muteTimeRemaining": 0,
+    "group": GROUP,
+}
+FRIEND = {"id": 30000, "nickname": "好友", "remark": "备注"}
+
+ELEMENTS = [
+    {"type": "Plain", "text": "hello"},
+    {"type": "Plain", "text": "echo -c 3 --loud 你好 "},
+    {"type": "At", "target": 123456789, "display": "@bot"},
+    {"type": "At", "target": 42},
+    {"type": "AtAll"},
+    {"type": "Face", "faceId": 178, "name": "斜眼笑"},
+    {"type": "Face", "faceId": 1},
+    {
+        "type": "Image",
+        "imageId": "{01E9451B-70ED-EAE3-B37C-101F1EEBF5B5}.jpg",
+        "url": "https://example.com/a.jpg",
+        "path": None,
+    },
+    {
+        "type": "Quote",
+        "id": 41,
+        "groupId": 123456789,
+        "senderId": 20000,
+        "targetId": 123456789,
+        "origin": [{"type": "Plain", "text": "原消息"}],
+    },
+    {"type": "Dice", "value": 6},
+    {"type": "NotAnElement", "x": 1},
+]
+
+MUTATIONS = [
+    # 与格式一致, 但较少见的数据
+    lambda d: d["sender"].pop("specialTitle", None),
+    lambda d: d["sender"].update(specialTitle=None),
+    lambda d: d.update(extra="ignored"),
+    lambda d: d["messageChain"].append({"type": "Plain", "text": "x", "extra": [1]}),
+    # 与格式不一致, 需要回退
+    lambda d: d["sender"].update(id=str(d["sender"]["id"])),
+    lambda d: d["sender"].update(id=True),
+    lambda d: d["sender"].update(mutetimeRemaining="5"),
+    lambda d: d["messageChain"][0].update(time=1634000000123),
+    lambda d: d["messageChain"][0].update(time="2021-10-01T00:00:00"),
+    lambda d: d["messageChain"].append({"type": "At", "target": "123"}),
+    lambda d: d["messageChain"].append({"type": "Face", "faceId": 1.0}),
+    lambda d: d["messageChain"].append({"type": "Plain", "text": 1}),
+    lambda d: d["messageChain"].append({"type": 1}),
+    lambda d: d.update(messageChain=tuple(d["messageChain"])),
+    # 无效的数据, 两者都应失败
+    lambda d: d["sender"].pop("id"),
+    lambda d: d["sender"].update(permission="KING"),
+    lambda d: d.pop("sender"),
+    lambda d: d["messageChain"].append({"type": "Plain"}),
+]
+
+
+def payload(rng: random.Random):
+    kind = rng.choice([GroupMessage, FriendMessage, TempMessage])
+    sender = copy.deepcopy(FRIEND if kind is FriendMessage else MEMBER)
+    chain = [
+        {"type": "Source", "id": rng.randint(-(2 ** 31), 2 ** 31), "time": 1634000000}
+    ]
+    chain.extend(copy.deepcopy(rng.choice(ELEMENTS)) for _ in range(rng.randint(0, 6)))
+    data = {"messageChain": chain, "sender": sender}
+    if isinstance(sender, dict) and "group" in sender and rng.random() < 0.3:
+        sender["group"]["permission"] = rng.choice(["OWNER", "ADMINISTRATOR"])
+    for _ in range(rng.randint(0, 2) if rng.random() < 0.5 else 0):
+        try:
+            rng.choice(MUTATIONS)(data)
+        except (AttributeError, IndexError, KeyError, TypeError):
+            pass
+    return kind, data
+
+
+def fields_sets(value):
+    "递归收集模型的类型与 `fields_set`, 消息链中的元素逐个比较."
+    if isinstance(value, RootModel):
+        return [value.__class__, fields_sets(value.__root__)]
+    if isinstance(value, BaseModel):
+        return [
+            value.__class__,
+            sorted(fields_set(value)),
+            {k: fields_sets(v) for k, v in model_values(value).items()},
+        ]
+    if isinstance(value, list):
+        return [fields_sets(i) for i in value]
+    return value.__class__
+
+
+def check(kind, data) -> bool:
+    "返回快速构造是否成功."
+    try:
+        expected = kind.parse_obj(copy.deepcopy(data))
+    except Exception as e:
+        expected = e
+    fast = builder.build_event(kind, copy.deepcopy(data))
+    if fast is None:
+        return False
+    assert not isinstance(expected, Exception), (data, expected)
+    assert fast.dict() == expected.dict(), (fast, expected)
+    assert json.loads(fast.json()) == json.loads(expected.json()), data
+    assert fields_sets(fast) == fields_sets(expected), data
+    return True
+
+
+def check_model(model_builder: builder.ModelBuilder, data: dict) -> bool:
+    "与 `check` 相同, 比较单个模型的快速构造与 `parse_obj`."
+    try:
+        expected = model_builder.cls.parse_obj(copy.deepcopy(data))
+    except Exception as e:
+        expected = e
+    try:
+        fast = model_builder(copy.deepcopy(data))
+    except builder.Mismatch:
+        return False
+    assert not isinstance(expected, Exception), (data, expected)
+    assert fast.dict() == expected.dict(), (fast, expected)
+    assert json.loads(fast.json()) == json.loads(expected.json()), data
+    assert fields_sets(fast) == fields_sets(expected), data
+    return True
+
+
+def check_fields() -> int:
+    "逐个字段比较快速构造与 `parse_obj`, 返回比较的次数."
+    member = {**MEMBER, "mutetimeRemaining": 0}
+    samples = {
+        Friend: FRIEND,
+        Group: GROUP,
+        Member: member,
+        Plain: ELEMENTS[0],
+        At: ELEMENTS[2],
+        AtAll: ELEMENTS[4],
+        Face: ELEMENTS[5],
+        Source: {"type": "Source", "id": 1, "time": 1634000000},
+        GroupMessage: {"messageChain": ELEMENTS[:6], "sender": member},
+        TempMessage: {"messageChain": ELEMENTS[:6], "sender": member},
+        FriendMessage: {"messageChain": ELEMENTS[:6], "sender": FRIEND},
+    }
+    for kind in (GroupMessage, TempMessage, FriendMessage):
+        builder.build_event(kind, samples[kind])  # 生成事件的构造器
+    builders = {
+        Friend: builder.build_friend,
+        Group: builder.build_group,
+        Member: builder.build_member,
+        **builder.element_builders,
+        **builder.event_builders,
+    }
+    compared = 0
+    for cls, model_builder in builders.items():
+        sample = samples[cls]
+        assert check_model(model_builder, sample), cls
+        checkers = {name: checker for name, _, checker, _ in model_builder.fields}
+        for name, field in model_fields(cls).items():
+            key = field.alias
+            # 推送数据中会出现的字段都应由快速路径检查
+            assert checkers[name] or key not in sample, f"{cls.__name__}.{name}"
+            missing = {k: v for k, v in sample.items() if k != key}
+            variants = [missing, {**sample, key: None}]
+            if key != name and key in sample:
+                variants.append({**missing, name: sample[key]})
+            for data in variants:
+                built = check_model(model_builder, data)
+                if data is missing and not field.required:
+                    assert built, (cls, name)
+                compared += 1
+    return compared
+
+
+def throughput(func, items, rounds: int) -> float:
+    start = time.perf_counter()
+    count = 0
+    while count < rounds:
+        for kind, data in items:
+            func(kind, data)
+        count += len(items)
+    return count / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cases", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+    cases = [payload(rng) for _ in range(args.cases)]
+    built = sum(check(kind, data) for kind, data in cases)
+    print(f"differential ok: {len(cases)} cases, {built} built by the fast path")
+    print(f"fields ok: {check_fields()} variants compared")
+
+    valid = []
+    for kind, data in cases:
+        if builder.build_event(kind, data) is not None:
+            valid.append((kind, data))
+    slow = throughput(lambda kind, data: kind.parse_obj(data), valid, args.rounds)
+    fast = throughput(builder.build_event, valid, args.rounds)
+    print(
+        f"parse_obj: {slow:.0f} events/s, builder: {fast:.0f} events/s ({fast / slow:.1f}x)"
+    )
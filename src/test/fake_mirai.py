@@ -0,0 +1,531 @@
+"""
+进程内的 mirai-api-http 替身, 基于 aiohttp, 用于在没有 mirai-console 和 QQ 账号的情况下进行负载测试.
+
+实现了:
+ - websocket `all` 端点: 会话验证, 按 `syncId` 回复命令, 推送事件.
+ - `ArgonMiraiApplication` 使用的 HTTP 接口 (send*, *List, file/*, upload* 等).
+ - 可配置的延迟, 错误注入 (`code_exceptions_mapping` 中的状态码, HTTP 429 / 500) 与事件生成器.
+
+单独运行时执行一次简单的负载测试:
+    python src/test/fake_mirai.py [--adapter combined|websocket] [--requests 2000] [--events 2000]
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+sys.path.append(os.path.abspath(os.path.join(__file__, "..", "..")))
+
+from aiohttp import WSMsgType, web
+
+from graia.argon.util import code_exceptions_mapping
+
+MIRAI_ERROR_CODES = tuple(code_exceptions_mapping)
+HTTP_ERROR_STATUSES = (429, 500, 502, 503)
+
+
+class FakeMiraiServer:
+    """
+    mirai-api-http 的替身.
+
+    Args:
+        verify_key (str): 需要客户端提供的 verifyKey.
+        account (int): 机器人账号.
+        latency (float): 每个请求的固定延迟, 单位秒.
+        jitter (float): 在固定延迟上附加的随机延迟上限, 单位秒.
+        error_rate (float): 每个请求随机返回错误的概率.
+        error_codes (Iterable[int]): 随机错误的取值范围, 小于 100 或为 400 的视为 mirai 状态码, 其余视为 HTTP 状态码.
+        seed (Optional[int]): 随机数种子, 便于复现.
+    """
+
+    def __init__(
+        self,
+        *,
+        verify_key: str = "ServiceVerifyKey",
+        account: int = 123456789,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_codes: Iterable[int] = MIRAI_ERROR_CODES + HTTP_ERROR_STATUSES,
+        seed: Optional[int] = None,
+        groups: int = 16,
+        members: int = 64,
+        friends: int = 16,
+    ) -> None:
+        self.verify_key = verify_key
+        self.account = account
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_codes = tuple(error_codes)
+        self.random = random.Random(seed)
+        self.session_key = "FakeSession"
+        self.sessions_resumed: int = 0
+        self.message_id = itertools.count(1)
+        self.injected: Dict[str, List[int]] = {}
+        self.requests: List[Tuple[str, dict]] = []
+        self.messages: Dict[int, List[dict]] = {}
+        self.ws_clients: Set[web.WebSocketResponse] = set()
+        self.ws_transports: Dict[web.WebSocketResponse, asyncio.Transport] = {}
+        self.groups = [
+            {"id": 10000 + i, "name": f"group{i}", "permission": "ADMINISTRATOR"}
+            for i in range(groups)
+        ]
+        self.member_count = members
+        self.friends = [
+            {"id": 30000 + i, "nickname": f"friend{i}", "remark": ""}
+            for i in range(friends)
+        ]
+        self.files: Dict[str, dict] = {}
+        self.runner: Optional[web.AppRunner] = None
+        self.url: str = ""
+
+        self.routes: Dict[str, Callable[[dict], Any]] = {
+            "about": lambda _: {"version": "2.3.0"},
+            "botProfile": lambda _: self.profile(self.account),
+            "friendProfile": lambda d: self.profile(d.get("target")),
+            "memberProfile": lambda d: self.profile(d.get("memberId")),
+            "friendList": lambda _: self.friends,
+            "groupList": lambda _: self.groups,
+            "memberList": lambda d: self.member_list(int(d.get("target", 0))),
+            "messageFromId": self.message_from_id,
+            "sendFriendMessage": self.send_message,
+            "sendGroupMessage": self.send_message,
+            "sendTempMessage": self.send_message,
+            "sendNudge": lambda _: None,
+            "recall": lambda _: None,
+            "deleteFriend": lambda _: None,
+            "mute": lambda _: None,
+            "unmute": lambda _: None,
+            "muteAll": lambda _: None,
+            "unmuteAll": lambda _: None,
+            "kick": lambda _: None,
+            "quit": lambda _: None,
+            "setEssence": lambda _: None,
+            "memberAdmin": lambda _: None,
+            "groupConfig": self.group_config,
+            "memberInfo": self.member_info,
+            "file/list": self.file_list,
+            "file/info": self.file_info,
+            "file/mkdir": self.file_mkdir,
+            "file/delete": self.file_delete,
+            "file/move": self.file_move,
+            "file/rename": self.file_move,
+            "file/upload": self.file_upload,
+            "uploadImage": lambda _: {
+                "imageId": "{%s}.jpg" % next(self.message_id),
+                "url": "http://localhost/image",
+            },
+            "uploadVoice": lambda _: {
+                "voiceId": "%s.amr" % next(self.message_id),
+                "url": "http://localhost/voice",
+            },
+        }
+        self.make_directory("", "root")
+
+    # 数据
+
+    def profile(self, target: Any) -> dict:
+        return {
+            "nickname": f"user{target}",
+            "email": "",
+            "age": 18,
+            "level": 1,
+            "sign": "",
+            "sex": "UNKNOWN",
+        }
+
+    def group(self, group_id: int) -> dict:
+        for group in self.groups:
+            if group["id"] == group_id:
+                return group
+        return {"id": group_id, "name": f"group{group_id}", "permission": "MEMBER"}
+
+    def member(self, group_id: int, member_id: int) -> dict:
+        return {
+            "id": member_id,
+            "memberName": f"member{member_id}",
+            "specialTitle": "",
+            "permission": "MEMBER",
+            "joinTimestamp": 1600000000,
+            "lastSpeakTimestamp": 1634000000,
+            "muteTimeRemaining": 0,
+            "group": self.group(group_id),
+        }
+
+    def member_list(self, group_id: int) -> List[dict]:
+        return [self.member(group_id, 20000 + i) for i in range(self.member_count)]
+
+    def message_from_id(self, data: dict) -> Any:
+        chain = self.messages.get(int(data.get("id", 0)))
+        if chain is None:
+            return {"code": 5, "msg": "unknown target"}
+        return chain
+
+    def send_message(self, data: dict) -> dict:
+        message_id = next(self.message_id)
+        self.messages[message_id] = [
+            {"type": "Source", "id": message_id, "time": int(time.time())},
+            *data.get("messageChain", []),
+        ]
+        return {"code": 0, "msg": "success", "messageId": message_id}
+
+    def group_config(self, data: dict) -> Any:
+        if "config" in data:
+            return None
+        return {
+            "name": self.group(int(data.get("target", 0)))["name"],
+            "announcement": "",
+            "confessTalk": False,
+            "allowMemberInvite": True,
+            "autoApprove": False,
+            "anonymousChat": False,
+        }
+
+    def member_info(self, data: dict) -> Any:
+        if "info" in data:
+            return None
+        return {"name": f"member{data.get('memberId')}", "specialTitle": ""}
+
+    # 文件
+
+    def make_directory(self, parent_id: str, name: str, is_file: bool = False) -> dict:
+        file_id = "/" if not self.files else f"/{len(self.files)}"
+        parent = self.files.get(parent_id) if parent_id else None
+        self.files[file_id] = {
+            "name": name,
+            "id": file_id,
+            "path": (parent["path"] + "/" + name) if parent else "/",
+            "parent": parent,
+            "contact": self.groups[0] if self.groups else None,
+            "isFile": is_file,
+            "isDirectory": not is_file,
+            "downloadInfo": None,
+            "size": 0,
+        }
+        return self.files[file_id]
+
+    def file_view(self, info: dict, download_info: bool) -> dict:
+        view = {**info, "parent": None}
+        if info["parent"]:
+            view["parent"] = self.file_view(info["parent"], False)
+        if download_info and info["isFile"]:
+            view["downloadInfo"] = {
+                "sha": "",
+                "md5": "",
+                "downloadTimes": 0,
+                "uploaderId": self.account,
+                "uploadTime": 1634000000,
+                "lastModifyTime": 1634000000,
+                "url": f"http://localhost/file{info['id']}",
+            }
+        return view
+
+    def file_children(self, parent_id: str) -> List[dict]:
+        parent_id = parent_id or "/"
+        return [
+            i
+            for i in self.files.values()
+            if i["parent"] and i["parent"]["id"] == parent_id
+        ]
+
+    def file_list(self, data: dict) -> Any:
+        offset = int(data.get("offset") or 0)
+        size = int(data.get("size") or 0) or len(self.files)
+        download_info = str(data.get("withDownloadInfo")).lower() == "true"
+        children = self.file_children(data.get("id", ""))[offset : offset + size]
+        return [self.file_view(i, download_info) for i in children]
+
+    def file_info(self, data: dict) -> Any:
+        info = self.files.get(data.get("id") or "/")
+        if not info:
+            return {"code": 6, "msg": "file not found"}
+        return self.file_view(info, str(data.get("withDownloadInfo")).lower() == "true")
+
+    def file_mkdir(self, data: dict) -> Any:
+        return self.file_view(
+            self.make_directory(data.get("id", "") or "/", data.get("name", "")), False
+        )
+
+    def file_delete(self, data: dict) -> Any:
+        if self.files.pop(data.get("id", ""), None) is None:
+            return {"code": 6, "msg": "file not found"}
+
+    def file_move(self, data: dict) -> Any:
+        info = self.files.get(data.get("id", ""))
+        if not info:
+            return {"code": 6, "msg": "file not found"}
+        if data.get("renameTo"):
+            info["name"] = data["renameTo"]
+        if data.get("moveTo"):
+            info["parent"] = self.files[data["moveTo"]]
+
+    def file_upload(self, data: dict) -> Any:
+        return self.file_view(
+            self.make_directory(
+                data.get("path", "") or "/", f"upload{len(self.files)}", True
+            ),
+            False,
+        )
+
+    # 请求处理
+
+    def inject(self, action: str, code: int, times: int = 1) -> None:
+        """让接下来 `times` 次对 `action` 的请求返回错误 `code`."""
+        self.injected.setdefault(action, []).extend([code] * times)
+
+    def pick_error(self, action: str) -> Optional[int]:
+        if self.injected.get(action):
+            return self.injected[action].pop(0)
+        if self.error_rate and self.random.random() < self.error_rate:
+            return self.random.choice(self.error_codes)
+
+    async def delay(self) -> None:
+        if self.latency or self.jitter:
+            await asyncio.sleep(self.latency + self.random.random() * self.jitter)
+
+    async def handle(self, action: str, data: dict) -> Tuple[int, dict]:
+        """返回 `(HTTP 状态码, 响应体)`."""
+        self.requests.append((action, data))
+        await self.delay()
+        error = self.pick_error(action)
+        if error in HTTP_ERROR_STATUSES:
+            return error, {"code": error, "msg": "injected http error"}
+        if error is not None:
+            return 200, {"code": error, "msg": "injected error"}
+        if action != "about" and data.get("sessionKey") != self.session_key:
+            return 200, {"code": 3, "msg": "invalid session"}
+        route = self.routes.get(action)
+        if route is None:
+            return 404, {"code": 404, "msg": "not found"}
+        result = route(data)
+        if isinstance(result, dict) and "code" in result:
+            return 200, result
+        if result is None:
+            return 200, {"code": 0, "msg": "success"}
+        return 200, {"code": 0, "msg": "", "data": result}
+
+    async def http_handler(self, request: web.Request) -> web.Response:
+        action = request.match_info["action"]
+        if request.method == "GET":
+            data: dict = dict(request.query)
+        elif request.content_type.startswith("multipart/"):
+            data = {k: v for k, v in (await request.post()).items()}
+            data = {k: (v if isinstance(v, str) else "<file>") for k, v in data.items()}
+        else:
+            data = json.loads(await request.text() or "{}")
+        status, body = await self.handle(action, data)
+        return web.json_response(body, status=status)
+
+    async def ws_handler(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        if request.query.get("verifyKey") != self.verify_key:
+            await ws.send_json({"syncId": "", "data": {"code": 1, "msg": "verify key"}})
+            await ws.close()
+            return ws
+        session_key = request.query.get("sessionKey")
+        if session_key is not None and session_key != self.session_key:
+            await ws.send_json({"syncId": "", "data": {"code": 3, "msg": "session"}})
+            await ws.close()
+            return ws
+        self.sessions_resumed += session_key is not None
+        await ws.send_json(
+            {"syncId": "", "data": {"code": 0, "session": self.session_key}}
+        )
+        self.ws_clients.add(ws)
+        self.ws_transports[ws] = request.transport
+        try:
+            async for message in ws:
+                if message.type is WSMsgType.TEXT:
+                    asyncio.create_task(self.ws_command(ws, json.loads(message.data)))
+        finally:
+            self.ws_clients.discard(ws)
+            self.ws_transports.pop(ws, None)
+        return ws
+
+    async def ws_command(self, ws: web.WebSocketResponse, command: dict) -> None:
+        content = command.get("content") or {}
+        if isinstance(content, str):
+            content = json.loads(content or "{}")
+        content.setdefault("sessionKey", self.session_key)
+        status, body = await self.handle(command.get("command", ""), content)
+        if status != 200:
+            body = {"code": 500, "msg": f"http status {status}"}
+        if not ws.closed:
+            await ws.send_json({"syncId": command.get("syncId"), "data": body})
+
+    # 事件
+
+    async def push(self, event: dict) -> None:
+        """向所有已连接的 websocket 客户端推送事件."""
+        for ws in list(self.ws_clients):
+            if not ws.closed:
+                await ws.send_json({"syncId": "-1", "data": event})
+
+    def group_message(self, text: str, group_id: int, member_id: int) -> dict:
+        message_id = next(self.message_id)
+        return {
+            "type": "GroupMessage",
+            "messageChain": [
+                {"type": "Source", "id": message_id, "time": int(time.time())},
+                {"type": "Plain", "text": text},
+            ],
+            "sender": self.member(group_id, member_id),
+        }
+
+    async def group_messages(
+        self, count: int, texts: Iterable[str] = ("hello", "echo hi")
+    ) -> AsyncIterator[dict]:
+        """按轮转方式生成群消息事件的事件生成器."""
+        texts = itertools.cycle(texts)
+        for i in range(count):
+            group = self.groups[i % len(self.groups)]
+            yield self.group_message(
+                next(texts), group["id"], 20000 + i % self.member_count
+            )
+
+    async def generate(
+        self, events: AsyncIterator[dict], rate: Optional[float] = None
+    ) -> int:
+        """以每秒 `rate` 个 (为 None 时不限速) 推送事件生成器产生的事件, 返回推送数量."""
+        count = 0
+        start = time.perf_counter()
+        async for event in events:
+            await self.push(event)
+            count += 1
+            if rate:
+                delay = start + count / rate - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+        return count
+
+    # 故障
+
+    async def drop(self) -> None:
+        """断开所有 websocket 连接, session 保持有效."""
+        for ws in list(self.ws_clients):
+            await ws.close()
+
+    def stall(self) -> None:
+        """模拟半开连接: 不再读取已有 websocket 连接上的数据, 也就不再回复 ping."""
+        for transport in self.ws_transports.values():
+            transport.pause_reading()
+
+    async def restart(self, downtime: float = 0.0) -> None:
+        """模拟 mirai 重启: 断开所有连接, 停止服务 `downtime` 秒, 并使旧的 session 失效."""
+        host, port = self.url[len("http://") :].rsplit(":", 1)
+        await self.close()
+        self.session_key = f"FakeSession{next(self.message_id)}"
+        await asyncio.sleep(downtime)
+        await self.start(host, int(port))
+
+    # 生命周期
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """启动服务器, 返回可用于 `MiraiSession` 的地址."""
+        app = web.Application(client_max_size=64 * 1024 * 1024)
+        app.router.add_get("/all", self.ws_handler)
+        app.router.add_route("*", "/{action:.+}", self.http_handler)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://{host}:{port}"
+        return self.url
+
+    async def close(self) -> None:
+        for ws in list(self.ws_clients):
+            await ws.close()
+        if self.runner:
+            await self.runner.cleanup()
+            self.runner = None
+
+
+async def load_test(adapter_name: str, requests: int, events: int) -> None:
+    from graia.broadcast import Broadcast
+    from loguru import logger
+
+    from graia.argon.adapter import CombinedAdapter, WebsocketAdapter
+    from graia.argon.app import ArgonMiraiApplication
+    from graia.argon.event.message import GroupMessage
+    from graia.argon.message.chain import MessageChain
+    from graia.argon.model import ChatLogConfig, MiraiSession
+
+    logger.remove()
+    server = FakeMiraiServer()
+    url = await server.start()
+    loop = asyncio.get_running_loop()
+    bcc = Broadcast(loop=loop)
+    adapter_cls = {"combined": CombinedAdapter, "websocket": WebsocketAdapter}[
+        adapter_name
+    ]
+    adapter = adapter_cls(bcc, MiraiSession(url, server.account, server.verify_key))
+    app = ArgonMiraiApplication(
+        bcc, adapter, chat_log_config=ChatLogConfig(enabled=False)
+    )
+    received = asyncio.Event()
+    counter = itertools.count(1)
+
+    @bcc.receiver(GroupMessage)
+    async def on_message():
+        if next(counter) == events:
+            received.set()
+
+    await app.launch()
+
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(
+            app.sendGroupMessage(10000, MessageChain.create("hi"))
+            for _ in range(requests)
+        )
+    )
+    elapsed = time.perf_counter() - start
+    print(
+        f"{adapter_name}: {requests} sends in {elapsed:.2f}s, {requests / elapsed:.0f}/s"
+    )
+
+    start = time.perf_counter()
+    await server.generate(server.group_messages(events))
+    await received.wait()
+    elapsed = time.perf_counter() - start
+    print(
+        f"{adapter_name}: {events} events in {elapsed:.2f}s, {events / elapsed:.0f}/s"
+    )
+
+    app.running = False
+    if app.daemon_task:
+        app.daemon_task.cancel()
+    await adapter.stop()
+    await adapter.close()
+    await server.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--adapter", choices=["combined", "websocket"], default="combined"
+    )
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--events", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.get_event_loop().run_until_complete(
+        load_test(args.adapter, args.requests, args.events)
+    )
@@ -0,0 +1,59 @@
+"""
+统计 `import graia.argon` 等入口的导入耗时 (基于 `python -X importtime`).
+
+用法: python src/test/import_time.py [--limit 毫秒]
+
+超出 `--limit` 时以非零状态退出, 以便在 CI 中跟踪导入时间的变化.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+SRC_DIR = os.path.abspath(os.path.join(__file__, "..", ".."))
+
+TARGETS = [
+    "graia.argon",
+    "graia.argon.message.chain",
+    "graia.argon.app",
+]
+
+
+def measure(module: str) -> dict:
+    """在新的解释器中导入模块, 返回 `{模块名: 累计耗时(微秒)}`."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": SRC_DIR},
+        check=True,
+    )
+    result = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if cumulative.strip().isdigit():
+            result[name.strip()] = int(cumulative)
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--limit", type=float, default=None, help="毫秒")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    failed = False
+    for target in TARGETS:
+        samples = sorted(measure(target)[target] / 1000 for _ in range(args.repeat))
+        median = samples[len(samples) // 2]
+        print(f"{target:<32} median {median:8.2f} ms  min {samples[0]:8.2f} ms")
+        if target == "graia.argon" and args.limit and median > args.limit:
+            failed = True
+    for name, cumulative in sorted(
+        measure("graia.argon.app").items(), key=lambda x: -x[1]
+    ):
+        if name.startswith("graia.argon"):
+            print(f"  {name:<30} {cumulative / 1000:8.2f} ms")
+    sys.exit(1 if failed else 0)
@@ -15,3 +15,13 @@ if __name__ == "__main__":
     print(chain_2 * 5)
     chain_2 *= 3
     print(chain_2)
+    shared = MessageChain.create(Plain("a b")).split(" ")[0].__root__[0]
+    try:
+        shared.text = "changed"
+    except TypeError as e:
+        print(e)
+    else:
+        raise AssertionError("interned Plain was modified")
+    own = shared.copy()
+    own.text = "changed"
+    assert Plain.intern("a").text == "a"
@@ -0,0 +1,88 @@
+"""
+`ProcessOffload` 的正确性检查, 不需要运行中的 mirai.
+
+用法: python src/test/offload.py
+
+检查: 消息事件 (不含消息链的部分经 `copy(exclude=...)` 与 pickle 传输) 与消息链在子进程中被还原,
+函数返回的消息链与字符串回到主进程; 只传入消息链时事件为 None.
+同时检查 `copy`, `dict`, `json` 接受 pydantic v1 的全部参数.
+"""
+import asyncio
+import json
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(__file__, "..", "..")))
+
+from graia.argon.compat import NATIVE_V2, PYDANTIC_VERSION
+from graia.argon.event.message import GroupMessage
+from graia.argon.message.chain import MessageChain
+from graia.argon.message.element import At, Plain
+from graia.argon.offload import ProcessOffload
+
+
+def describe(chain: MessageChain, event: GroupMessage) -> MessageChain:
+    assert "messageChain" in event.__dict__ and event.messageChain == chain
+    return MessageChain.create(
+        Plain(f"{event.sender.group.id}:{event.sender.id}:{chain.asDisplay().upper()}")
+    )
+
+
+def length(chain: MessageChain, event: None, extra: int) -> str:
+    assert event is None
+    return str(len(chain.asDisplay()) + extra)
+
+
+def message(text: str) -> GroupMessage:
+    return GroupMessage.parse_obj(
+        {
+            "messageChain": [
+                {"type": "Source", "id": 1, "time": 1634000000},
+                {"type": "At", "target": 3, "display": ""},
+                {"type": "Plain", "text": text},
+            ],
+            "sender": {
+                "id": 1,
+                "memberName": "a",
+                "permission": "MEMBER",
+                "group": {"id": 2, "name": "g", "permission": "MEMBER"},
+            },
+        }
+    )
+
+
+def check_v1_methods(event: GroupMessage) -> None:
+    copied = event.copy(exclude={"messageChain"})
+    assert "messageChain" not in copied.__dict__ and copied.sender == event.sender
+    assert event.copy(include={"sender"}, deep=True).sender is not event.sender
+    assert (
+        event.copy(update={"type": "GroupMessage"}).messageChain is event.messageChain
+    )
+    data = event.dict(exclude={"messageChain"}, exclude_none=True, by_alias=True)
+    assert "messageChain" not in data and data["sender"]["id"] == 1
+    assert event.sender.dict(include={"id"}) == {"id": 1}
+    assert json.loads(event.sender.json(include={"id"}, indent=2)) == {"id": 1}
+    assert json.loads(event.json(encoder=str, exclude_unset=True))["sender"]["id"] == 1
+    assert "\n" in event.json(indent=1, sort_keys=True)
+
+
+async def main() -> None:
+    event = message("hello")
+    check_v1_methods(event)
+    pool = ProcessOffload(max_workers=1, start_method="spawn")
+    try:
+        reply = await pool.run(describe, event)
+        display = event.messageChain.asDisplay()
+        assert reply.asDisplay() == f"2:1:{display.upper()}", reply
+        assert isinstance(reply.__root__[0], Plain)
+        assert isinstance(event.messageChain.__root__[1], At)
+        assert await pool.run(length, event.messageChain, 10) == MessageChain.create(
+            str(len(display) + 10)
+        )
+    finally:
+        pool.shutdown()
+    print(f"offload ok (pydantic {PYDANTIC_VERSION}, native v2: {NATIVE_V2})")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,66 @@
+"""
+依次运行不需要 mirai 的检查脚本.
+
+用法: python src/test/run_checks.py [脚本名 ...]
+
+安装的是 pydantic v2 时, 每个脚本运行两次: 直接运行在 pydantic v2 上,
+以及设置 `ARGON_PYDANTIC_V1` 后运行在 `pydantic.v1` 上, 两种模型实现都被覆盖.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(__file__, "..", "..")))
+
+from graia.argon.compat import PYDANTIC_V2, PYDANTIC_VERSION
+
+CHECKS = {
+    "codec": [],
+    "context": ["--calls", "2000"],
+    "event_builder": ["--rounds", "20"],
+    "message_chain": [],
+    "string_receiver": [],
+    "scheduler": [],
+    "tracing": [],
+    "cluster": [],
+    "offload": [],
+    "benchmark": ["--events", "1000"],
+}
+
+
+def run(name: str, env: dict) -> bool:
+    start = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, os.path.join(os.path.dirname(__file__), f"{name}.py")]
+        + CHECKS[name],
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        universal_newlines=True,
+    )
+    status = "ok" if process.returncode == 0 else f"failed ({process.returncode})"
+    print(f"  {name:<16} {status} in {time.perf_counter() - start:.1f}s")
+    if process.returncode:
+        print(process.stdout)
+    return process.returncode == 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("checks", nargs="*", help=f"默认运行全部: {', '.join(CHECKS)}")
+    args = parser.parse_args()
+    for name in args.checks:
+        if name not in CHECKS:
+            parser.error(f"unknown check: {name}")
+    env = {k: v for k, v in os.environ.items() if k != "ARGON_PYDANTIC_V1"}
+    modes = [(f"pydantic {PYDANTIC_VERSION}", env)]
+    if PYDANTIC_V2:
+        modes.append(("pydantic.v1", {**env, "ARGON_PYDANTIC_V1": "1"}))
+    failed = 0
+    for mode, mode_env in modes:
+        print(mode)
+        for name in args.checks or CHECKS:
+            failed += not run(name, mode_env)
+    sys.exit(1 if failed else 0)
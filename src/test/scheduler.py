@@ -0,0 +1,117 @@
+"""
+`DispatchScheduler` 的顺序与中断检查, 不需要运行中的 mirai.
+
+用法: python src/test/scheduler.py
+
+检查: 同一个群的消息按收到的顺序开始处理, 不同的群轮流处理;
+并发数大于 1 时, 同一个群的消息在前一条的监听器执行完毕后才开始处理, 不同的群同时处理;
+监听器调用 `release` 后通过 `InterruptControl` 等待同一个群的下一条消息时不会卡住分片.
+"""
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(__file__, "..", "..")))
+
+from graia.broadcast import Broadcast
+from graia.broadcast.interrupt import InterruptControl
+from graia.broadcast.interrupt.waiter import Waiter
+
+from graia.argon.event.message import GroupMessage
+from graia.argon.message.chain import MessageChain
+from graia.argon.scheduler import DispatchScheduler
+
+
+def message(group: int, text: str) -> GroupMessage:
+    return GroupMessage.parse_obj(
+        {
+            "messageChain": [{"type": "Plain", "text": text}],
+            "sender": {
+                "id": 1,
+                "memberName": "a",
+                "permission": "MEMBER",
+                "group": {"id": group, "name": "g", "permission": "MEMBER"},
+            },
+        }
+    )
+
+
+async def check_order(bcc: Broadcast) -> None:
+    scheduler = DispatchScheduler(bcc, concurrency=1)
+    started = []
+
+    @bcc.receiver(GroupMessage)
+    async def listener(event: GroupMessage):
+        started.append((event.sender.group.id, event.messageChain.asDisplay()))
+        await asyncio.sleep(0.01)
+
+    for i in range(5):
+        scheduler.post(message(1, str(i)))
+    scheduler.post(message(2, "0"))
+    await asyncio.wait_for(scheduler.join(), 1)
+    assert [text for group, text in started if group == 1] == list("01234"), started
+    assert started.index((2, "0")) < started.index((1, "2")), started
+    bcc.removeListener(bcc.getListener(listener))
+
+
+async def check_serial(bcc: Broadcast) -> None:
+    scheduler = DispatchScheduler(bcc, concurrency=4)
+    running = {1: 0, 2: 0}
+    overlapped = []
+    finished = []
+
+    @bcc.receiver(GroupMessage)
+    async def listener(event: GroupMessage):
+        group = event.sender.group.id
+        running[group] += 1
+        assert running[group] == 1, f"group {group} dispatched concurrently"
+        overlapped.append(running[1] and running[2])
+        await asyncio.sleep(0.01)
+        running[group] -= 1
+        finished.append((group, event.messageChain.asDisplay()))
+
+    for i in range(3):
+        scheduler.post(message(1, str(i)))
+        scheduler.post(message(2, str(i)))
+    await asyncio.wait_for(scheduler.join(), 1)
+    assert [text for group, text in finished if group == 1] == list("012"), finished
+    assert any(overlapped), "different groups should be dispatched concurrently"
+    bcc.removeListener(bcc.getListener(listener))
+
+
+async def check_interrupt(bcc: Broadcast) -> None:
+    scheduler = DispatchScheduler(bcc, concurrency=2)
+    inc = InterruptControl(bcc)
+    replies = []
+
+    @bcc.receiver(GroupMessage)
+    async def listener(event: GroupMessage):
+        if event.messageChain.asDisplay() != "confirm?":
+            return
+
+        @Waiter.create_using_function([GroupMessage])
+        async def waiter(reply: GroupMessage):
+            if reply.sender.group.id == event.sender.group.id:
+                return reply.messageChain
+
+        scheduler.release()
+        replies.append(await asyncio.wait_for(inc.wait(waiter), 1))
+
+    scheduler.post(message(1, "confirm?"))
+    await asyncio.sleep(0.01)
+    scheduler.post(message(1, "yes"))
+    await asyncio.wait_for(scheduler.join(), 2)
+    assert [i.asDisplay() for i in replies] == ["yes"], replies
+    assert isinstance(replies[0], MessageChain)
+
+
+async def main() -> None:
+    bcc = Broadcast(loop=asyncio.get_running_loop())
+    await check_order(bcc)
+    await check_serial(bcc)
+    await check_interrupt(bcc)
+    print("scheduler ok")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
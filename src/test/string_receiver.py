@@ -0,0 +1,68 @@
+"""
+以字符串指定事件的监听器: 事件模块按需导入后, `bcc.receiver("GroupMessage")` 仍然可用.
+
+用法: python src/test/string_receiver.py
+
+需在新的解释器中运行, 以保证导入 `graia.argon` 时事件模块尚未被导入.
+检查: 应用的 Broadcast 与调用过 `install_event_lookup` 的 Broadcast 能找到按需导入的事件,
+其他 Broadcast 实例 (以及 `Broadcast` 类本身) 不受影响; 找不到的名称只查找一次.
+"""
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(__file__, "..", "..")))
+
+from graia.broadcast import Broadcast
+
+from graia.argon import ArgonMiraiApplication
+from graia.argon.adapter import DefaultAdapter
+from graia.argon.event import _event_cache, install_event_lookup
+from graia.argon.model import MiraiSession
+
+if __name__ == "__main__":
+    assert "graia.argon.event.message" not in sys.modules
+    loop = asyncio.new_event_loop()
+    bcc = Broadcast(loop=loop)
+    install_event_lookup(bcc)
+    received = []
+
+    @bcc.receiver("GroupMessage")
+    @bcc.receiver("FriendRecallEvent")
+    async def listener():
+        received.append(bcc.event_ctx.get())
+
+    from graia.argon.event.message import GroupMessage
+    from graia.argon.event.mirai import FriendRecallEvent
+
+    events = bcc.getListener(listener).listening_events
+    assert sorted(events, key=lambda i: i.__name__) == [
+        FriendRecallEvent,
+        GroupMessage,
+    ], events
+    event = GroupMessage.parse_obj(
+        {
+            "messageChain": [{"type": "Plain", "text": "hello"}],
+            "sender": {
+                "id": 1,
+                "memberName": "a",
+                "permission": "MEMBER",
+                "group": {"id": 2, "name": "g", "permission": "MEMBER"},
+            },
+        }
+    )
+    loop.run_until_complete(
+        bcc.layered_scheduler(bcc.default_listener_generator(GroupMessage), event)
+    )
+    assert received == [event], received
+
+    app_bcc = Broadcast(loop=loop)
+    ArgonMiraiApplication(
+        app_bcc, DefaultAdapter(app_bcc, MiraiSession("http://localhost:8080"))
+    )
+    app_bcc.receiver("FriendMessage")(listener)
+    assert Broadcast.findEvent("NoSuchEvent") is None
+    assert Broadcast(loop=loop).findEvent is not bcc.findEvent
+    assert bcc.findEvent("NoSuchEvent") is None
+    assert "NoSuchEvent" in _event_cache
+    print("string receiver ok")
@@ -0,0 +1,126 @@
+"""
+追踪的正确性检查, 使用 `FakeMiraiServer`, 不需要运行中的 mirai.
+
+用法: python src/test/tracing.py
+
+检查: 经过 websocket 收到的一帧群消息产生 `mirai.frame` -> `listener` -> `handler` -> `call_api`
+的父子链, `reply_breakdown` 给出各阶段的耗时.
+安装了 `opentelemetry-sdk` 时, 还检查 `OpenTelemetryExporter` 转发的片段保持同样的父子关系,
+即使 `listener` 晚于它的 `mirai.frame` 结束.
+"""
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(__file__, "..", "..")))
+
+from fake_mirai import FakeMiraiServer
+from graia.broadcast import Broadcast
+from loguru import logger
+
+from graia.argon.adapter import WebsocketAdapter
+from graia.argon.app import ArgonMiraiApplication
+from graia.argon.event.message import GroupMessage
+from graia.argon.message.chain import MessageChain
+from graia.argon.model import ChatLogConfig, MiraiSession
+from graia.argon.trace import InMemoryExporter, OpenTelemetryExporter, tracer
+
+
+def otel_exporter():
+    try:
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+        from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+            InMemorySpanExporter,
+        )
+    except ImportError:
+        return None, None
+    memory = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(memory))
+    exporter = OpenTelemetryExporter()
+    exporter.otel_tracer = provider.get_tracer("graia.argon")
+    return exporter, memory
+
+
+def check_chain(exporter: InMemoryExporter) -> None:
+    calls = [span for span in exporter.spans if span.name == "call_api"]
+    assert len(calls) == 1, exporter.spans
+    chain = []
+    span = calls[0]
+    while span:
+        chain.append(span.name)
+        assert span.trace_id == calls[0].trace_id
+        span = span.parent
+    assert chain == ["call_api", "handler", "listener", "mirai.frame"], chain
+    root = exporter.spans[[i.name for i in exporter.spans].index("mirai.frame")]
+    listener = calls[0].parent.parent
+    assert listener.parent is root and listener.end_time >= root.end_time
+
+    (breakdown,) = exporter.reply_breakdown()
+    assert breakdown["listener"].endswith("on_message"), breakdown
+    assert breakdown["action"] == "sendGroupMessage", breakdown
+    for key in ("total", "decode", "build_event", "resolve", "handler", "call_api"):
+        assert isinstance(breakdown[key], float) and breakdown[key] >= 0, breakdown
+    assert breakdown["total"] >= breakdown["call_api"], breakdown
+
+
+def check_otel(memory) -> None:
+    spans = {span.context.span_id: span for span in memory.get_finished_spans()}
+    (call,) = [span for span in spans.values() if span.name == "call_api"]
+    chain = []
+    span = call
+    while span:
+        chain.append(span.name)
+        assert span.context.trace_id == call.context.trace_id
+        span = spans.get(span.parent.span_id) if span.parent else None
+    assert chain == ["call_api", "handler", "listener", "mirai.frame"], chain
+
+
+async def main() -> None:
+    logger.remove()
+    server = FakeMiraiServer()
+    url = await server.start()
+    bcc = Broadcast(loop=asyncio.get_running_loop())
+    adapter = WebsocketAdapter(
+        bcc, MiraiSession(url, server.account, server.verify_key)
+    )
+    app = ArgonMiraiApplication(
+        bcc, adapter, chat_log_config=ChatLogConfig(enabled=False)
+    )
+    exporter = InMemoryExporter()
+    otel, memory = otel_exporter()
+    tracer.enable(exporter, *([otel] if otel else []))
+    replied = asyncio.Event()
+
+    @bcc.receiver(GroupMessage)
+    async def on_message(event: GroupMessage):
+        await app.sendGroupMessage(event.sender.group, MessageChain.create("pong"))
+        replied.set()
+
+    await app.launch()
+    await adapter.verified.wait()
+    exporter.clear()
+    if memory is not None:
+        memory.clear()
+    await server.push(server.group_message("ping", 10000, 20000))
+    await asyncio.wait_for(replied.wait(), 5)
+    await asyncio.sleep(0.05)  # 等待 listener 片段结束
+
+    try:
+        check_chain(exporter)
+        if memory is not None:
+            check_otel(memory)
+    finally:
+        tracer.disable()
+        app.running = False
+        if app.daemon_task:
+            app.daemon_task.cancel()
+        await adapter.stop()
+        await adapter.close()
+        await server.close()
+    print("tracing ok" + ("" if memory is not None else " (opentelemetry skipped)"))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())